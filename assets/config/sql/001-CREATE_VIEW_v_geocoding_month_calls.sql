@@ -1,9 +1,8 @@
 CREATE OR REPLACE VIEW v_geocoding_month_calls
 AS
 	SELECT
-		COUNT(*)::int AS count
-	FROM geocache
+		COALESCE(SUM(calls), 0)::int AS count
+	FROM geocoding_quota
 	WHERE
-    	del_ts IS NULL
-        AND ins_ts >= NOW() - INTERVAL '30 days'
+		day > CURRENT_DATE - 30
 ;
@@ -0,0 +1,21 @@
+INSERT INTO user_fuel_stats (user_id, fuel_id, num_searches, num_stations, sum_price_avg, sum_price_min, upd_ts)
+	SELECT
+		s.user_id,
+		s.fuel_id,
+		COUNT(*),
+		SUM(s.num_stations),
+		SUM(s.price_avg),
+		SUM(s.price_min),
+		NOW()
+	FROM searches s
+	WHERE
+		s.num_stations > 0
+		AND s.price_avg IS NOT NULL
+		AND s.price_min IS NOT NULL
+		AND s.del_ts IS NULL
+		AND NOT EXISTS (SELECT 1 FROM user_fuel_stats)
+	GROUP BY
+		s.user_id,
+		s.fuel_id
+ON CONFLICT (user_id, fuel_id) DO NOTHING
+;
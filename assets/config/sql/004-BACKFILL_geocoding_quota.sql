@@ -0,0 +1,13 @@
+INSERT INTO geocoding_quota (day, calls, upd_ts)
+	SELECT
+		g.ins_ts::date,
+		COUNT(*),
+		NOW()
+	FROM geocache g
+	WHERE
+		g.ins_ts >= CURRENT_DATE - 30
+		AND NOT EXISTS (SELECT 1 FROM geocoding_quota)
+	GROUP BY
+		g.ins_ts::date
+ON CONFLICT (day) DO NOTHING
+;
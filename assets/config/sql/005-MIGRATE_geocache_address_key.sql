@@ -0,0 +1,24 @@
+ALTER TABLE geocache ADD COLUMN IF NOT EXISTS address_key VARCHAR(255);
+
+UPDATE geocache
+SET address_key = LEFT(LOWER(REGEXP_REPLACE(BTRIM(address), '\s+', ' ', 'g')), 255)
+WHERE address_key IS NULL;
+
+DELETE FROM geocache
+WHERE id IN (
+	SELECT id
+	FROM (
+		SELECT
+			id,
+			ROW_NUMBER() OVER (
+				PARTITION BY address_key
+				ORDER BY (del_ts IS NULL) DESC, COALESCE(upd_ts, ins_ts) DESC, id DESC
+			) AS rn
+		FROM geocache
+	) ranked
+	WHERE ranked.rn > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_geocache_address_key ON geocache (address_key);
+
+ALTER TABLE geocache ALTER COLUMN address_key SET NOT NULL;
@@ -0,0 +1,5 @@
+CREATE INDEX IF NOT EXISTS ix_geocache_ins_ts ON geocache (ins_ts);
+
+CREATE INDEX IF NOT EXISTS ix_geocache_del_ts ON geocache (del_ts) WHERE del_ts IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_searches_del_ts ON searches (del_ts) WHERE del_ts IS NOT NULL;
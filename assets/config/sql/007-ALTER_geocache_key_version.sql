@@ -0,0 +1,3 @@
+ALTER TABLE geocache ADD COLUMN IF NOT EXISTS key_version SMALLINT NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_geocache_key_version ON geocache (key_version);
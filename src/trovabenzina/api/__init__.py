@@ -1,18 +1,63 @@
 """Public API surface for external consumers of the 'api' package.
 
 Exposes:
-- Google Maps Geocoding
-- MISE search (fuel stations by zone, price-ordered)
+- Shared HTTP client lifecycle (start/close with the bot)
+- Google Maps Geocoding (two-tier cached service, rolling request quota)
+- MISE search (fuel stations by zone, price-ordered, spatially cached, compact records)
 - MISE station detail (address)
+- MISE open-data snapshot (local zone search, periodic refresh)
+- Single-flight coalescing of identical upstream calls
+- Circuit breakers with adaptive timeouts, retries and hedging for MISE
 """
 
+from .breaker import CircuitBreaker, CircuitOpenError, UpstreamError, breaker_stats
+from .retry import RetryPolicy, retry_stats
+from .http_client import close_http_client, get_http_session, start_http_client
 from .googlemaps.geocoding import geocode_address, geocode_address_with_country
+from .googlemaps.quota import geocoding_quota_exceeded, geocoding_quota_stats
+from .googlemaps.service import (
+    GEOCODE_FOREIGN,
+    GEOCODE_QUOTA,
+    GEOCODE_ERROR,
+    GeocodeResult,
+    resolve_address,
+    geocoding_service_stats,
+)
+from .mise.records import FuelPrice, StationRecord
+from .mise.snapshot import search_snapshot, start_snapshot_refresh, stop_snapshot_refresh
 from .mise.station_detail import get_station_address
-from .mise.stations_search import search_stations
+from .mise.stations_search import purge_zone_cache, search_stations, zone_cache_stats
+from .singleflight import SingleFlight, singleflight_stats
 
 __all__ = [
+    "start_http_client",
+    "close_http_client",
+    "get_http_session",
     "geocode_address",
     "geocode_address_with_country",
+    "geocoding_quota_exceeded",
+    "geocoding_quota_stats",
+    "GEOCODE_FOREIGN",
+    "GEOCODE_QUOTA",
+    "GEOCODE_ERROR",
+    "GeocodeResult",
+    "resolve_address",
+    "geocoding_service_stats",
+    "FuelPrice",
+    "StationRecord",
     "search_stations",
+    "zone_cache_stats",
+    "purge_zone_cache",
     "get_station_address",
+    "search_snapshot",
+    "start_snapshot_refresh",
+    "stop_snapshot_refresh",
+    "SingleFlight",
+    "singleflight_stats",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "UpstreamError",
+    "breaker_stats",
+    "RetryPolicy",
+    "retry_stats",
 ]
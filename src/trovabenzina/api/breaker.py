@@ -0,0 +1,238 @@
+"""
+Circuit breaker with latency-adaptive timeouts for flaky upstreams.
+
+Each call gets a deadline derived from recent successful latencies (a
+percentile times a multiplier, clamped between a floor and the HTTP client
+timeout), so a degraded endpoint is abandoned well before the fixed client
+timeout. After `failure_threshold` consecutive failures the breaker opens and
+calls fail fast with `CircuitOpenError`; after `reset_timeout` seconds a
+single probe is let through (half-open) and its outcome closes or re-opens it.
+Inside `deadline_scope()` (entered by `RetryPolicy.run`) the deadline is also
+clamped to what is left of the caller's budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+
+__all__ = ["CircuitBreaker", "CircuitOpenError", "UpstreamError", "breaker_stats", "deadline_scope"]
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Tolerance when deciding whether a cancellation happened at the deadline
+_DEADLINE_SLACK = 0.01
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: float) -> Iterator[None]:
+    """Clamp breaker calls made inside the block (and tasks it spawns) to `deadline`.
+
+    Args:
+        deadline: `time.monotonic()` time at which the caller gives up.
+    """
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class UpstreamError(Exception):
+    """Upstream answered, but with a server-side error that counts as a failure."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with rolling latency percentiles.
+
+    Args:
+        name: Name used in logs and stats.
+        failure_threshold: Consecutive failures that open the breaker.
+        reset_timeout: Seconds to stay open before letting a probe through.
+        window: Number of recent successful latencies kept.
+        min_timeout: Lower bound of the adaptive deadline (seconds).
+        max_timeout: Upper bound, also used until enough samples exist.
+        multiplier: Factor applied to the latency percentile.
+        percentile: Percentile (0-1) of recent latencies the deadline is based on.
+    """
+
+    _MIN_SAMPLES = 10
+
+    def __init__(
+            self,
+            name: str,
+            *,
+            failure_threshold: int,
+            reset_timeout: float,
+            window: int,
+            min_timeout: float,
+            max_timeout: float,
+            multiplier: float,
+            percentile: float = 0.95,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.state = CLOSED
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._calls = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._fast_failed = 0
+        self._opened = 0
+        _breakers[name] = self
+
+    def latency(self, q: float) -> Optional[float]:
+        """Return the `q` percentile of recent successful latencies, if any."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def warmed_up(self) -> bool:
+        """True once enough latencies were observed for percentiles to be meaningful."""
+        return len(self._latencies) >= self._MIN_SAMPLES
+
+    def timeout(self) -> float:
+        """Return the deadline for the next call."""
+        if not self.warmed_up():
+            return self.max_timeout
+        adaptive = self.latency(self.percentile) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, adaptive))
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would fail fast (open and not yet due for a probe)."""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def _admit(self) -> bool:
+        """Raise if the call must fail fast; return True if it is the half-open probe."""
+        if self.state == CLOSED:
+            return False
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self._fast_failed += 1
+                raise CircuitOpenError(self.name)
+            self.state = HALF_OPEN
+            log.info("Circuit %s half-open, probing", self.name)
+        if self._probing:
+            self._fast_failed += 1
+            raise CircuitOpenError(self.name)
+        self._probing = True
+        return True
+
+    def _on_success(self, elapsed: float) -> None:
+        self._latencies.append(elapsed)
+        self._failures = 0
+        if self.state != CLOSED:
+            log.info("Circuit %s closed after successful probe", self.name)
+        self.state = CLOSED
+
+    def _on_failure(self) -> None:
+        self._failed += 1
+        self._failures += 1
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self._opened += 1
+                log.warning("Circuit %s open after %d consecutive failures", self.name, self._failures)
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]], deadline: Optional[float] = None) -> T:
+        """Run `fn()` under the breaker and the adaptive deadline.
+
+        Args:
+            fn: Zero-argument coroutine factory performing the upstream call.
+                It should raise (e.g. `UpstreamError`) on server-side failures.
+            deadline: `time.monotonic()` time at which the caller gives up
+                (defaults to the enclosing `deadline_scope()`, if any). The
+                adaptive deadline is clamped to it, so a call cut off by the
+                caller still counts as a timeout.
+
+        Returns:
+            T: The result of `fn()`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open (nothing is sent).
+            asyncio.TimeoutError: If the adaptive or the caller's deadline expired.
+            Exception: Whatever `fn()` raised.
+        """
+        if deadline is None:
+            deadline = _deadline.get()
+        if deadline is not None and deadline <= time.monotonic():
+            # Nothing left to spend: not the upstream's fault, nothing recorded
+            raise asyncio.TimeoutError()
+        probe = self._admit()
+        self._calls += 1
+        started = time.monotonic()
+        timeout = self.timeout()
+        if deadline is not None:
+            timeout = min(timeout, deadline - started)
+        try:
+            result = await asyncio.wait_for(fn(), timeout)
+        except asyncio.CancelledError:
+            # Cancelled once the deadline was reached (by an outer timer firing
+            # together with ours) it is a timeout; earlier, e.g. a hedge that
+            # lost or shutdown, it says nothing about the upstream
+            if time.monotonic() - started >= timeout - _DEADLINE_SLACK:
+                self._timeouts += 1
+                self._on_failure()
+            raise
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._on_failure()
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        else:
+            self._on_success(time.monotonic() - started)
+            return result
+        finally:
+            if probe:
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state, counters, latency percentiles and the current deadline."""
+        return {
+            "state": self.state,
+            "calls": self._calls,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "fast_failed": self._fast_failed,
+            "opened": self._opened,
+            "p50": self.latency(0.5),
+            "p95": self.latency(0.95),
+            "timeout": self.timeout(),
+        }
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every circuit breaker, by name."""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
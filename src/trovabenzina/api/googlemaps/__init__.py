@@ -1,5 +1,32 @@
 """Google Maps related APIs (e.g., geocoding)."""
 
 from .geocoding import geocode_address, geocode_address_with_country
+from .quota import geocoding_quota_exceeded, geocoding_quota_stats, record_geocoding_call
+from .service import (
+    GEOCODE_OK,
+    GEOCODE_NOT_FOUND,
+    GEOCODE_FOREIGN,
+    GEOCODE_QUOTA,
+    GEOCODE_ERROR,
+    GeocodeResult,
+    GeocodingService,
+    resolve_address,
+    geocoding_service_stats,
+)
 
-__all__ = ["geocode_address", "geocode_address_with_country"]
+__all__ = [
+    "geocode_address",
+    "geocode_address_with_country",
+    "geocoding_quota_exceeded",
+    "geocoding_quota_stats",
+    "record_geocoding_call",
+    "GEOCODE_OK",
+    "GEOCODE_NOT_FOUND",
+    "GEOCODE_FOREIGN",
+    "GEOCODE_QUOTA",
+    "GEOCODE_ERROR",
+    "GeocodeResult",
+    "GeocodingService",
+    "resolve_address",
+    "geocoding_service_stats",
+]
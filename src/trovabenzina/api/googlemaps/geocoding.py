@@ -1,14 +1,17 @@
+"""
+Google Geocoding API client.
+
+These functions always hit Google (subject to the request quota); caching is
+the job of `service.GeocodingService`, which callers should go through.
+"""
+
 import logging
 from typing import Optional, Tuple
 
-import aiohttp
-
-from trovabenzina.config import GEOCODE_HARD_CAP, GOOGLE_API_KEY, MAPS_GEOCODING_URL
-from trovabenzina.db import (
-    get_geocache,
-    count_geocoding_month_calls,
-    save_geocache,
-)
+from trovabenzina.config import GOOGLE_API_KEY, MAPS_GEOCODING_URL
+from .quota import geocoding_quota_exceeded, record_geocoding_call
+from ..breaker import UpstreamError
+from ..http_client import get_http_session
 
 __all__ = ["geocode_address", "geocode_address_with_country"]
 
@@ -18,8 +21,8 @@ log = logging.getLogger(__name__)
 async def geocode_address(addr: str) -> Optional[Tuple[float, float]]:
     """Resolve an address to coordinates using Google Geocoding API.
 
-    Applies a read-through cache and enforces a monthly hard cap. Returns a
-    `(lat, lng)` tuple or `None` if resolution fails or quota is exceeded.
+    Enforces the monthly hard cap. Returns a `(lat, lng)` tuple or `None` if
+    resolution fails or quota is exceeded.
 
     Args:
         addr: The address to geocode (assumed Italian context).
@@ -27,15 +30,8 @@ async def geocode_address(addr: str) -> Optional[Tuple[float, float]]:
     Returns:
         Optional[Tuple[float, float]]: (latitude, longitude) if found; else None.
     """
-    # Try cached coordinates first
-    record = await get_geocache(addr)
-    if record:
-        return record.lat, record.lng
-
     # Enforce monthly hard cap
-    count = await count_geocoding_month_calls()
-    if count >= GEOCODE_HARD_CAP:
-        log.info("Geocoding hard cap reached: %s >= %s", count, GEOCODE_HARD_CAP)
+    if await geocoding_quota_exceeded():
         return None
 
     params = {
@@ -45,14 +41,13 @@ async def geocode_address(addr: str) -> Optional[Tuple[float, float]]:
         "key": GOOGLE_API_KEY,
     }
 
+    await record_geocoding_call()
     try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(MAPS_GEOCODING_URL, params=params) as resp:
-                if resp.status != 200:
-                    log.warning("Geocoding failed (status=%s) for %r", resp.status, addr)
-                    return None
-                data = await resp.json()
+        async with get_http_session().get(MAPS_GEOCODING_URL, params=params) as resp:
+            if resp.status != 200:
+                log.warning("Geocoding failed (status=%s) for %r", resp.status, addr)
+                return None
+            data = await resp.json()
     except Exception as exc:
         log.warning("Geocoding error for %r: %s", addr, exc)
         return None
@@ -77,15 +72,7 @@ async def geocode_address(addr: str) -> Optional[Tuple[float, float]]:
     if not loc or "lat" not in loc or "lng" not in loc:
         return None
 
-    lat, lng = float(loc["lat"]), float(loc["lng"])
-
-    # Update cache on success (non-blocking on failure)
-    try:
-        await save_geocache(addr, lat, lng)
-    except Exception as exc:
-        log.debug("Failed to update geocache for %r: %s", addr, exc)
-
-    return lat, lng
+    return float(loc["lat"]), float(loc["lng"])
 
 
 async def geocode_address_with_country(addr: str) -> Optional[Tuple[float, float, Optional[str]]]:
@@ -95,26 +82,24 @@ async def geocode_address_with_country(addr: str) -> Optional[Tuple[float, float
     It returns (lat, lng, country_code). If the country is not Italy, the caller
     can decide how to handle it (e.g., show a message and stop).
 
-    Caching policy:
-      - If the result is in Italy (IT), it will be cached (address -> lat/lng).
-      - If the result is outside Italy, it will NOT be cached.
+    Only a definitive answer (`ZERO_RESULTS`, or a result without coordinates)
+    returns None; failures that a later retry may not hit raise instead, so
+    callers can avoid caching them as "not found".
 
     Args:
         addr: Free-form address string.
 
     Returns:
         Optional[Tuple[float, float, Optional[str]]]: (lat, lng, country_code) or None.
-    """
-    # Try cached coordinates first; assume Italy for cached entries
-    record = await get_geocache(addr)
-    if record:
-        return record.lat, record.lng, "IT"
 
+    Raises:
+        UpstreamError: On quota exhaustion, transport errors or timeouts, a
+            non-200 HTTP status, or a Google status other than `OK` and
+            `ZERO_RESULTS` (e.g. `OVER_QUERY_LIMIT`, `UNKNOWN_ERROR`).
+    """
     # Enforce monthly hard cap
-    count = await count_geocoding_month_calls()
-    if count >= GEOCODE_HARD_CAP:
-        log.info("Geocoding hard cap reached: %s >= %s", count, GEOCODE_HARD_CAP)
-        return None
+    if await geocoding_quota_exceeded():
+        raise UpstreamError("Geocoding quota exceeded")
 
     params = {
         "address": addr,
@@ -122,17 +107,25 @@ async def geocode_address_with_country(addr: str) -> Optional[Tuple[float, float
         "key": GOOGLE_API_KEY,
     }
 
+    await record_geocoding_call()
     try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(MAPS_GEOCODING_URL, params=params) as resp:
-                if resp.status != 200:
-                    log.warning("Geocoding (country-aware) failed (status=%s) for %r", resp.status, addr)
-                    return None
-                data = await resp.json()
+        async with get_http_session().get(MAPS_GEOCODING_URL, params=params) as resp:
+            if resp.status != 200:
+                log.warning("Geocoding (country-aware) failed (status=%s) for %r", resp.status, addr)
+                raise UpstreamError(f"Geocoding HTTP status {resp.status}")
+            data = await resp.json()
+    except UpstreamError:
+        raise
     except Exception as exc:
-        log.warning("Geocoding (country-aware) error for %r: %s", addr, exc)
+        log.warning("Geocoding (country-aware) error for %r: %s", addr, exc or type(exc).__name__)
+        raise UpstreamError(f"Geocoding request failed: {exc or type(exc).__name__}") from exc
+
+    status = data.get("status", "OK")
+    if status == "ZERO_RESULTS":
         return None
+    if status != "OK":
+        log.warning("Geocoding (country-aware) status %s for %r: %s", status, addr, data.get("error_message"))
+        raise UpstreamError(f"Geocoding status {status}")
 
     results = data.get("results", [])
     if not results:
@@ -148,13 +141,4 @@ async def geocode_address_with_country(addr: str) -> Optional[Tuple[float, float
     if "lat" not in loc or "lng" not in loc:
         return None
 
-    lat, lng = float(loc["lat"]), float(loc["lng"])
-
-    # Cache only if in Italy
-    if country_code == "IT":
-        try:
-            await save_geocache(addr, lat, lng)
-        except Exception as exc:
-            log.debug("Failed to update geocache for %r: %s", addr, exc)
-
-    return lat, lng, country_code
+    return float(loc["lat"]), float(loc["lng"]), country_code
@@ -0,0 +1,89 @@
+"""
+Monthly hard cap on Google Geocoding requests.
+
+The number of calls in the rolling window is kept in memory and reloaded from
+the `geocoding_quota` daily counters at most every `GEOCODE_QUOTA_REFRESH`
+seconds, so checking the cap is a memory read. Every request actually sent to
+Google is recorded both locally and in the counter row of the current day.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict
+
+from trovabenzina.config import GEOCODE_HARD_CAP, GEOCODE_QUOTA_REFRESH, GEOCODE_QUOTA_WINDOW_DAYS
+from trovabenzina.db import record_geocoding_calls, sum_geocoding_calls
+
+__all__ = ["geocoding_quota_exceeded", "record_geocoding_call", "geocoding_quota_stats"]
+
+log = logging.getLogger(__name__)
+
+
+class _QuotaWindow:
+    """In-memory view of the rolling geocoding call count."""
+
+    def __init__(self, cap: int, window_days: int, refresh_interval: float) -> None:
+        self.cap = cap
+        self.window_days = window_days
+        self.refresh_interval = refresh_interval
+        self.used = 0
+        self._loaded_at = float("-inf")
+        self._refreshes = 0
+
+    async def _refresh_if_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._loaded_at < self.refresh_interval:
+            return
+        try:
+            self.used = await sum_geocoding_calls(self.window_days)
+            self._refreshes += 1
+        except Exception as exc:
+            # Keep the last known value; retry on the next check
+            log.warning("Failed to reload geocoding quota: %s", exc)
+        self._loaded_at = now
+
+    async def exceeded(self) -> bool:
+        await self._refresh_if_stale()
+        return self.used >= self.cap
+
+    async def record(self) -> None:
+        self.used += 1
+        try:
+            await record_geocoding_calls(1)
+        except Exception as exc:
+            log.warning("Failed to persist geocoding call: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "used": self.used,
+            "cap": self.cap,
+            "window_days": self.window_days,
+            "refreshes": self._refreshes,
+        }
+
+
+_window = _QuotaWindow(GEOCODE_HARD_CAP, GEOCODE_QUOTA_WINDOW_DAYS, GEOCODE_QUOTA_REFRESH)
+
+
+async def geocoding_quota_exceeded() -> bool:
+    """Return True if the rolling geocoding cap has been reached.
+
+    Returns:
+        bool: Whether new Google requests must be refused.
+    """
+    exceeded = await _window.exceeded()
+    if exceeded:
+        log.info("Geocoding hard cap reached: %s >= %s", _window.used, _window.cap)
+    return exceeded
+
+
+async def record_geocoding_call() -> None:
+    """Account for one request sent to Google (call right before sending it)."""
+    await _window.record()
+
+
+def geocoding_quota_stats() -> Dict[str, Any]:
+    """Return the in-memory quota state (calls used, cap, window, refreshes)."""
+    return _window.stats()
@@ -0,0 +1,183 @@
+"""
+Two-tier geocoding service: process LRU in front of the Postgres geocache.
+
+`resolve_address()` performs exactly one read-through lookup per request:
+memory, then `geocache` (exact key, optional fuzzy match), then Google, after
+checking the request quota. Addresses Google definitively could not resolve
+(`ZERO_RESULTS`), or resolved outside Italy, are cached negatively in memory
+for `GEOCODE_NEGATIVE_TTL` seconds so retries of the same text do not cost
+another paid call. Transient failures (timeouts, HTTP errors,
+`OVER_QUERY_LIMIT`, ...) return `GEOCODE_ERROR` and are not cached.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, NamedTuple, Optional
+
+from trovabenzina.config import GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL, GEOCODE_NEGATIVE_TTL
+from trovabenzina.db import get_geocache, save_geocache
+from trovabenzina.utils.address import normalize_address_key
+from trovabenzina.utils.cache import LRUCache
+from .geocoding import geocode_address_with_country
+from .quota import geocoding_quota_exceeded
+from ..breaker import UpstreamError
+from ..singleflight import SingleFlight
+
+__all__ = [
+    "GEOCODE_OK",
+    "GEOCODE_NOT_FOUND",
+    "GEOCODE_FOREIGN",
+    "GEOCODE_QUOTA",
+    "GEOCODE_ERROR",
+    "GeocodeResult",
+    "GeocodingService",
+    "resolve_address",
+    "geocoding_service_stats",
+]
+
+log = logging.getLogger(__name__)
+
+GEOCODE_OK = "ok"
+GEOCODE_NOT_FOUND = "not_found"
+GEOCODE_FOREIGN = "foreign"
+GEOCODE_QUOTA = "quota"
+GEOCODE_ERROR = "error"
+
+
+class GeocodeResult(NamedTuple):
+    """Outcome of resolving an address.
+
+    Attributes:
+        status: One of `GEOCODE_OK`, `GEOCODE_NOT_FOUND`, `GEOCODE_FOREIGN`,
+            `GEOCODE_QUOTA`, `GEOCODE_ERROR` (transient, worth retrying later).
+        lat: Latitude when resolved (also set for foreign results).
+        lng: Longitude when resolved (also set for foreign results).
+        country: ISO2 country code when known.
+    """
+
+    status: str
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    country: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == GEOCODE_OK
+
+
+class GeocodingService:
+    """Read-through geocoder over an in-process LRU and the Postgres geocache.
+
+    Attributes:
+        negative_ttl: Lifetime in seconds of not-found/foreign entries.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float) -> None:
+        self.negative_ttl = negative_ttl
+        self._memory: LRUCache[str, GeocodeResult] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._db_hits = 0
+        self._google_calls = 0
+        self._google_errors = 0
+        self._negative_stored = 0
+        self._flight = SingleFlight("geocoding")
+
+    async def resolve(self, address: str) -> GeocodeResult:
+        """Resolve an address typed by a user.
+
+        Args:
+            address: Free-form address.
+
+        Returns:
+            GeocodeResult: Coordinates or the reason they are unavailable.
+        """
+        key = normalize_address_key(address)
+        if not key:
+            # Blank input: nothing to look up
+            return GeocodeResult(GEOCODE_NOT_FOUND)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+
+        # Concurrent requests for the same address share the DB/Google lookup
+        return await self._flight.do(key, lambda: self._resolve_miss(address, key))
+
+    async def _resolve_miss(self, address: str, key: str) -> GeocodeResult:
+        """Resolve a memory miss through the geocache, then Google."""
+        record = await get_geocache(address)
+        if record is not None:
+            self._db_hits += 1
+            result = GeocodeResult(GEOCODE_OK, record.lat, record.lng, "IT")
+            self._memory.set(key, result)
+            return result
+
+        if await geocoding_quota_exceeded():
+            return GeocodeResult(GEOCODE_QUOTA)
+
+        self._google_calls += 1
+        try:
+            coords = await geocode_address_with_country(address)
+        except UpstreamError:
+            # Not an answer about the address: the next attempt may succeed
+            self._google_errors += 1
+            return GeocodeResult(GEOCODE_ERROR)
+        if not coords:
+            return self._store_negative(key, GeocodeResult(GEOCODE_NOT_FOUND))
+
+        lat, lng, country = coords
+        if country and country != "IT":
+            return self._store_negative(key, GeocodeResult(GEOCODE_FOREIGN, lat, lng, country))
+
+        result = GeocodeResult(GEOCODE_OK, lat, lng, country or "IT")
+        self._memory.set(key, result)
+        try:
+            await save_geocache(address, lat, lng)
+        except Exception as exc:
+            log.warning("Failed to update geocache for %r: %s", address, exc)
+        return result
+
+    def _store_negative(self, key: str, result: GeocodeResult) -> GeocodeResult:
+        self._memory.set(key, result, ttl=self.negative_ttl)
+        self._negative_stored += 1
+        return result
+
+    def invalidate(self, address: str) -> None:
+        """Drop the in-memory entry of an address."""
+        self._memory.pop(normalize_address_key(address))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier hit counters."""
+        memory = self._memory.stats()
+        return {
+            "memory_size": memory["size"],
+            "memory_hits": memory["hits"],
+            "db_hits": self._db_hits,
+            "google_calls": self._google_calls,
+            "google_errors": self._google_errors,
+            "negative_stored": self._negative_stored,
+        }
+
+
+_service = GeocodingService(
+    maxsize=GEOCODE_CACHE_SIZE,
+    ttl=GEOCODE_CACHE_TTL,
+    negative_ttl=GEOCODE_NEGATIVE_TTL,
+)
+
+
+async def resolve_address(address: str) -> GeocodeResult:
+    """Resolve an address through the shared geocoding service.
+
+    Args:
+        address: Free-form address.
+
+    Returns:
+        GeocodeResult: Coordinates or the reason they are unavailable.
+    """
+    return await _service.resolve(address)
+
+
+def geocoding_service_stats() -> Dict[str, Any]:
+    """Return memory/DB/Google counters of the geocoding service."""
+    return _service.stats()
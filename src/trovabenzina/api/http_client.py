@@ -0,0 +1,134 @@
+"""Application-scoped HTTP client shared by every outbound API call.
+
+A single `aiohttp.ClientSession` is opened when the bot starts and closed on
+shutdown, so MISE and Google requests reuse pooled keep-alive connections
+instead of paying a TCP+TLS handshake on every call. A trace config on the
+session records latency (until response headers), status codes and failures
+of every request by host in the metrics registry.
+"""
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+import aiohttp
+
+from trovabenzina.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_TIMEOUT,
+)
+from trovabenzina.utils import counter, histogram
+
+__all__ = ["start_http_client", "close_http_client", "get_http_session"]
+
+log = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+_UPSTREAM_SECONDS = histogram(
+    "trovabenzina_upstream_request_duration_seconds",
+    "Outbound HTTP latency until response headers, by host",
+    ("host",),
+)
+_UPSTREAM_RESPONSES = counter(
+    "trovabenzina_upstream_responses_total",
+    "Outbound HTTP responses by host and status code",
+    ("host", "status"),
+)
+_UPSTREAM_ERRORS = counter(
+    "trovabenzina_upstream_errors_total",
+    "Outbound HTTP requests that got no response, by host and error (timeout, cancelled, error)",
+    ("host", "error"),
+)
+
+
+async def _on_request_start(session: aiohttp.ClientSession, ctx: SimpleNamespace,
+                            params: aiohttp.TraceRequestStartParams) -> None:
+    ctx.started = time.perf_counter()
+
+
+async def _on_request_end(session: aiohttp.ClientSession, ctx: SimpleNamespace,
+                          params: aiohttp.TraceRequestEndParams) -> None:
+    host = params.url.host or ""
+    _UPSTREAM_SECONDS.labels(host).observe(time.perf_counter() - ctx.started)
+    _UPSTREAM_RESPONSES.labels(host, params.response.status).inc()
+
+
+async def _on_request_exception(session: aiohttp.ClientSession, ctx: SimpleNamespace,
+                                params: aiohttp.TraceRequestExceptionParams) -> None:
+    exc = params.exception
+    if isinstance(exc, asyncio.TimeoutError):
+        error = "timeout"
+    elif isinstance(exc, asyncio.CancelledError):
+        # Deadline of a circuit breaker or the losing attempt of a hedge
+        error = "cancelled"
+    else:
+        error = "error"
+    _UPSTREAM_ERRORS.labels(params.url.host or "", error).inc()
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_request_end.append(_on_request_end)
+    trace.on_request_exception.append(_on_request_exception)
+    return trace
+
+
+def _build_session() -> aiohttp.ClientSession:
+    """Create a pooled session configured from settings.
+
+    Returns:
+        aiohttp.ClientSession: A new session with keep-alive pooling, per-host
+        limits, DNS caching, default timeouts and request metrics.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+    )
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[_trace_config()])
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared session, opening it lazily if needed.
+
+    Must be called from within a running event loop. The bot opens the session
+    at startup; the lazy path only covers scripts and ad-hoc usage.
+
+    Returns:
+        aiohttp.ClientSession: The application-wide session.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+    return _session
+
+
+async def start_http_client() -> None:
+    """Open the shared session (idempotent)."""
+    get_http_session()
+    log.info(
+        "HTTP client started: limit=%s, limit_per_host=%s, timeout=%ss",
+        HTTP_POOL_LIMIT,
+        HTTP_POOL_LIMIT_PER_HOST,
+        HTTP_TIMEOUT,
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared session and release pooled connections (idempotent)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        log.info("HTTP client closed")
+    _session = None
@@ -1,6 +1,18 @@
 """MISE related APIs."""
 
+from .records import FuelPrice, StationRecord
+from .snapshot import search_snapshot, start_snapshot_refresh, stop_snapshot_refresh
 from .station_detail import get_station_address
-from .stations_search import search_stations
+from .stations_search import purge_zone_cache, search_stations, zone_cache_stats
 
-__all__ = ["search_stations", "get_station_address"]
+__all__ = [
+    "FuelPrice",
+    "StationRecord",
+    "search_stations",
+    "zone_cache_stats",
+    "purge_zone_cache",
+    "get_station_address",
+    "search_snapshot",
+    "start_snapshot_refresh",
+    "stop_snapshot_refresh",
+]
@@ -0,0 +1,108 @@
+"""Compact station records decoded from MISE zone search replies.
+
+A wide urban zone search returns hundreds of stations, each carrying every
+fuel it sells plus fields the bot never reads. `decode_zone_payload()` parses
+the raw body (with orjson when installed, straight from bytes) and keeps only
+what searches use: identity, address, coordinates, update time and the price
+entries of the requested fuel, as tuples instead of nested dicts. The local
+snapshot produces the same records, so callers treat both sources alike.
+"""
+
+import json
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["FuelPrice", "StationRecord", "decode_zone_payload", "fuel_id_of", "loads"]
+
+
+class FuelPrice(NamedTuple):
+    """One price entry of a station.
+
+    Attributes:
+        fuel_id: MISE fuel id.
+        price: Price per unit.
+        is_self: True for self-service.
+    """
+
+    fuel_id: int
+    price: float
+    is_self: bool
+
+
+class StationRecord(NamedTuple):
+    """A station as returned by a zone search, restricted to one fuel.
+
+    Attributes:
+        id: MISE station id.
+        name: Station name.
+        brand: Brand name.
+        address: Address, when MISE provides one.
+        lat: Latitude, when known.
+        lng: Longitude, when known.
+        insert_date: ISO timestamp of the latest price update.
+        fuels: Price entries of the searched fuel.
+    """
+
+    id: int
+    name: Optional[str]
+    brand: Optional[str]
+    address: Optional[str]
+    lat: Optional[float]
+    lng: Optional[float]
+    insert_date: Optional[str]
+    fuels: Tuple[FuelPrice, ...]
+
+
+def loads(body: bytes) -> Any:
+    """Decode a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def fuel_id_of(fuel_type: str) -> Optional[int]:
+    """Return the fuel id of a MISE fuel type such as '1-x', or None."""
+    head = fuel_type.split("-", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+def decode_zone_payload(body: bytes, fuel_id: Optional[int] = None) -> List[StationRecord]:
+    """Decode a zone search reply into station records.
+
+    Args:
+        body: Raw response body.
+        fuel_id: Keep only price entries of this fuel (all entries when None).
+
+    Returns:
+        List[StationRecord]: Stations in the order MISE returned them.
+
+    Raises:
+        ValueError: If the body is not JSON or not a JSON object.
+    """
+    data = loads(body)
+    if not isinstance(data, dict):
+        raise ValueError("zone search reply is not a JSON object")
+
+    records = []
+    for st in data.get("results") or ():
+        loc = st.get("location") or {}
+        fuels = tuple(
+            FuelPrice(f["fuelId"], f["price"], bool(f.get("isSelf")))
+            for f in st.get("fuels") or ()
+            if f.get("price") is not None and (fuel_id is None or f.get("fuelId") == fuel_id)
+        )
+        records.append(StationRecord(
+            id=st["id"],
+            name=st.get("name"),
+            brand=st.get("brand"),
+            address=st.get("address") or None,
+            lat=loc.get("lat"),
+            lng=loc.get("lng"),
+            insert_date=st.get("insertDate"),
+            fuels=fuels,
+        ))
+    return records
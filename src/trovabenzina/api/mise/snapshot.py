@@ -0,0 +1,491 @@
+"""Nationwide MISE price snapshot with a local spatial index.
+
+MISE publishes daily open-data dumps of every active station (anagrafica) and
+of the current prices. This module parses both CSV files into a compact,
+array-backed store indexed by a lat/lng grid per fuel id, so searches can be
+answered locally; the live `search/zone` endpoint is only used as a fallback
+when no fresh snapshot is loaded. Freshness is the age of the data, taken from
+the dumps' "Estrazione del ..." banner, not the time the process loaded it:
+an outdated dump that MISE keeps serving stays stale across refreshes.
+
+Sources may be URLs (downloaded through the shared HTTP client) or local
+file paths, which makes the loader easy to exercise with fixture files.
+"""
+
+import asyncio
+import csv
+import logging
+import re
+import time
+from array import array
+from datetime import datetime
+from math import cos, floor, radians
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiofiles
+
+from trovabenzina.config import (
+    MISE_PRICES_CSV_URL,
+    MISE_REGISTRY_CSV_URL,
+    SNAPSHOT_ENABLED,
+    SNAPSHOT_GRID_DEG,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_REFRESH_INTERVAL,
+)
+from trovabenzina.utils.geo import haversine_km
+from .records import FuelPrice, StationRecord
+from ..http_client import get_http_session
+
+try:
+    from zoneinfo import ZoneInfo
+except Exception:  # pragma: no cover - fallback for old environments
+    ZoneInfo = None  # type: ignore[assignment]
+
+__all__ = [
+    "SnapshotStore",
+    "build_snapshot",
+    "load_snapshot",
+    "refresh_snapshot",
+    "search_snapshot",
+    "start_snapshot_refresh",
+    "stop_snapshot_refresh",
+]
+
+log = logging.getLogger(__name__)
+
+# `descCarburante` values mapped to the fuel ids used by the MISE search API
+FUEL_IDS_BY_DESC = {
+    "benzina": 1,
+    "gasolio": 2,
+    "metano": 3,
+    "gpl": 4,
+}
+
+_KM_PER_DEG_LAT = 111.32
+_MISE_TZ = ZoneInfo("Europe/Rome") if ZoneInfo else None
+
+_store: Optional["SnapshotStore"] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+
+class _FuelIndex:
+    """Per-fuel price rows plus a grid index over their station coordinates."""
+
+    __slots__ = ("station_idx", "price", "is_self", "updated_at", "grid")
+
+    def __init__(self) -> None:
+        self.station_idx = array("I")
+        self.price = array("d")
+        self.is_self = array("b")
+        self.updated_at = array("d")
+        self.grid: Dict[Tuple[int, int], array] = {}
+
+
+class SnapshotStore:
+    """Immutable-after-build store of stations and prices.
+
+    Stations live in parallel columns indexed by position; each fuel id has its
+    own rows and grid. Queries return the same station records as MISE zone
+    searches so callers can treat both sources the same way.
+
+    Attributes:
+        loaded_at: Monotonic time at which the store was built.
+        extracted_at: POSIX time of the oldest dump's extraction, if its banner
+            could be read.
+        grid_deg: Grid cell size in degrees.
+    """
+
+    def __init__(self, grid_deg: float) -> None:
+        self.grid_deg = grid_deg
+        self.loaded_at = time.monotonic()
+        self.extracted_at: Optional[float] = None
+        self.ids = array("q")
+        self.lat = array("d")
+        self.lng = array("d")
+        self.names: List[str] = []
+        self.brands: List[str] = []
+        self.addresses: List[str] = []
+        self._pos: Dict[int, int] = {}
+        self._fuels: Dict[int, _FuelIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def note_extraction(self, extracted_at: Optional[float]) -> None:
+        """Record a source dump's extraction time; the oldest one dates the store."""
+        if extracted_at is not None and (self.extracted_at is None or extracted_at < self.extracted_at):
+            self.extracted_at = extracted_at
+
+    def age(self) -> float:
+        """Return the age in seconds of the data (of the load, if the extraction date is unknown)."""
+        if self.extracted_at is not None:
+            return time.time() - self.extracted_at
+        return time.monotonic() - self.loaded_at
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return floor(lat / self.grid_deg), floor(lng / self.grid_deg)
+
+    def add_station(self, station_id: int, name: str, brand: str, address: str, lat: float, lng: float) -> None:
+        """Append a station (later duplicates of the same id are ignored)."""
+        if station_id in self._pos:
+            return
+        self._pos[station_id] = len(self.ids)
+        self.ids.append(station_id)
+        self.lat.append(lat)
+        self.lng.append(lng)
+        self.names.append(name)
+        self.brands.append(brand)
+        self.addresses.append(address)
+
+    def add_price(self, station_id: int, fuel_id: int, price: float, is_self: bool, updated_at: float) -> bool:
+        """Append a price row for a known station.
+
+        Returns:
+            bool: False if the station is not in the registry (row skipped).
+        """
+        pos = self._pos.get(station_id)
+        if pos is None:
+            return False
+        idx = self._fuels.get(fuel_id)
+        if idx is None:
+            idx = self._fuels[fuel_id] = _FuelIndex()
+        row = len(idx.price)
+        idx.station_idx.append(pos)
+        idx.price.append(price)
+        idx.is_self.append(1 if is_self else 0)
+        idx.updated_at.append(updated_at)
+        idx.grid.setdefault(self._cell(self.lat[pos], self.lng[pos]), array("I")).append(row)
+        return True
+
+    def num_prices(self) -> int:
+        """Return the total number of price rows across all fuels."""
+        return sum(len(idx.price) for idx in self._fuels.values())
+
+    def search(self, lat: float, lng: float, radius: float, fuel_id: int) -> List[StationRecord]:
+        """Return stations selling `fuel_id` within `radius` km of a point.
+
+        Args:
+            lat: Latitude of the search center.
+            lng: Longitude of the search center.
+            radius: Search radius in kilometers.
+            fuel_id: MISE fuel id.
+
+        Returns:
+            List[StationRecord]: Stations in ascending price order.
+        """
+        idx = self._fuels.get(fuel_id)
+        if idx is None:
+            return []
+
+        d_lat = radius / _KM_PER_DEG_LAT
+        d_lng = radius / (_KM_PER_DEG_LAT * max(cos(radians(lat)), 1e-6))
+        y0, x0 = self._cell(lat - d_lat, lng - d_lng)
+        y1, x1 = self._cell(lat + d_lat, lng + d_lng)
+
+        by_station: Dict[int, List[int]] = {}
+        distances: Dict[int, float] = {}
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                rows = idx.grid.get((y, x))
+                if rows is None:
+                    continue
+                for row in rows:
+                    pos = idx.station_idx[row]
+                    if pos not in distances:
+                        distances[pos] = haversine_km(lat, lng, self.lat[pos], self.lng[pos])
+                    if distances[pos] <= radius:
+                        by_station.setdefault(pos, []).append(row)
+
+        results = []
+        for pos, rows in by_station.items():
+            newest = max(idx.updated_at[r] for r in rows)
+            results.append(StationRecord(
+                id=self.ids[pos],
+                name=self.names[pos],
+                brand=self.brands[pos],
+                address=self.addresses[pos] or None,
+                lat=self.lat[pos],
+                lng=self.lng[pos],
+                insert_date=datetime.fromtimestamp(newest, _MISE_TZ).isoformat() if newest else None,
+                fuels=tuple(FuelPrice(fuel_id, idx.price[r], bool(idx.is_self[r])) for r in rows),
+            ))
+        results.sort(key=lambda st: min(f.price for f in st.fuels))
+        return results
+
+
+# ---------- CSV parsing ----------
+
+def _detect_delimiter(header: str) -> str:
+    """MISE switched from ';' to '|' over time; pick whichever the header uses."""
+    return "|" if header.count("|") > header.count(";") else ";"
+
+
+def _parse_float(raw: str) -> Optional[float]:
+    try:
+        return float(raw.strip().replace(",", "."))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _parse_mise_ts(raw: str) -> float:
+    """Parse `dd/mm/YYYY HH:MM:SS` (Europe/Rome) into a POSIX timestamp, 0 on failure."""
+    try:
+        dt = datetime.strptime(raw.strip(), "%d/%m/%Y %H:%M:%S")
+    except (AttributeError, ValueError):
+        return 0.0
+    if _MISE_TZ:
+        dt = dt.replace(tzinfo=_MISE_TZ)
+    return dt.timestamp()
+
+
+_EXTRACTION_BANNER = re.compile(r"Estrazione del\s+([0-9][0-9/-]*)(?:\s+([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?))?", re.I)
+
+
+def _parse_extraction_banner(line: str) -> Optional[float]:
+    """Parse the 'Estrazione del YYYY-MM-DD' banner (Europe/Rome) into a POSIX timestamp.
+
+    Day-first dates and an optional time are accepted too; without a time the
+    start of the day is used, which errs on the side of treating data as older.
+    """
+    match = _EXTRACTION_BANNER.search(line)
+    if match is None:
+        return None
+    day, clock = match.group(1), match.group(2) or "00:00"
+    if clock.count(":") == 1:
+        clock += ":00"
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+        try:
+            dt = datetime.strptime(f"{day} {clock}", f"{fmt} %H:%M:%S")
+        except ValueError:
+            continue
+        if _MISE_TZ:
+            dt = dt.replace(tzinfo=_MISE_TZ)
+        return dt.timestamp()
+    return None
+
+
+class _CsvLineParser:
+    """Incremental parser: reads the 'Estrazione del ...' banner date and the header."""
+
+    def __init__(self) -> None:
+        self.delimiter: Optional[str] = None
+        self.columns: Dict[str, int] = {}
+        self.extracted_at: Optional[float] = None
+
+    def feed(self, line: str) -> Optional[List[str]]:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            return None
+        if self.delimiter is None:
+            if "idImpianto" not in line:
+                # Banner line(s) before the header
+                if self.extracted_at is None:
+                    self.extracted_at = _parse_extraction_banner(line)
+                return None
+            self.delimiter = _detect_delimiter(line)
+            header = next(csv.reader([line], delimiter=self.delimiter))
+            self.columns = {name.strip(): i for i, name in enumerate(header)}
+            return None
+        return next(csv.reader([line], delimiter=self.delimiter))
+
+    def get(self, row: List[str], column: str) -> str:
+        i = self.columns.get(column)
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+
+def _add_registry_row(store: SnapshotStore, parser: _CsvLineParser, row: List[str]) -> bool:
+    try:
+        station_id = int(parser.get(row, "idImpianto"))
+    except ValueError:
+        return False
+    lat = _parse_float(parser.get(row, "Latitudine"))
+    lng = _parse_float(parser.get(row, "Longitudine"))
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180) or (lat == 0 and lng == 0):
+        return False
+    street = parser.get(row, "Indirizzo")
+    town = parser.get(row, "Comune")
+    province = parser.get(row, "Provincia")
+    address = ", ".join(p for p in (street, town) if p)
+    if province:
+        address = f"{address} ({province})"
+    store.add_station(
+        station_id,
+        name=parser.get(row, "Nome Impianto") or parser.get(row, "Gestore"),
+        brand=parser.get(row, "Bandiera"),
+        address=address,
+        lat=lat,
+        lng=lng,
+    )
+    return True
+
+
+def _add_price_row(store: SnapshotStore, parser: _CsvLineParser, row: List[str]) -> bool:
+    fuel_id = FUEL_IDS_BY_DESC.get(parser.get(row, "descCarburante").lower())
+    if fuel_id is None:
+        return False
+    try:
+        station_id = int(parser.get(row, "idImpianto"))
+    except ValueError:
+        return False
+    price = _parse_float(parser.get(row, "prezzo"))
+    if price is None or price <= 0:
+        return False
+    return store.add_price(
+        station_id,
+        fuel_id,
+        price,
+        is_self=parser.get(row, "isSelf") == "1",
+        updated_at=_parse_mise_ts(parser.get(row, "dtComu")),
+    )
+
+
+def build_snapshot(
+        registry_lines: Iterable[str],
+        price_lines: Iterable[str],
+        grid_deg: float = SNAPSHOT_GRID_DEG,
+) -> SnapshotStore:
+    """Build a store from already-available CSV lines (e.g., fixture files).
+
+    Args:
+        registry_lines: Lines of the `anagrafica_impianti_attivi` CSV.
+        price_lines: Lines of the `prezzo_alle_8` CSV.
+        grid_deg: Grid cell size in degrees.
+
+    Returns:
+        SnapshotStore: The populated store.
+    """
+    store = SnapshotStore(grid_deg)
+    parser = _CsvLineParser()
+    for line in registry_lines:
+        row = parser.feed(line)
+        if row is not None:
+            _add_registry_row(store, parser, row)
+    store.note_extraction(parser.extracted_at)
+    parser = _CsvLineParser()
+    for line in price_lines:
+        row = parser.feed(line)
+        if row is not None:
+            _add_price_row(store, parser, row)
+    store.note_extraction(parser.extracted_at)
+    return store
+
+
+async def _read_lines(source: str) -> List[str]:
+    """Return the decoded lines of a URL or a local file path."""
+    if source.startswith(("http://", "https://")):
+        async with get_http_session().get(source) as resp:
+            resp.raise_for_status()
+            return [raw.decode("utf-8", errors="replace") async for raw in resp.content]
+    async with aiofiles.open(source, mode="r", encoding="utf-8", errors="replace") as f:
+        return [line async for line in f]
+
+
+async def load_snapshot(
+        registry_source: str = MISE_REGISTRY_CSV_URL,
+        prices_source: str = MISE_PRICES_CSV_URL,
+        grid_deg: float = SNAPSHOT_GRID_DEG,
+) -> SnapshotStore:
+    """Download both CSV sources and build a new store from them.
+
+    Only the download runs on the event loop; parsing the nationwide dumps
+    takes seconds of CPU, so `build_snapshot` runs in a worker thread.
+
+    Args:
+        registry_source: URL or path of the station registry CSV.
+        prices_source: URL or path of the prices CSV.
+        grid_deg: Grid cell size in degrees.
+
+    Returns:
+        SnapshotStore: The populated store.
+    """
+    registry_lines = await _read_lines(registry_source)
+    price_lines = await _read_lines(prices_source)
+    return await asyncio.to_thread(build_snapshot, registry_lines, price_lines, grid_deg)
+
+
+async def refresh_snapshot() -> bool:
+    """Rebuild the snapshot from the configured sources and swap it in atomically.
+
+    Returns:
+        bool: True if a new snapshot was installed.
+    """
+    global _store
+    started = time.monotonic()
+    try:
+        store = await load_snapshot()
+    except Exception as exc:
+        log.warning("MISE snapshot refresh failed: %s", exc)
+        return False
+    if not len(store) or not store.num_prices():
+        log.warning("MISE snapshot refresh produced no data; keeping previous snapshot")
+        return False
+    _store = store
+    log.info(
+        "MISE snapshot loaded: %d stations, %d prices in %.1fs, data %.1fh old",
+        len(store),
+        store.num_prices(),
+        time.monotonic() - started,
+        store.age() / 3600,
+    )
+    if store.extracted_at is None:
+        log.warning("MISE snapshot has no extraction date; its age is counted from the load")
+    elif store.age() > SNAPSHOT_MAX_AGE:
+        log.warning("MISE snapshot is already stale (%.1fh old); searches use the live API", store.age() / 3600)
+    return True
+
+
+def search_snapshot(
+        lat: float,
+        lng: float,
+        radius: float,
+        fuel_id: int,
+        allow_stale: bool = False,
+) -> Optional[List[StationRecord]]:
+    """Answer a zone search from the local snapshot.
+
+    Args:
+        lat: Latitude of the search center.
+        lng: Longitude of the search center.
+        radius: Search radius in kilometers.
+        fuel_id: MISE fuel id.
+        allow_stale: Ignore `SNAPSHOT_MAX_AGE`, which is compared with the age
+            of the data (used while MISE is unavailable).
+
+    Returns:
+        Optional[List[StationRecord]]: Stations in ascending price order, or None
+        when no fresh snapshot is available and the caller should fall back to
+        the live API.
+    """
+    store = _store
+    if store is None:
+        return None
+    if not allow_stale and store.age() > SNAPSHOT_MAX_AGE:
+        return None
+    return store.search(lat, lng, radius, fuel_id)
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await refresh_snapshot()
+        await asyncio.sleep(SNAPSHOT_REFRESH_INTERVAL)
+
+
+async def start_snapshot_refresh() -> None:
+    """Start the periodic snapshot refresh task (no-op if disabled or running)."""
+    global _refresh_task
+    if not SNAPSHOT_ENABLED or (_refresh_task and not _refresh_task.done()):
+        return
+    _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_snapshot_refresh() -> None:
+    """Cancel the periodic snapshot refresh task."""
+    global _refresh_task
+    if _refresh_task is None:
+        return
+    _refresh_task.cancel()
+    try:
+        await _refresh_task
+    except asyncio.CancelledError:
+        pass
+    _refresh_task = None
@@ -1,35 +1,148 @@
+import asyncio
 import logging
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, Optional, Set
 
-import aiohttp
-
-from trovabenzina.config import MISE_DETAIL_URL
+from trovabenzina.config import (
+    HTTP_TIMEOUT,
+    MISE_BREAKER_FAILURES,
+    MISE_BREAKER_RESET,
+    MISE_BREAKER_WINDOW,
+    MISE_DETAIL_URL,
+    MISE_TIMEOUT_MIN,
+    MISE_TIMEOUT_MULTIPLIER,
+    STATION_REGISTRY_TTL,
+)
+from trovabenzina.db import get_station, save_station
+from .records import StationRecord
+from ..breaker import CircuitBreaker, CircuitOpenError, UpstreamError
+from ..http_client import get_http_session
+from ..singleflight import SingleFlight
 
 __all__ = ["get_station_address"]
 
 log = logging.getLogger(__name__)
 
+# Concurrent fetches of one station share a request; strong refs to background refreshes
+_station_flight = SingleFlight("mise_station")
+_refresh_tasks: Set[asyncio.Task] = set()
+_detail_breaker = CircuitBreaker(
+    "mise_detail",
+    failure_threshold=MISE_BREAKER_FAILURES,
+    reset_timeout=MISE_BREAKER_RESET,
+    window=MISE_BREAKER_WINDOW,
+    min_timeout=MISE_TIMEOUT_MIN,
+    max_timeout=HTTP_TIMEOUT,
+    multiplier=MISE_TIMEOUT_MULTIPLIER,
+)
+
+
+async def _fetch_station_detail(station_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch the raw registry record for a station from MISE.
 
-async def get_station_address(station_id: int) -> Optional[str]:
-    """Fetch a station's full address from the MISE public registry.
+    The request goes through the detail circuit breaker: while it is open no
+    request is sent, and slow replies are cut at the adaptive deadline.
 
     Args:
         station_id: Unique station identifier in the MISE registry.
 
     Returns:
-        Optional[str]: The address string if found; otherwise None.
+        Optional[Dict[str, Any]]: Decoded JSON object if successful; else None.
     """
     url = MISE_DETAIL_URL.format(id=station_id)
 
+    async def _request() -> Optional[Dict[str, Any]]:
+        async with get_http_session().get(url) as resp:
+            if resp.status >= 500:
+                raise UpstreamError(f"MISE detail status {resp.status}")
+            if resp.status != 200:
+                log.warning("MISE detail failed (status=%s) station_id=%s", resp.status, station_id)
+                return None
+            data = await resp.json(content_type=None)
+            return data if isinstance(data, dict) else None
+
     try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    log.warning("MISE detail failed (status=%s) station_id=%s", resp.status, station_id)
-                    return None
-                data = await resp.json(content_type=None)
-                return data.get("address") if isinstance(data, dict) else None
+        return await _detail_breaker.call(_request)
+    except CircuitOpenError:
+        return None
     except Exception as exc:
-        log.warning("Error fetching MISE detail for station %s: %s", station_id, exc)
+        log.warning("Error fetching MISE detail for station %s: %s", station_id, exc or type(exc).__name__)
         return None
+
+
+async def _refresh_station(station_id: int, seed: Optional[StationRecord]) -> Optional[str]:
+    """Fetch a station from MISE and store it in the local registry.
+
+    Args:
+        station_id: Unique station identifier in the MISE registry.
+        seed: Optional station record from a zone search (brand, name, location).
+
+    Returns:
+        Optional[str]: The address string if found; otherwise None.
+    """
+    data = await _fetch_station_detail(station_id)
+    if data is None:
+        return None
+
+    address = data.get("address") or None
+    try:
+        await save_station(
+            station_id,
+            brand=data.get("brand") or (seed.brand if seed else None),
+            name=data.get("name") or data.get("nomeImpianto") or (seed.name if seed else None),
+            address=address,
+            lat=seed.lat if seed else None,
+            lng=seed.lng if seed else None,
+        )
+    except Exception as exc:
+        log.debug("Failed to update station registry for %s: %s", station_id, exc)
+    return address
+
+
+def _load_station(station_id: int, seed: Optional[StationRecord]) -> Awaitable[Optional[str]]:
+    """Fetch and store a station, sharing the request with concurrent callers."""
+    return _station_flight.do(station_id, lambda: _refresh_station(station_id, seed))
+
+
+def _schedule_refresh(station_id: int, seed: Optional[StationRecord]) -> None:
+    """Refresh a stale registry entry in the background (one fetch per station)."""
+    if station_id in _station_flight:
+        return
+
+    task = asyncio.create_task(_load_station(station_id, seed))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def get_station_address(
+        station_id: int,
+        seed: Optional[StationRecord] = None,
+) -> Optional[str]:
+    """Return a station's full address, reading through the local registry.
+
+    Known stations are answered from the registry (in-process LRU, then DB).
+    Entries older than `STATION_REGISTRY_TTL` are still served but refreshed
+    from MISE in the background (skipped while the breaker is open); unknown
+    stations are fetched synchronously, or fail fast while it is open.
+
+    Args:
+        station_id: Unique station identifier in the MISE registry.
+        seed: Optional station record from a zone search, used to fill brand,
+            name and coordinates in the registry.
+
+    Returns:
+        Optional[str]: The address string if found; otherwise None.
+    """
+    try:
+        station = await get_station(station_id)
+    except Exception as exc:
+        log.debug("Station registry lookup failed for %s: %s", station_id, exc)
+        station = None
+
+    if station is not None and station.address:
+        age = (datetime.now(timezone.utc) - station.last_seen_ts).total_seconds()
+        if age > STATION_REGISTRY_TTL and not _detail_breaker.is_open:
+            _schedule_refresh(station_id, seed)
+        return station.address
+
+    return await _load_station(station_id, seed)
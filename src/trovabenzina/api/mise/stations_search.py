@@ -1,34 +1,92 @@
 import logging
-from typing import Any, Dict, Optional
+from typing import Dict, List, Optional
 
-import aiohttp
+from trovabenzina.config import (
+    HTTP_TIMEOUT,
+    MISE_BREAKER_FAILURES,
+    MISE_BREAKER_RESET,
+    MISE_BREAKER_WINDOW,
+    MISE_HEDGE_ENABLED,
+    MISE_HEDGE_PERCENTILE,
+    MISE_RETRY_ATTEMPTS,
+    MISE_RETRY_BASE_DELAY,
+    MISE_RETRY_BUDGET,
+    MISE_RETRY_MAX_DELAY,
+    MISE_SEARCH_URL,
+    MISE_TIMEOUT_MIN,
+    MISE_TIMEOUT_MULTIPLIER,
+    ZONE_CACHE_MAX_STATIONS,
+    ZONE_CACHE_PRECISION,
+    ZONE_CACHE_STALE_TTL,
+    ZONE_CACHE_TTL,
+)
+from .records import StationRecord, decode_zone_payload, fuel_id_of
+from .snapshot import search_snapshot
+from .zone_cache import ZoneCache, filter_stations_within
+from ..breaker import CircuitBreaker, CircuitOpenError, UpstreamError
+from ..http_client import get_http_session
+from ..retry import RetryPolicy
+from ..singleflight import SingleFlight
 
-from trovabenzina.config import MISE_SEARCH_URL
-
-__all__ = ["search_stations"]
+__all__ = ["search_stations", "purge_zone_cache", "zone_cache_stats"]
 
 log = logging.getLogger(__name__)
 
+_zone_cache = ZoneCache(
+    precision=ZONE_CACHE_PRECISION,
+    ttl=ZONE_CACHE_TTL,
+    max_stations=ZONE_CACHE_MAX_STATIONS,
+    stale_ttl=ZONE_CACHE_STALE_TTL,
+)
+_zone_flight = SingleFlight("mise_zone")
+_search_breaker = CircuitBreaker(
+    "mise_search",
+    failure_threshold=MISE_BREAKER_FAILURES,
+    reset_timeout=MISE_BREAKER_RESET,
+    window=MISE_BREAKER_WINDOW,
+    min_timeout=MISE_TIMEOUT_MIN,
+    max_timeout=HTTP_TIMEOUT,
+    multiplier=MISE_TIMEOUT_MULTIPLIER,
+)
+_search_retry = RetryPolicy(
+    "mise_search",
+    attempts=MISE_RETRY_ATTEMPTS,
+    base_delay=MISE_RETRY_BASE_DELAY,
+    max_delay=MISE_RETRY_MAX_DELAY,
+    budget=MISE_RETRY_BUDGET,
+)
 
-async def search_stations(
+
+def _hedge_delay() -> Optional[float]:
+    """Return after how long a zone request is hedged, or None (disabled / no data yet)."""
+    if not MISE_HEDGE_ENABLED or not _search_breaker.warmed_up():
+        return None
+    return _search_breaker.latency(MISE_HEDGE_PERCENTILE)
+
+
+async def _fetch_zone(
         lat: float,
         lng: float,
         radius: float,
         fuel_type: str,
-) -> Optional[Dict[str, Any]]:
-    """Search fuel stations around a point using the public MISE endpoint.
+) -> Optional[List[StationRecord]]:
+    """POST a single-point zone query to MISE.
 
-    The endpoint supports polygons; we pass a single point and a radius.
-    Results are requested in ascending price order.
+    Server errors raise `UpstreamError` so the circuit breaker counts them;
+    other non-200 replies are treated as an empty answer. The body is decoded
+    into compact records holding only the requested fuel's prices.
 
     Args:
         lat: Latitude of the search center.
         lng: Longitude of the search center.
-        radius: Search radius in meters.
-        fuel_type: MISE fuel type identifier (e.g., 'Benzina', 'Gasolio').
+        radius: Search radius in kilometers.
+        fuel_type: MISE fuel type identifier (e.g., '1-x').
 
     Returns:
-        Optional[Dict[str, Any]]: Decoded JSON payload if successful; else None.
+        Optional[List[StationRecord]]: Stations found, or None for a non-200 client error.
+
+    Raises:
+        UpstreamError: On 5xx replies or a malformed payload.
     """
     payload = {
         "points": [{"lat": lat, "lng": lng}],
@@ -37,15 +95,98 @@ async def search_stations(
         "priceOrder": "asc",
     }
 
+    async with get_http_session().post(MISE_SEARCH_URL, json=payload) as resp:
+        if resp.status >= 500:
+            raise UpstreamError(f"MISE search status {resp.status}")
+        if resp.status != 200:
+            log.warning("MISE search failed (status=%s) payload=%s", resp.status, payload)
+            return None
+        # MISE may reply with text/plain, so the body is decoded regardless of content-type
+        body = await resp.read()
     try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(MISE_SEARCH_URL, json=payload) as resp:
-                if resp.status != 200:
-                    log.warning("MISE search failed (status=%s) payload=%s", resp.status, payload)
-                    return None
-                # MISE may reply with text/plain; ignore content-type to parse JSON safely.
-                return await resp.json(content_type=None)
+        return decode_zone_payload(body, fuel_id_of(fuel_type))
+    except (ValueError, KeyError, TypeError, AttributeError) as exc:
+        raise UpstreamError(f"MISE search returned a malformed payload: {exc}") from exc
+
+
+def _serve_stale(lat: float, lng: float, radius: float, fuel_type: str) -> Optional[List[StationRecord]]:
+    """Answer from an expired zone or the (possibly stale) snapshot while MISE is down."""
+    data = _zone_cache.lookup(lat, lng, radius, fuel_type, allow_stale=True)
+    if data is None:
+        fuel_id = fuel_id_of(fuel_type)
+        if fuel_id is not None:
+            data = search_snapshot(lat, lng, radius, fuel_id, allow_stale=True)
+    if data is not None:
+        log.info("Serving stale zone data for (%.4f, %.4f) r=%s", lat, lng, radius)
+    return data
+
+
+async def search_stations(
+        lat: float,
+        lng: float,
+        radius: float,
+        fuel_type: str,
+) -> Optional[List[StationRecord]]:
+    """Search fuel stations around a point using the public MISE endpoint.
+
+    The endpoint supports polygons; we pass a single point and a radius.
+    Results are requested in ascending price order.
+
+    Lookups go through a short-TTL spatial cache. On a miss the query is
+    centred on the point's geohash cell and widened by the cell's half
+    diagonal, so the cached zone also covers later searches anywhere in the
+    same cell; the returned stations are filtered back to the requested circle.
+    Concurrent misses for the same cell, fuel and radius share one request.
+
+    Calls go through a circuit breaker with an adaptive deadline, are retried
+    with jittered backoff within `MISE_RETRY_BUDGET`, and are hedged once they
+    exceed the observed p90 latency. When MISE still fails or the breaker is
+    open, the search is answered from an expired cached zone or the stale
+    snapshot instead, if either covers it.
+
+    Args:
+        lat: Latitude of the search center.
+        lng: Longitude of the search center.
+        radius: Search radius in kilometers.
+        fuel_type: MISE fuel type identifier (e.g., '1-x').
+
+    Returns:
+        Optional[List[StationRecord]]: Stations in ascending price order if successful; else None.
+    """
+    cached = _zone_cache.lookup(lat, lng, radius, fuel_type)
+    if cached is not None:
+        return cached
+
+    cell, c_lat, c_lng, half_diagonal = _zone_cache.cell_center(lat, lng)
+    fetch_radius = round(radius + half_diagonal, 3)
+
+    async def _fetch_and_store() -> Optional[List[StationRecord]]:
+        fetched = await _search_retry.run(
+            lambda: _search_breaker.call(lambda: _fetch_zone(c_lat, c_lng, fetch_radius, fuel_type)),
+            hedge_after=_hedge_delay(),
+        )
+        if fetched is not None:
+            _zone_cache.store(cell, fuel_type, c_lat, c_lng, fetch_radius, fetched)
+        return fetched
+
+    try:
+        data = await _zone_flight.do((cell, fuel_type, fetch_radius), _fetch_and_store)
+    except CircuitOpenError:
+        return _serve_stale(lat, lng, radius, fuel_type)
     except Exception as exc:
-        log.warning("MISE search error: %s", exc)
+        log.warning("MISE search error: %s", exc or type(exc).__name__)
+        return _serve_stale(lat, lng, radius, fuel_type)
+
+    if data is None:
         return None
+    return filter_stations_within(data, lat, lng, radius)
+
+
+def purge_zone_cache() -> int:
+    """Drop expired zones from the search cache and return how many were removed."""
+    return _zone_cache.purge_expired()
+
+
+def zone_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters and size of the zone search cache."""
+    return _zone_cache.stats()
@@ -0,0 +1,202 @@
+"""Short-TTL spatial cache for MISE zone searches.
+
+Entries are keyed by (geohash cell, fuel type, radius) and hold the decoded
+station records returned by MISE for a circle centred on the cell. A request is
+served from the nearest cached circle (same or adjacent cell) that fully
+contains it; the station list is then filtered down to the requested circle.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from trovabenzina.utils.geo import geohash_bounds, geohash_encode, geohash_neighbors, haversine_km
+from .records import StationRecord
+
+__all__ = ["ZoneCache", "filter_stations_within"]
+
+_Key = Tuple[str, str, float]
+
+
+class _Entry:
+    __slots__ = ("lat", "lng", "radius", "stations", "expires_at", "size")
+
+    def __init__(self, lat: float, lng: float, radius: float, stations: List[StationRecord],
+                 expires_at: float) -> None:
+        self.lat = lat
+        self.lng = lng
+        self.radius = radius
+        self.stations = stations
+        self.expires_at = expires_at
+        self.size = len(stations) + 1
+
+
+def filter_stations_within(stations: Sequence[StationRecord], lat: float, lng: float,
+                           radius: float) -> List[StationRecord]:
+    """Return the stations of a zone that lie inside a circle.
+
+    Stations without coordinates are kept, as MISE already placed them in the zone.
+
+    Args:
+        stations: Station records of a zone search.
+        lat: Latitude of the circle center.
+        lng: Longitude of the circle center.
+        radius: Circle radius in kilometers.
+
+    Returns:
+        List[StationRecord]: The stations inside the circle, in their original order.
+    """
+    return [
+        st for st in stations
+        if st.lat is None or st.lng is None or haversine_km(lat, lng, st.lat, st.lng) <= radius
+    ]
+
+
+class ZoneCache:
+    """LRU/TTL cache of zone search results with geohash-based lookup.
+
+    Memory is bounded by the total number of cached station records rather
+    than by entry count, since one wide urban zone can hold hundreds of them.
+
+    Attributes:
+        precision: Geohash length used for cell keys.
+        ttl: Entry lifetime in seconds.
+        stale_ttl: Extra seconds an expired entry is kept for `allow_stale` lookups.
+        max_stations: Upper bound on cached station records across all entries.
+        hits: Lookups served from cache.
+        misses: Lookups that required an upstream call.
+        evictions: Entries dropped to respect `max_stations`.
+    """
+
+    def __init__(self, precision: int, ttl: float, max_stations: int, stale_ttl: float = 0) -> None:
+        self.precision = precision
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_stations = max_stations
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._by_cell: Dict[Tuple[str, str], Set[_Key]] = {}
+        self._size = 0
+
+    def cell_center(self, lat: float, lng: float) -> Tuple[str, float, float, float]:
+        """Return the cell for a point, its center and the center-to-corner distance.
+
+        Args:
+            lat: Latitude.
+            lng: Longitude.
+
+        Returns:
+            Tuple[str, float, float, float]: `(geohash, center_lat, center_lng, half_diagonal_km)`.
+        """
+        cell = geohash_encode(lat, lng, self.precision)
+        lat_lo, lat_hi, lng_lo, lng_hi = geohash_bounds(cell)
+        c_lat, c_lng = (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+        return cell, c_lat, c_lng, haversine_km(c_lat, c_lng, lat_hi, lng_hi)
+
+    def lookup(self, lat: float, lng: float, radius: float, fuel_type: str,
+               allow_stale: bool = False) -> Optional[List[StationRecord]]:
+        """Return cached stations covering the requested circle, filtered to it.
+
+        Args:
+            lat: Latitude of the search center.
+            lng: Longitude of the search center.
+            radius: Search radius in kilometers.
+            fuel_type: MISE fuel type identifier.
+            allow_stale: Also accept entries expired less than `stale_ttl` ago
+                (used while the upstream is unavailable).
+
+        Returns:
+            Optional[List[StationRecord]]: Filtered stations, or None on a miss.
+        """
+        now = time.monotonic()
+        cell = geohash_encode(lat, lng, self.precision)
+        best: Optional[Tuple[float, _Key, _Entry]] = None
+        for c in [cell, *geohash_neighbors(cell)]:
+            for key in list(self._by_cell.get((c, fuel_type), ())):
+                entry = self._entries[key]
+                if entry.expires_at + self.stale_ttl <= now:
+                    self._remove(key)
+                    continue
+                if entry.expires_at <= now and not allow_stale:
+                    continue
+                dist = haversine_km(lat, lng, entry.lat, entry.lng)
+                if dist + radius <= entry.radius and (best is None or dist < best[0]):
+                    best = (dist, key, entry)
+
+        if best is None:
+            if not allow_stale:
+                self.misses += 1
+            return None
+
+        _, key, entry = best
+        self._entries.move_to_end(key)
+        if allow_stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return filter_stations_within(entry.stations, lat, lng, radius)
+
+    def store(self, cell: str, fuel_type: str, lat: float, lng: float, radius: float,
+              stations: List[StationRecord]) -> None:
+        """Cache the stations fetched for a circle centred at `(lat, lng)`.
+
+        Args:
+            cell: Geohash cell the circle was centred on.
+            fuel_type: MISE fuel type identifier.
+            lat: Latitude of the fetched circle center.
+            lng: Longitude of the fetched circle center.
+            radius: Fetched radius in kilometers.
+            stations: Decoded station records.
+        """
+        key = (cell, fuel_type, radius)
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(lat, lng, radius, stations, time.monotonic() + self.ttl)
+        self._entries[key] = entry
+        self._by_cell.setdefault((cell, fuel_type), set()).add(key)
+        self._size += entry.size
+        while self._size > self.max_stations and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: _Key) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        bucket = self._by_cell.get((key[0], key[1]))
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._by_cell[(key[0], key[1])]
+
+    def purge_expired(self) -> int:
+        """Drop entries past their stale window (lookups only prune the cells they visit).
+
+        Returns:
+            int: Number of entries removed.
+        """
+        limit = time.monotonic() - self.stale_ttl
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= limit]
+        for key in expired:
+            self._remove(key)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are preserved)."""
+        self._entries.clear()
+        self._by_cell.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return entry/station counts and hit, miss, stale-hit and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "stations": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+        }
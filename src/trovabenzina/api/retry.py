@@ -0,0 +1,150 @@
+"""
+Retry with jittered exponential backoff, and hedged requests.
+
+`RetryPolicy.run()` retries failed attempts with "full jitter" backoff
+(a random delay up to `base_delay * 2**n`, capped at `max_delay`) as long as
+the whole operation fits the latency `budget`. Each attempt can be hedged:
+if it has not answered after `hedge_after` seconds (typically the observed
+p90 latency), an identical request is fired and the first success wins.
+Attempts run inside a `deadline_scope()`, so a circuit breaker they go through
+cuts them at the end of the budget and counts that as a timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from .breaker import CircuitOpenError, deadline_scope
+
+__all__ = ["RetryPolicy", "retry_stats"]
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_policies: Dict[str, "RetryPolicy"] = {}
+
+
+class RetryPolicy:
+    """Bounded retries with jittered backoff and optional hedging.
+
+    Args:
+        name: Name used in logs and stats.
+        attempts: Maximum attempts, the first included.
+        base_delay: Backoff base in seconds.
+        max_delay: Backoff cap in seconds.
+        budget: Total seconds the operation may take, backoff included.
+        give_up_on: Exception types that are never retried.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            *,
+            attempts: int,
+            base_delay: float,
+            max_delay: float,
+            budget: float,
+            give_up_on: Tuple[Type[BaseException], ...] = (CircuitOpenError,),
+    ) -> None:
+        self.name = name
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.give_up_on = give_up_on
+        self._calls = 0
+        self._retries = 0
+        self._exhausted = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        _policies[name] = self
+
+    def backoff(self, retry: int) -> float:
+        """Return the jittered delay before retry number `retry` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]], hedge_after: Optional[float]) -> T:
+        """Run `fn()`, firing a second identical call if the first is slower than `hedge_after`."""
+        first = asyncio.ensure_future(fn())
+        if hedge_after is None:
+            return await first
+
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                return first.result()
+
+            self._hedges += 1
+            tasks.append(asyncio.ensure_future(fn()))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # The loser (or every attempt, if we were cancelled) is abandoned
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def run(self, fn: Callable[[], Awaitable[T]], hedge_after: Optional[float] = None) -> T:
+        """Call `fn()` until it succeeds, attempts run out or the budget is spent.
+
+        Args:
+            fn: Zero-argument coroutine factory performing one attempt.
+            hedge_after: Seconds after which an attempt is hedged, or None.
+
+        Returns:
+            T: The first successful result.
+
+        Raises:
+            Exception: The last attempt's error (or `asyncio.TimeoutError`
+                when the budget ran out mid-attempt).
+        """
+        self._calls += 1
+        deadline = time.monotonic() + self.budget
+        retry = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                with deadline_scope(deadline):
+                    return await asyncio.wait_for(self._hedged(fn, hedge_after), remaining)
+            except self.give_up_on:
+                raise
+            except Exception as exc:
+                delay = self.backoff(retry)
+                retry += 1
+                if retry >= self.attempts or time.monotonic() + delay >= deadline:
+                    self._exhausted += 1
+                    raise
+                self._retries += 1
+                log.info("%s attempt %d failed (%s); retrying in %.2fs",
+                         self.name, retry, exc or type(exc).__name__, delay)
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, int]:
+        """Return call, retry, exhaustion and hedging counters."""
+        return {
+            "calls": self._calls,
+            "retries": self._retries,
+            "exhausted": self._exhausted,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+        }
+
+
+def retry_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every retry policy, by name."""
+    return {name: policy.stats() for name, policy in _policies.items()}
@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of identical in-flight upstream calls.
+
+Concurrent callers asking for the same key share one task instead of each
+sending its own request. The shared task is shielded, so a caller giving up
+(e.g. a `wait_for` timeout) does not cancel the call for the others; its
+result still lands in whatever cache the call populates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+__all__ = ["SingleFlight", "singleflight_stats"]
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key.
+
+    Attributes:
+        name: Group name used in stats.
+        executed: Calls that actually ran.
+        coalesced: Calls that joined an in-flight call instead of running.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.executed = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        _groups[name] = self
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` unless a call with the same key is in flight, then share its outcome.
+
+        Args:
+            key: Identity of the call (e.g. the request parameters).
+            fn: Zero-argument coroutine factory performing the call.
+
+        Returns:
+            T: The result of the (possibly shared) call; its exception is re-raised.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter went away
+        if not task.cancelled() and task.exception() is not None:
+            log.debug("Single-flight %s call %r failed: %s", self.name, key, task.exception())
+
+    def stats(self) -> Dict[str, int]:
+        """Return executed/coalesced counters and the number of calls in flight."""
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every single-flight group, by name."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -5,17 +5,81 @@ from .secrets import (
 from .settings import (
     TB_MODE,
     DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_COMMAND_TIMEOUT,
+    DB_APPLICATION_NAME,
+    DB_SLOW_QUERY_MS,
     PORT,
     BASE_URL,
     WEBHOOK_PATH,
     LOG_LEVEL,
+    UPDATE_CONCURRENCY,
+    UPDATE_QUEUE_LIMIT,
     DEFAULT_LANGUAGE,
-    FUEL_MAP,
-    LANGUAGE_MAP,
+    USER_PROFILE_CACHE_SIZE,
+    USER_PROFILE_CACHE_TTL,
+    SEARCH_QUEUE_MAXSIZE,
+    SEARCH_FLUSH_BATCH,
+    SEARCH_FLUSH_INTERVAL,
     MISE_SEARCH_URL,
     MISE_DETAIL_URL,
+    MISE_REGISTRY_CSV_URL,
+    MISE_PRICES_CSV_URL,
+    SNAPSHOT_ENABLED,
+    SNAPSHOT_REFRESH_INTERVAL,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_GRID_DEG,
+    ZONE_CACHE_PRECISION,
+    ZONE_CACHE_TTL,
+    ZONE_CACHE_MAX_STATIONS,
+    ZONE_CACHE_STALE_TTL,
+    STATION_CACHE_SIZE,
+    STATION_REGISTRY_TTL,
+    STATION_ADDRESS_CONCURRENCY,
+    STATION_ADDRESS_TIMEOUT,
     MAPS_GEOCODING_URL,
     GEOCODE_HARD_CAP,
+    GEOCODE_QUOTA_WINDOW_DAYS,
+    GEOCODE_QUOTA_REFRESH,
+    GEOCACHE_FUZZY_ENABLED,
+    GEOCACHE_FUZZY_THRESHOLD,
+    GEOCODE_CACHE_SIZE,
+    GEOCODE_CACHE_TTL,
+    GEOCODE_NEGATIVE_TTL,
+    MAINTENANCE_ENABLED,
+    MAINTENANCE_JITTER,
+    MAINTENANCE_BATCH_SIZE,
+    GEOCACHE_RETENTION_DAYS,
+    GEOCACHE_RETENTION_INTERVAL,
+    SOFT_DELETE_RETENTION_DAYS,
+    SOFT_DELETE_PURGE_INTERVAL,
+    ROLLUP_RECONCILE_INTERVAL,
+    CACHE_REFRESH_INTERVAL,
+    METRICS_ENABLED,
+    METRICS_HOST,
+    METRICS_PORT,
+    METRICS_PATH,
+    HTTP_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    MISE_BREAKER_FAILURES,
+    MISE_BREAKER_RESET,
+    MISE_BREAKER_WINDOW,
+    MISE_TIMEOUT_MIN,
+    MISE_TIMEOUT_MULTIPLIER,
+    MISE_RETRY_ATTEMPTS,
+    MISE_RETRY_BASE_DELAY,
+    MISE_RETRY_MAX_DELAY,
+    MISE_RETRY_BUDGET,
+    MISE_HEDGE_ENABLED,
+    MISE_HEDGE_PERCENTILE,
     ENABLE_DONATION,
     PAYPAL_LINK,
 )
@@ -24,17 +88,81 @@ __all__ = [
     # settings
     "TB_MODE",
     "DATABASE_URL",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
+    "DB_POOL_RECYCLE",
+    "DB_STATEMENT_CACHE_SIZE",
+    "DB_COMMAND_TIMEOUT",
+    "DB_APPLICATION_NAME",
+    "DB_SLOW_QUERY_MS",
     "PORT",
     "BASE_URL",
     "WEBHOOK_PATH",
     "LOG_LEVEL",
+    "UPDATE_CONCURRENCY",
+    "UPDATE_QUEUE_LIMIT",
     "DEFAULT_LANGUAGE",
-    "FUEL_MAP",
-    "LANGUAGE_MAP",
+    "USER_PROFILE_CACHE_SIZE",
+    "USER_PROFILE_CACHE_TTL",
+    "SEARCH_QUEUE_MAXSIZE",
+    "SEARCH_FLUSH_BATCH",
+    "SEARCH_FLUSH_INTERVAL",
     "MISE_SEARCH_URL",
     "MISE_DETAIL_URL",
+    "MISE_REGISTRY_CSV_URL",
+    "MISE_PRICES_CSV_URL",
+    "SNAPSHOT_ENABLED",
+    "SNAPSHOT_REFRESH_INTERVAL",
+    "SNAPSHOT_MAX_AGE",
+    "SNAPSHOT_GRID_DEG",
+    "ZONE_CACHE_PRECISION",
+    "ZONE_CACHE_TTL",
+    "ZONE_CACHE_MAX_STATIONS",
+    "ZONE_CACHE_STALE_TTL",
+    "STATION_CACHE_SIZE",
+    "STATION_REGISTRY_TTL",
+    "STATION_ADDRESS_CONCURRENCY",
+    "STATION_ADDRESS_TIMEOUT",
     "MAPS_GEOCODING_URL",
     "GEOCODE_HARD_CAP",
+    "GEOCODE_QUOTA_WINDOW_DAYS",
+    "GEOCODE_QUOTA_REFRESH",
+    "GEOCACHE_FUZZY_ENABLED",
+    "GEOCACHE_FUZZY_THRESHOLD",
+    "GEOCODE_CACHE_SIZE",
+    "GEOCODE_CACHE_TTL",
+    "GEOCODE_NEGATIVE_TTL",
+    "MAINTENANCE_ENABLED",
+    "MAINTENANCE_JITTER",
+    "MAINTENANCE_BATCH_SIZE",
+    "GEOCACHE_RETENTION_DAYS",
+    "GEOCACHE_RETENTION_INTERVAL",
+    "SOFT_DELETE_RETENTION_DAYS",
+    "SOFT_DELETE_PURGE_INTERVAL",
+    "ROLLUP_RECONCILE_INTERVAL",
+    "CACHE_REFRESH_INTERVAL",
+    "METRICS_ENABLED",
+    "METRICS_HOST",
+    "METRICS_PORT",
+    "METRICS_PATH",
+    "HTTP_TIMEOUT",
+    "HTTP_CONNECT_TIMEOUT",
+    "HTTP_POOL_LIMIT",
+    "HTTP_POOL_LIMIT_PER_HOST",
+    "HTTP_KEEPALIVE_TIMEOUT",
+    "HTTP_DNS_CACHE_TTL",
+    "MISE_BREAKER_FAILURES",
+    "MISE_BREAKER_RESET",
+    "MISE_BREAKER_WINDOW",
+    "MISE_TIMEOUT_MIN",
+    "MISE_TIMEOUT_MULTIPLIER",
+    "MISE_RETRY_ATTEMPTS",
+    "MISE_RETRY_BASE_DELAY",
+    "MISE_RETRY_MAX_DELAY",
+    "MISE_RETRY_BUDGET",
+    "MISE_HEDGE_ENABLED",
+    "MISE_HEDGE_PERCENTILE",
     "ENABLE_DONATION",
     "PAYPAL_LINK",
     # secrets
@@ -1,21 +1,32 @@
 import asyncio
 import logging
 
-from telegram.ext import ApplicationBuilder, MessageHandler, filters
+from telegram.ext import Application, ApplicationBuilder, MessageHandler, filters
 from telegram.request import HTTPXRequest
 
+from ..api import (
+    start_http_client,
+    close_http_client,
+    start_snapshot_refresh,
+    stop_snapshot_refresh,
+)
 from ..config import (
     BOT_TOKEN,
     TB_MODE,
     PORT,
     BASE_URL,
     WEBHOOK_PATH,
+    UPDATE_CONCURRENCY,
+    UPDATE_QUEUE_LIMIT,
 )
 from ..db import (
     init_db,
     sync_config_tables,
-    get_fuel_map,
-    get_language_map,
+    reload_catalog,
+    rekey_geocache,
+    enable_geocache_fuzzy,
+    start_search_writer,
+    stop_search_writer,
 )
 from ..handlers import (
     start_handler,
@@ -27,16 +38,38 @@ from ..handlers import (
     handle_unknown_command,
 )
 from ..utils import setup_logging, describe
+from .metrics import handler_error, start_metrics, stop_metrics
+from .scheduler import start_scheduler, stop_scheduler
+from .update_processor import ChatOrderedUpdateProcessor
 
-KNOWN_CMDS_RE = r"^/(start|search|profile|statistics|help)(?:@\w+)?(?:\s|$)"
+KNOWN_CMDS = ("start", "search", "profile", "statistics", "help")
+KNOWN_CMDS_RE = rf"^/({'|'.join(KNOWN_CMDS)})(?:@\w+)?(?:\s|$)"
 
 # Configure logging (level picked up inside setup_logging if you wired env there)
 setup_logging()
 log = logging.getLogger(__name__)
 
 
+async def _post_init(app: Application) -> None:
+    """Start application-scoped resources once the event loop is running."""
+    await start_http_client()
+    await start_snapshot_refresh()
+    await start_search_writer()
+    await start_scheduler()
+    await start_metrics(app)
+
+
+async def _post_shutdown(app: Application) -> None:
+    """Release application-scoped resources on shutdown."""
+    await stop_metrics()
+    await stop_scheduler()
+    await stop_search_writer()
+    await stop_snapshot_refresh()
+    await close_http_client()
+
+
 def main() -> None:
-    """Initialize DB, sync config tables, load maps, register handlers, and run the bot."""
+    """Initialize DB, sync config tables, load catalog, register handlers, and run the bot."""
     # Create and set a new async event loop
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -48,24 +81,30 @@ def main() -> None:
     loop.run_until_complete(sync_config_tables())
     log.info("Config tables synced from CSV files")
 
-    # Load mappings for handlers
-    language_map = loop.run_until_complete(get_language_map())
-    fuel_map = loop.run_until_complete(get_fuel_map())
-    from trovabenzina.config.settings import LANGUAGE_MAP, FUEL_MAP
-    LANGUAGE_MAP.clear()
-    LANGUAGE_MAP.update(language_map)
-    FUEL_MAP.clear()
-    FUEL_MAP.update(fuel_map)
-    log.info("Loaded code maps: %d languages, %d fuels", len(LANGUAGE_MAP), len(FUEL_MAP))
+    # Load the in-memory catalog of fuels and languages for handlers
+    loop.run_until_complete(reload_catalog())
+
+    # Bring geocache keys in line with the current address normalization (once per version)
+    loop.run_until_complete(rekey_geocache())
+    loop.run_until_complete(enable_geocache_fuzzy())
 
     httpx_request = HTTPXRequest(
         connect_timeout=20.0,
         read_timeout=20.0,
         write_timeout=20.0,
         pool_timeout=5.0,
+        connection_pool_size=UPDATE_CONCURRENCY,
     )
 
-    app = ApplicationBuilder().token(BOT_TOKEN).request(httpx_request).build()
+    app = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .request(httpx_request)
+        .concurrent_updates(ChatOrderedUpdateProcessor(UPDATE_CONCURRENCY, UPDATE_QUEUE_LIMIT, KNOWN_CMDS))
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
 
     # Handlers
     app.add_handler(start_handler)  # /start
@@ -79,6 +118,7 @@ def main() -> None:
         MessageHandler(filters.COMMAND & ~filters.Regex(KNOWN_CMDS_RE), handle_unknown_command),
         group=98,
     )
+    app.add_error_handler(handler_error)
 
     # Debug: registry
     log.debug("=== HANDLER REGISTRY ===")
@@ -0,0 +1,112 @@
+"""
+Metrics endpoint wiring: scrape-time collectors and the HTTP server lifecycle.
+
+Hot-path metrics (handlers, upstream HTTP, database statements, search
+outcomes) are recorded where they happen. Everything the modules already track
+for their `*_stats()` functions (caches, breakers, retries, the search writer,
+the connection pool, maintenance jobs, the update queue) is read only when
+Prometheus scrapes.
+
+`run_webhook` serves Telegram from PTB's own web server, which takes no extra
+routes, so the endpoint listens on `METRICS_PORT` in both webhook and polling
+mode.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import List
+
+from telegram.ext import Application, ContextTypes
+
+from ..api import (
+    breaker_stats,
+    geocoding_quota_stats,
+    geocoding_service_stats,
+    retry_stats,
+    singleflight_stats,
+    zone_cache_stats,
+)
+from ..config import METRICS_ENABLED, METRICS_HOST, METRICS_PATH, METRICS_PORT
+from ..db import geocache_stats, pool_stats, scope_stats, search_writer_stats
+from ..utils import REGISTRY, Gauge, counter, start_metrics_server, stats_metrics, stop_metrics_server
+from .scheduler import scheduler_stats
+
+__all__ = ["handler_error", "start_metrics", "stop_metrics"]
+
+log = logging.getLogger(__name__)
+
+# Numeric encoding of circuit breaker states for the `state` gauge
+_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+_HANDLER_ERRORS = counter(
+    "trovabenzina_handler_errors_total",
+    "Exceptions raised by handlers, by exception type",
+    ("error",),
+)
+
+_collectors_added = False
+
+
+async def handler_error(update: object, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+    """Error handler counting handler exceptions, then logging them as PTB would."""
+    _HANDLER_ERRORS.labels(type(ctx.error).__name__).inc()
+    log.error("Exception while handling an update", exc_info=ctx.error)
+
+
+def _collect_api() -> List[Gauge]:
+    breakers = {
+        name: {**stats, "state": _BREAKER_STATES.get(stats["state"], -1)}
+        for name, stats in breaker_stats().items()
+    }
+    return [
+        *stats_metrics("trovabenzina_zone_cache", zone_cache_stats()),
+        *stats_metrics("trovabenzina_geocoding", geocoding_service_stats()),
+        *stats_metrics("trovabenzina_geocoding_quota", geocoding_quota_stats()),
+        *stats_metrics("trovabenzina_singleflight", singleflight_stats(), label="flight"),
+        *stats_metrics("trovabenzina_breaker", breakers, label="breaker"),
+        *stats_metrics("trovabenzina_retry", retry_stats(), label="policy"),
+    ]
+
+
+def _collect_db() -> List[Gauge]:
+    return [
+        *stats_metrics("trovabenzina_db_pool", pool_stats()),
+        *stats_metrics("trovabenzina_geocache", geocache_stats()),
+        *stats_metrics("trovabenzina_search_writer", search_writer_stats()),
+        *stats_metrics("trovabenzina_update_db", scope_stats(), label="kind"),
+        *stats_metrics("trovabenzina_maintenance", scheduler_stats(), label="job"),
+    ]
+
+
+def _add_collectors(app: Application) -> None:
+    global _collectors_added
+    if _collectors_added:
+        return
+    processor = app.update_processor
+
+    def _collect_updates() -> List[Gauge]:
+        stats = getattr(processor, "stats", None)
+        return stats_metrics("trovabenzina_update_processor", stats()) if stats is not None else []
+
+    REGISTRY.add_collector(_collect_api)
+    REGISTRY.add_collector(_collect_db)
+    REGISTRY.add_collector(_collect_updates)
+    _collectors_added = True
+
+
+async def start_metrics(app: Application) -> None:
+    """Register the stats collectors and start the endpoint (no-op if disabled)."""
+    if not METRICS_ENABLED:
+        return
+    _add_collectors(app)
+    try:
+        await start_metrics_server(METRICS_HOST, METRICS_PORT, METRICS_PATH)
+    except OSError:
+        # A busy port must not keep the bot from serving users
+        log.exception("Metrics endpoint could not bind %s:%s", METRICS_HOST, METRICS_PORT)
+
+
+async def stop_metrics() -> None:
+    """Stop the metrics endpoint."""
+    await stop_metrics_server()
@@ -0,0 +1,177 @@
+"""
+Background maintenance jobs on an APScheduler `AsyncIOScheduler`.
+
+The scheduler starts and stops with the `Application` (see `core.bot`). Each
+job first runs shortly after startup and then on a fixed interval, both with
+up to `MAINTENANCE_JITTER` seconds of random delay so replicas do not fire
+together. Jobs touching the database also take a Postgres advisory lock and
+are skipped when another replica already holds it. Duration and rows touched
+are recorded per job and exposed by `scheduler_stats()`.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from ..api import purge_zone_cache
+from ..config import (
+    CACHE_REFRESH_INTERVAL,
+    GEOCACHE_RETENTION_DAYS,
+    GEOCACHE_RETENTION_INTERVAL,
+    MAINTENANCE_BATCH_SIZE,
+    MAINTENANCE_ENABLED,
+    MAINTENANCE_JITTER,
+    ROLLUP_RECONCILE_INTERVAL,
+    SOFT_DELETE_PURGE_INTERVAL,
+    SOFT_DELETE_RETENTION_DAYS,
+)
+from ..db import (
+    advisory_lock,
+    delete_old_geocache,
+    purge_soft_deleted,
+    reconcile_user_fuel_stats,
+    reload_catalog,
+)
+
+__all__ = ["start_scheduler", "stop_scheduler", "scheduler_stats"]
+
+log = logging.getLogger(__name__)
+
+_scheduler: Optional[AsyncIOScheduler] = None
+
+
+class _JobMetrics:
+    __slots__ = ("runs", "skipped", "failed", "rows", "last_rows", "last_duration", "max_duration")
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.skipped = 0
+        self.failed = 0
+        self.rows = 0
+        self.last_rows = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+
+
+_metrics: Dict[str, _JobMetrics] = {}
+
+
+async def _geocache_retention() -> int:
+    return await delete_old_geocache(GEOCACHE_RETENTION_DAYS, MAINTENANCE_BATCH_SIZE)
+
+
+async def _soft_delete_purge() -> int:
+    deleted = await purge_soft_deleted(SOFT_DELETE_RETENTION_DAYS, MAINTENANCE_BATCH_SIZE)
+    return sum(deleted.values())
+
+
+async def _cache_refresh() -> int:
+    await reload_catalog()
+    return purge_zone_cache()
+
+
+async def _run_job(name: str, fn: Callable[[], Awaitable[int]], locked: bool) -> None:
+    """Run one job, under its advisory lock when `locked`, and record its metrics."""
+    metrics = _metrics[name]
+    started = time.monotonic()
+    try:
+        if locked:
+            async with advisory_lock(f"trovabenzina:maintenance:{name}") as acquired:
+                if not acquired:
+                    metrics.skipped += 1
+                    log.debug("Maintenance job %s skipped: running on another replica", name)
+                    return
+                rows = await fn()
+        else:
+            rows = await fn()
+    except Exception:
+        metrics.failed += 1
+        log.exception("Maintenance job %s failed", name)
+        return
+
+    elapsed = time.monotonic() - started
+    metrics.runs += 1
+    metrics.rows += rows
+    metrics.last_rows = rows
+    metrics.last_duration = elapsed
+    metrics.max_duration = max(metrics.max_duration, elapsed)
+    log.info("Maintenance job %s: %d rows in %.2fs", name, rows, elapsed)
+
+
+def _add_job(
+        scheduler: AsyncIOScheduler,
+        name: str,
+        fn: Callable[[], Awaitable[int]],
+        interval: int,
+        locked: bool = True,
+) -> None:
+    _metrics.setdefault(name, _JobMetrics())
+    first_run = datetime.now(timezone.utc) + timedelta(seconds=random.uniform(0, MAINTENANCE_JITTER))
+    scheduler.add_job(
+        _run_job,
+        IntervalTrigger(seconds=interval, jitter=MAINTENANCE_JITTER),
+        args=(name, fn, locked),
+        id=name,
+        next_run_time=first_run,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=interval,
+    )
+
+
+async def start_scheduler() -> None:
+    """Start the maintenance scheduler (no-op if disabled or already running)."""
+    global _scheduler
+    if not MAINTENANCE_ENABLED or _scheduler is not None:
+        return
+
+    scheduler = AsyncIOScheduler(timezone=timezone.utc)
+    _add_job(scheduler, "geocache_retention", _geocache_retention, GEOCACHE_RETENTION_INTERVAL)
+    _add_job(scheduler, "soft_delete_purge", _soft_delete_purge, SOFT_DELETE_PURGE_INTERVAL)
+    _add_job(scheduler, "rollup_reconcile", reconcile_user_fuel_stats, ROLLUP_RECONCILE_INTERVAL)
+    # Process-local caches: every replica refreshes its own
+    _add_job(scheduler, "cache_refresh", _cache_refresh, CACHE_REFRESH_INTERVAL, locked=False)
+    scheduler.start()
+    _scheduler = scheduler
+    log.info("Maintenance scheduler started with %d jobs", len(scheduler.get_jobs()))
+
+
+async def stop_scheduler() -> None:
+    """Stop the maintenance scheduler; jobs already running are not awaited."""
+    global _scheduler
+    if _scheduler is None:
+        return
+    _scheduler.shutdown(wait=False)
+    _scheduler = None
+    log.info("Maintenance scheduler stopped")
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Return per-job counters, rows touched and durations, by job name.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: `runs`, `skipped` (lock held elsewhere),
+        `failed`, total and last `rows`, `last_duration`/`max_duration` in
+        seconds and the ISO `next_run` time when the scheduler is running.
+    """
+    stats = {}
+    for name, m in _metrics.items():
+        job = _scheduler.get_job(name) if _scheduler is not None else None
+        stats[name] = {
+            "runs": m.runs,
+            "skipped": m.skipped,
+            "failed": m.failed,
+            "rows": m.rows,
+            "last_rows": m.last_rows,
+            "last_duration": m.last_duration,
+            "max_duration": m.max_duration,
+            "next_run": job.next_run_time.isoformat() if job is not None and job.next_run_time else None,
+        }
+    return stats
@@ -0,0 +1,184 @@
+"""
+Update processor running different chats concurrently, each chat in order.
+
+PTB's `BaseUpdateProcessor.process_update` takes its semaphore before calling
+`do_process_update`; here that semaphore only bounds how many updates may be
+admitted (`UPDATE_QUEUE_LIMIT`). Each update then waits for its chat's lock,
+so updates of one chat run strictly in arrival order, and only afterwards for
+a worker slot (`UPDATE_CONCURRENCY`). A chat with a backlog therefore never
+holds worker slots that other chats could use.
+
+Each handler runs inside a `query_scope`, so the database queries one update
+costs are aggregated by update kind (command, callback, text, location), and
+its run time (excluding the wait for the chat and a worker) is recorded per
+kind in the metrics registry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Dict, Hashable, Iterable, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from ..db import query_scope
+from ..utils import counter, histogram
+
+__all__ = ["ChatOrderedUpdateProcessor"]
+
+_UPDATE_SECONDS = histogram(
+    "trovabenzina_update_duration_seconds",
+    "Time spent running the handlers of an update, by update kind",
+    ("kind",),
+)
+_UPDATE_WAIT_SECONDS = histogram(
+    "trovabenzina_update_wait_seconds",
+    "Time an update waited for its chat and a worker slot",
+)
+_UPDATES = counter(
+    "trovabenzina_updates_total",
+    "Updates processed, by update kind and outcome (ok, error, cancelled)",
+    ("kind", "outcome"),
+)
+
+
+class _ChatLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates of different chats in parallel, one at a time per chat.
+
+    Args:
+        concurrency: Maximum number of updates whose handlers run at once.
+        queue_limit: Maximum number of admitted updates (running + waiting).
+        commands: Command names reported individually in query totals; other
+            commands are grouped as "command".
+    """
+
+    __slots__ = (
+        "_concurrency",
+        "_commands",
+        "_workers",
+        "_chats",
+        "_running",
+        "_waiting",
+        "_max_waiting",
+        "_processed",
+    )
+
+    def __init__(self, concurrency: int, queue_limit: int, commands: Iterable[str] = ()) -> None:
+        super().__init__(max_concurrent_updates=max(queue_limit, concurrency))
+        self._concurrency = concurrency
+        self._commands = frozenset(commands)
+        self._workers = asyncio.Semaphore(concurrency)
+        self._chats: Dict[Hashable, _ChatLock] = {}
+        self._running = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._processed = 0
+
+    @staticmethod
+    def _chat_key(update: object) -> Optional[Hashable]:
+        """Return the ordering key of an update (chat id, else user id)."""
+        if isinstance(update, Update):
+            if update.effective_chat is not None:
+                return update.effective_chat.id
+            if update.effective_user is not None:
+                return ("user", update.effective_user.id)
+        return None
+
+    def _update_kind(self, update: object) -> str:
+        """Return a coarse label of an update for per-update query totals."""
+        if not isinstance(update, Update):
+            return "other"
+        if update.callback_query is not None:
+            return "callback"
+        message = update.effective_message
+        if message is None:
+            return "other"
+        if message.text and message.text.startswith("/"):
+            head = (message.text[1:].split(maxsplit=1) or [""])[0]
+            command = head.split("@", 1)[0].lower()
+            return f"/{command}" if command in self._commands else "command"
+        if message.location is not None:
+            return "location"
+        return "text" if message.text else "other"
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Await `coroutine` after the chat's previous updates and within the worker cap."""
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        started = False
+        queued_at = time.perf_counter()
+
+        key = self._chat_key(update)
+        entry = None
+        if key is not None:
+            entry = self._chats.get(key)
+            if entry is None:
+                entry = self._chats[key] = _ChatLock()
+            entry.users += 1
+
+        try:
+            async with entry.lock if entry is not None else nullcontext():
+                async with self._workers:
+                    started = True
+                    self._waiting -= 1
+                    self._running += 1
+                    kind = self._update_kind(update)
+                    began = time.perf_counter()
+                    _UPDATE_WAIT_SECONDS.observe(began - queued_at)
+                    outcome = "error"
+                    try:
+                        with query_scope(kind):
+                            await coroutine
+                        outcome = "ok"
+                    except asyncio.CancelledError:
+                        outcome = "cancelled"
+                        raise
+                    finally:
+                        self._running -= 1
+                        self._processed += 1
+                        _UPDATE_SECONDS.labels(kind).observe(time.perf_counter() - began)
+                        _UPDATES.labels(kind, outcome).inc()
+        finally:
+            if not started:
+                # Cancelled while queued (e.g. on shutdown)
+                self._waiting -= 1
+                if asyncio.iscoroutine(coroutine):
+                    coroutine.close()
+            if entry is not None:
+                entry.users -= 1
+                if entry.users == 0:
+                    self._chats.pop(key, None)
+
+    async def initialize(self) -> None:
+        """Nothing to allocate."""
+
+    async def shutdown(self) -> None:
+        """Nothing to release."""
+
+    def stats(self) -> Dict[str, int]:
+        """Return concurrency and queue-depth metrics.
+
+        Returns:
+            Dict[str, int]: `running` handlers, `waiting` updates (queue depth),
+            `max_waiting` since startup, `active_chats`, `processed` and the
+            configured `concurrency`.
+        """
+        return {
+            "running": self._running,
+            "waiting": self._waiting,
+            "max_waiting": self._max_waiting,
+            "active_chats": len(self._chats),
+            "processed": self._processed,
+            "concurrency": self._concurrency,
+        }
@@ -2,7 +2,11 @@
 
 Expose:
 - ORM models and mixins (Base, TimestampMixin, CodeNameMixin, entities, views)
-- Session/engine helpers (engine, AsyncSession, init_db)
+- Session/engine helpers (engine, AsyncSession, init_db, pool_stats)
+- In-memory catalog of fuels and languages (get_catalog, reload_catalog)
+- Write-behind queue for search analytics (enqueue_search, flush_pending_searches, start/stop_search_writer)
+- Advisory locks for single-replica background work (advisory_lock)
+- Per-statement timing tagged by repository function (query_stats, query_scope)
 - Repository functions (get_user, save_search, maps, stats, geocache, etc.)
 """
 
@@ -16,6 +20,9 @@ from .models import (
     User,
     Search,
     GeoCache,
+    GeocodingQuota,
+    Station,
+    UserFuelStats,
     VGeocodingMonthCalls,
     VUsersSearchesStats,
 )
@@ -30,6 +37,9 @@ from .repositories import (
     get_language_map,
     get_language_id_by_code,
     # users
+    UserProfile,
+    get_user_profile,
+    invalidate_user_profile,
     upsert_user,
     get_user,
     get_user_language_code_by_tg_id,
@@ -40,16 +50,44 @@ from .repositories import (
     soft_delete_user_searches_by_tg_id,
     # searches
     save_search,
+    save_searches,
+    reconcile_user_fuel_stats,
     # geocache
     get_geocache,
     save_geocache,
     delete_old_geocache,
+    rekey_geocache,
+    enable_geocache_fuzzy,
+    geocache_stats,
+    # maintenance
+    delete_in_batches,
+    purge_soft_deleted,
+    # geocoding quota
+    record_geocoding_calls,
+    sum_geocoding_calls,
+    # stations
+    get_station,
+    save_station,
     # stats views
     count_geocoding_month_calls,
     get_user_stats,
 )
+# Catalog
+from .catalog import Catalog, FuelEntry, LanguageEntry, get_catalog, reload_catalog
+# Search analytics writer
+from .search_writer import (
+    SearchWriter,
+    enqueue_search,
+    flush_pending_searches,
+    start_search_writer,
+    stop_search_writer,
+    search_writer_stats,
+)
 # Session
 from .session import engine, AsyncSession, init_db
+from .locks import advisory_lock
+from .pool import pool_stats
+from .instrumentation import query_scope, query_stats, scope_stats
 from .sync import sync_config_tables
 
 __all__ = [
@@ -62,12 +100,33 @@ __all__ = [
     "User",
     "Search",
     "GeoCache",
+    "GeocodingQuota",
+    "Station",
+    "UserFuelStats",
     "VGeocodingMonthCalls",
     "VUsersSearchesStats",
     # Session
     "engine",
     "AsyncSession",
     "init_db",
+    "advisory_lock",
+    "pool_stats",
+    "query_scope",
+    "query_stats",
+    "scope_stats",
+    # Catalog
+    "Catalog",
+    "FuelEntry",
+    "LanguageEntry",
+    "get_catalog",
+    "reload_catalog",
+    # Search writer
+    "SearchWriter",
+    "enqueue_search",
+    "flush_pending_searches",
+    "start_search_writer",
+    "stop_search_writer",
+    "search_writer_stats",
     # Repositories
     "get_fuel_map",
     "get_fuels_by_ids_map",
@@ -75,6 +134,9 @@ __all__ = [
     "get_fuel_name_by_code",
     "get_language_map",
     "get_language_id_by_code",
+    "UserProfile",
+    "get_user_profile",
+    "invalidate_user_profile",
     "upsert_user",
     "get_user",
     "get_user_language_code_by_tg_id",
@@ -82,11 +144,22 @@ __all__ = [
     "get_user_id_by_tg_id",
     "get_search_users",
     "save_search",
+    "save_searches",
+    "reconcile_user_fuel_stats",
     "soft_delete_user_searches",
     "soft_delete_user_searches_by_tg_id",
     "get_geocache",
     "save_geocache",
     "delete_old_geocache",
+    "rekey_geocache",
+    "enable_geocache_fuzzy",
+    "geocache_stats",
+    "delete_in_batches",
+    "purge_soft_deleted",
+    "record_geocoding_calls",
+    "sum_geocoding_calls",
+    "get_station",
+    "save_station",
     "count_geocoding_month_calls",
     "get_user_stats",
     # sync
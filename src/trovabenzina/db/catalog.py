@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+"""
+In-memory catalog of the domain config tables (fuels, languages).
+
+The tables are synced once at startup from CSV (see `sync.py`) and only change
+on redeploy, so handlers read them from an immutable snapshot instead of
+querying Postgres. `reload_catalog()` rebuilds the snapshot and swaps it in
+atomically; call it after `sync_config_tables()` or whenever the tables change.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+
+from .instrumentation import tagged
+from .models import Fuel, Language
+from .session import AsyncSession
+
+__all__ = ["FuelEntry", "LanguageEntry", "Catalog", "get_catalog", "reload_catalog"]
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class FuelEntry:
+    """Immutable copy of an active `Fuel` row."""
+
+    id: int
+    code: str
+    name: str
+    uom: str
+    avg_consumption_per_100km: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageEntry:
+    """Immutable copy of an active `Language` row."""
+
+    id: int
+    code: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    """Frozen snapshot of fuels and languages with O(1) lookups.
+
+    Attributes:
+        fuels: Active fuels ordered by id.
+        languages: Active languages ordered by id.
+    """
+
+    fuels: Tuple[FuelEntry, ...] = ()
+    languages: Tuple[LanguageEntry, ...] = ()
+    _fuel_by_id: Mapping[int, FuelEntry] = field(default_factory=dict, repr=False)
+    _fuel_by_code: Mapping[str, FuelEntry] = field(default_factory=dict, repr=False)
+    _fuel_by_name: Mapping[str, FuelEntry] = field(default_factory=dict, repr=False)
+    _language_by_id: Mapping[int, LanguageEntry] = field(default_factory=dict, repr=False)
+    _language_by_code: Mapping[str, LanguageEntry] = field(default_factory=dict, repr=False)
+    _language_by_name: Mapping[str, LanguageEntry] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, fuels: Iterable[FuelEntry], languages: Iterable[LanguageEntry]) -> "Catalog":
+        """Create a catalog and its read-only indexes.
+
+        Args:
+            fuels: Fuel entries.
+            languages: Language entries.
+
+        Returns:
+            Catalog: The frozen catalog.
+        """
+        fuels = tuple(sorted(fuels, key=lambda f: f.id))
+        languages = tuple(sorted(languages, key=lambda lang: lang.id))
+        return cls(
+            fuels=fuels,
+            languages=languages,
+            _fuel_by_id=MappingProxyType({f.id: f for f in fuels}),
+            _fuel_by_code=MappingProxyType({f.code: f for f in fuels}),
+            _fuel_by_name=MappingProxyType({f.name: f for f in fuels}),
+            _language_by_id=MappingProxyType({lang.id: lang for lang in languages}),
+            _language_by_code=MappingProxyType({lang.code: lang for lang in languages}),
+            _language_by_name=MappingProxyType({lang.name: lang for lang in languages}),
+        )
+
+    def fuel_by_id(self, fuel_id: int) -> Optional[FuelEntry]:
+        """Return the fuel with the given id, or None."""
+        return self._fuel_by_id.get(fuel_id)
+
+    def fuel_by_code(self, code: str) -> Optional[FuelEntry]:
+        """Return the fuel with the given code, or None."""
+        return self._fuel_by_code.get(code)
+
+    def fuel_by_name(self, name: str) -> Optional[FuelEntry]:
+        """Return the fuel with the given name, or None."""
+        return self._fuel_by_name.get(name)
+
+    def language_by_id(self, language_id: int) -> Optional[LanguageEntry]:
+        """Return the language with the given id, or None."""
+        return self._language_by_id.get(language_id)
+
+    def language_by_code(self, code: str) -> Optional[LanguageEntry]:
+        """Return the language with the given code, or None."""
+        return self._language_by_code.get(code)
+
+    def language_by_name(self, name: str) -> Optional[LanguageEntry]:
+        """Return the language with the given name, or None."""
+        return self._language_by_name.get(name)
+
+
+_catalog: Catalog = Catalog.build((), ())
+
+
+def get_catalog() -> Catalog:
+    """Return the current catalog snapshot (empty until `reload_catalog()` runs)."""
+    return _catalog
+
+
+@tagged
+async def reload_catalog() -> Catalog:
+    """Load active fuels and languages from the DB and swap the catalog in.
+
+    Returns:
+        Catalog: The newly installed snapshot.
+    """
+    global _catalog
+    async with AsyncSession() as session:
+        fuel_rows = (await session.execute(
+            select(Fuel.id, Fuel.code, Fuel.name, Fuel.uom, Fuel.avg_consumption_per_100km)
+            .where(Fuel.del_ts.is_(None))
+        )).all()
+        language_rows = (await session.execute(
+            select(Language.id, Language.code, Language.name)
+            .where(Language.del_ts.is_(None))
+        )).all()
+
+    _catalog = Catalog.build(
+        (FuelEntry(*row) for row in fuel_rows),
+        (LanguageEntry(*row) for row in language_rows),
+    )
+    log.info("Catalog loaded: %d languages, %d fuels", len(_catalog.languages), len(_catalog.fuels))
+    return _catalog
@@ -0,0 +1,260 @@
+"""Per-statement timing of database queries, tagged by repository function.
+
+Repository functions are decorated with `@tagged`, which stores their name in
+a context variable for the duration of the call; the engine's
+`before_cursor_execute`/`after_cursor_execute` hooks attribute every
+statement to the current tag (SQLAlchemy runs the driver in a greenlet that
+shares the caller's context). For each tag a latency histogram, statement
+count and rows touched are kept in the metrics registry
+(`trovabenzina_db_query_*`). Statements slower than `DB_SLOW_QUERY_MS`
+are logged with parameter values replaced by their types.
+
+`query_scope()` opens a per-unit-of-work accumulator (one per Telegram update,
+see `core.update_processor`) so the number and time of queries that a single
+update cost can be logged and aggregated by update kind.
+"""
+
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import DB_SLOW_QUERY_MS
+from ..utils import counter, histogram
+
+__all__ = [
+    "QUERY_BUCKETS",
+    "QueryTotals",
+    "instrument_queries",
+    "query_scope",
+    "query_stats",
+    "scope_stats",
+    "tagged",
+]
+
+log = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one is +Inf
+QUERY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_UNTAGGED = "untagged"
+_STATEMENT_LOG_CHARS = 500
+
+_tag: ContextVar[str] = ContextVar("db_query_tag", default=_UNTAGGED)
+_scope: ContextVar[Optional["QueryTotals"]] = ContextVar("db_query_scope", default=None)
+
+_QUERY_SECONDS = histogram(
+    "trovabenzina_db_query_duration_seconds",
+    "Database statement latency by repository function",
+    ("tag",),
+    QUERY_BUCKETS,
+)
+_QUERY_ROWS = counter(
+    "trovabenzina_db_query_rows_total",
+    "Rows returned or affected by database statements, by repository function",
+    ("tag",),
+)
+
+
+class _TagStats:
+    __slots__ = ("seconds", "rows", "max")
+
+    def __init__(self, tag: str) -> None:
+        self.seconds = _QUERY_SECONDS.labels(tag)
+        self.rows = _QUERY_ROWS.labels(tag)
+        self.max = 0.0
+
+    def observe(self, elapsed: float, rows: int) -> None:
+        self.seconds.observe(elapsed)
+        self.rows.inc(rows)
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class QueryTotals:
+    """Queries run within one `query_scope()`.
+
+    Attributes:
+        queries: Statements executed.
+        seconds: Total time spent in them.
+        rows: Rows returned or affected.
+        by_tag: Statement count per repository function.
+    """
+
+    __slots__ = ("queries", "seconds", "rows", "by_tag")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.by_tag: Dict[str, int] = {}
+
+
+class _ScopeStats:
+    __slots__ = ("scopes", "queries", "seconds", "max_queries")
+
+    def __init__(self) -> None:
+        self.scopes = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self.max_queries = 0
+
+
+_tags: Dict[str, _TagStats] = {}
+_scopes: Dict[str, _ScopeStats] = {}
+
+
+def tagged(fn: F) -> F:
+    """Attribute the statements run by the decorated coroutine function to its name.
+
+    When tagged functions call each other, the outermost (the one the caller
+    used) keeps the tag.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _tag.get() != _UNTAGGED:
+            return await fn(*args, **kwargs)
+        token = _tag.set(name)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _tag.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _redact(parameters: Any) -> Any:
+    """Replace parameter values by their type names, keeping the structure."""
+    if isinstance(parameters, dict):
+        return {k: f"<{type(v).__name__}>" for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return [_redact(parameters[0]), f"... {len(parameters)} sets"]
+        return [f"<{type(v).__name__}>" for v in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                           context: Any, executemany: bool) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                          context: Any, executemany: bool) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    rows = max(cursor.rowcount, 0)
+    tag = _tag.get()
+
+    stats = _tags.get(tag)
+    if stats is None:
+        stats = _tags[tag] = _TagStats(tag)
+    stats.observe(elapsed, rows)
+
+    totals = _scope.get()
+    if totals is not None:
+        totals.queries += 1
+        totals.seconds += elapsed
+        totals.rows += rows
+        totals.by_tag[tag] = totals.by_tag.get(tag, 0) + 1
+
+    if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        log.warning(
+            "Slow query in %s: %.1f ms, %d rows\n%s\nparams=%s",
+            tag,
+            elapsed * 1000,
+            rows,
+            statement[:_STATEMENT_LOG_CHARS],
+            _redact(parameters),
+        )
+
+
+def _handle_error(exception_context: Any) -> None:
+    # A failed statement never reaches after_cursor_execute: drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """Register the statement timing hooks on an engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def query_scope(kind: str) -> Iterator[QueryTotals]:
+    """Count the queries run inside the block (and in tasks it spawns) as one unit.
+
+    Args:
+        kind: Label the totals are aggregated under (e.g. "/search", "callback").
+
+    Yields:
+        QueryTotals: Live totals of the scope.
+    """
+    totals = QueryTotals()
+    token = _scope.set(totals)
+    try:
+        yield totals
+    finally:
+        _scope.reset(token)
+        agg = _scopes.get(kind)
+        if agg is None:
+            agg = _scopes[kind] = _ScopeStats()
+        agg.scopes += 1
+        agg.queries += totals.queries
+        agg.seconds += totals.seconds
+        agg.max_queries = max(agg.max_queries, totals.queries)
+        if totals.queries:
+            log.debug(
+                "%s: %d queries, %.1f ms, %d rows %s",
+                kind, totals.queries, totals.seconds * 1000, totals.rows, totals.by_tag,
+            )
+
+
+def query_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the latency histogram and row count of every tag.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per tag: `count`, `seconds` (sum), `max`,
+        `rows` and cumulative `buckets` as `(upper_bound, count)` pairs, the
+        last bound being `inf`.
+    """
+    return {
+        tag: {
+            "count": stats.seconds.count,
+            "seconds": stats.seconds.sum,
+            "max": stats.max,
+            "rows": stats.rows.value,
+            "buckets": stats.seconds.cumulative(),
+        }
+        for tag, stats in _tags.items()
+    }
+
+
+def scope_stats() -> Dict[str, Dict[str, Any]]:
+    """Return query totals per unit of work, by kind.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per kind: `scopes` seen, total `queries`
+        and `seconds`, `avg_queries` per scope and `max_queries`.
+    """
+    return {
+        kind: {
+            "scopes": agg.scopes,
+            "queries": agg.queries,
+            "seconds": agg.seconds,
+            "avg_queries": agg.queries / agg.scopes if agg.scopes else 0.0,
+            "max_queries": agg.max_queries,
+        }
+        for kind, agg in _scopes.items()
+    }
@@ -0,0 +1,37 @@
+"""PostgreSQL advisory locks for work that must run on one replica at a time."""
+
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+
+from .session import engine
+
+__all__ = ["advisory_lock"]
+
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """Try to take a session-level advisory lock named `name`, without waiting.
+
+    The lock is held on a dedicated pooled connection for the duration of the
+    block (no transaction stays open) and released on exit; if the process
+    dies, Postgres releases it together with the connection.
+
+    Args:
+        name: Lock name, hashed to the 32-bit key Postgres expects.
+
+    Yields:
+        bool: True if this process holds the lock, False if another one does.
+    """
+    key = zlib.crc32(name.encode("utf-8"))
+    async with engine.connect() as conn:
+        acquired = bool((await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})).scalar())
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                await conn.commit()
@@ -3,15 +3,24 @@
 Exposes the declarative `Base`, common mixins, entities, and read-only views.
 Usage:
     from trovabenzina.db.models import User, Fuel, Search
+
+Relationships are never loaded implicitly: collections use `lazy="raise"` and
+many-to-ones `lazy="raise_on_sql"` (served only from the identity map). A
+query that needs related objects asks for them explicitly, e.g.
+    select(User).options(joinedload(User.fuel))
+    select(Fuel).options(selectinload(Fuel.users))
 """
 
 from .base import Base
 from .fuel import Fuel
 from .geocache import GeoCache
+from .geocoding_quota import GeocodingQuota
 from .language import Language
 from .mixins import TimestampMixin, CodeNameMixin
 from .search import Search
+from .station import Station
 from .user import User
+from .user_fuel_stats import UserFuelStats
 from .view_geocoding_month_calls import VGeocodingMonthCalls
 from .view_users_searches_stats import VUsersSearchesStats
 
@@ -24,6 +33,9 @@ __all__ = [
     "User",
     "Search",
     "GeoCache",
+    "GeocodingQuota",
+    "Station",
+    "UserFuelStats",
     "VGeocodingMonthCalls",
     "VUsersSearchesStats",
 ]
@@ -31,8 +31,8 @@ class Fuel(CodeNameMixin, TimestampMixin, Base):
     avg_consumption_per_100km: Mapped[Decimal] = mapped_column(Numeric(6, 3), nullable=False)
 
     # Relationships
-    users: Mapped[List["User"]] = relationship(back_populates="fuel", lazy="selectin")
-    searches: Mapped[List["Search"]] = relationship(back_populates="fuel", lazy="selectin")
+    users: Mapped[List["User"]] = relationship(back_populates="fuel", lazy="raise")
+    searches: Mapped[List["Search"]] = relationship(back_populates="fuel", lazy="raise")
 
     def __repr__(self) -> str:
         return f"Fuel(id={self.id}, code={getattr(self, 'code', None)}, name={getattr(self, 'name', None)}, uom={self.uom})"
@@ -1,6 +1,6 @@
 """Cache of geocoding results."""
 
-from sqlalchemy import String, CheckConstraint
+from sqlalchemy import SmallInteger, String, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -16,10 +16,19 @@ class GeoCache(TimestampMixin, Base):
     __table_args__ = (
         CheckConstraint("lat >= -90 AND lat <= 90", name="ck_geocache_lat_range"),
         CheckConstraint("lng >= -180 AND lng <= 180", name="ck_geocache_lng_range"),
+        Index("uq_geocache_address_key", "address_key", unique=True),
+        Index("ix_geocache_key_version", "key_version"),
+        # Retention and soft-delete purges (see core.scheduler)
+        Index("ix_geocache_ins_ts", "ins_ts"),
+        Index("ix_geocache_del_ts", "del_ts", postgresql_where=text("del_ts IS NOT NULL")),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     address: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Normalized lookup key (see `utils.normalize_address_key`)
+    address_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    # `utils.ADDRESS_KEY_VERSION` the key was computed with (0: unknown / SQL backfill)
+    key_version: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default=text("0"))
     lat: Mapped[float] = mapped_column(nullable=False)
     lng: Mapped[float] = mapped_column(nullable=False)
 
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+"""Daily counters of Google Geocoding API calls."""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, CheckConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+__all__ = ["GeocodingQuota"]
+
+
+class GeocodingQuota(Base):
+    """Number of geocoding requests sent to Google on a given day."""
+
+    __tablename__ = "geocoding_quota"
+    __table_args__ = (
+        CheckConstraint("calls >= 0", name="ck_geocoding_quota_calls_nonneg"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    upd_ts: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"GeocodingQuota(day={self.day}, calls={self.calls})"
@@ -23,7 +23,7 @@ class Language(CodeNameMixin, TimestampMixin, Base):
     id: Mapped[int] = mapped_column(primary_key=True)
 
     # Relationships
-    users: Mapped[List["User"]] = relationship(back_populates="language", lazy="selectin")
+    users: Mapped[List["User"]] = relationship(back_populates="language", lazy="raise")
 
     def __repr__(self) -> str:
         return f"Language(id={self.id}, code={getattr(self, 'code', None)}, name={getattr(self, 'name', None)})"
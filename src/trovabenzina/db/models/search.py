@@ -5,7 +5,7 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Numeric, ForeignKey, Integer, CheckConstraint
+from sqlalchemy import Numeric, ForeignKey, Integer, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -31,6 +31,8 @@ class Search(TimestampMixin, Base):
         ),
         CheckConstraint("(price_avg IS NULL OR price_avg >= 0)", name="ck_search_price_avg_nonneg"),
         CheckConstraint("(price_min IS NULL OR price_min >= 0)", name="ck_search_price_min_nonneg"),
+        # Soft-delete purge (see core.scheduler)
+        Index("ix_searches_del_ts", "del_ts", postgresql_where=text("del_ts IS NOT NULL")),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -43,8 +45,8 @@ class Search(TimestampMixin, Base):
     price_min: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4), nullable=True)
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="searches", lazy="joined")
-    fuel: Mapped["Fuel"] = relationship(back_populates="searches", lazy="joined")
+    user: Mapped["User"] = relationship(back_populates="searches", lazy="raise_on_sql")
+    fuel: Mapped["Fuel"] = relationship(back_populates="searches", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return (
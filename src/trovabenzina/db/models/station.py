@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+"""Fuel station registry entity (MISE service areas)."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .mixins import TimestampMixin
+
+__all__ = ["Station"]
+
+
+class Station(TimestampMixin, Base):
+    """Locally cached details of a MISE service area, keyed by the MISE id."""
+
+    __tablename__ = "stations"
+    __table_args__ = (
+        CheckConstraint("lat IS NULL OR (lat >= -90 AND lat <= 90)", name="ck_station_lat_range"),
+        CheckConstraint("lng IS NULL OR (lng >= -180 AND lng <= 180)", name="ck_station_lng_range"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    brand: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    address: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    lat: Mapped[Optional[float]] = mapped_column(nullable=True)
+    lng: Mapped[Optional[float]] = mapped_column(nullable=True)
+    last_seen_ts: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"Station(id={self.id}, brand={self.brand}, name={self.name}, address={self.address})"
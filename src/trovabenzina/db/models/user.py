@@ -31,9 +31,9 @@ class User(TimestampMixin, Base):
     language_id: Mapped[Optional[int]] = mapped_column(ForeignKey("dom_languages.id"), nullable=True)
 
     # Relationships
-    fuel: Mapped["Fuel"] = relationship(back_populates="users", lazy="joined")
-    language: Mapped[Optional["Language"]] = relationship(back_populates="users", lazy="joined")
-    searches: Mapped[List["Search"]] = relationship(back_populates="user", lazy="selectin")
+    fuel: Mapped["Fuel"] = relationship(back_populates="users", lazy="raise_on_sql")
+    language: Mapped[Optional["Language"]] = relationship(back_populates="users", lazy="raise_on_sql")
+    searches: Mapped[List["Search"]] = relationship(back_populates="user", lazy="raise")
 
     def __repr__(self) -> str:
         uname = self.tg_username
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+"""Per-user, per-fuel running totals of search analytics."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+__all__ = ["UserFuelStats"]
+
+
+class UserFuelStats(Base):
+    """Rollup of a user's active searches for one fuel.
+
+    Only searches that `v_users_searches_stats` would count are accumulated
+    (`num_stations > 0` and both prices set). Rows are bumped on every saved
+    batch of searches and deleted on reset, so reading statistics costs one
+    row per fuel regardless of history length.
+    """
+
+    __tablename__ = "user_fuel_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    fuel_id: Mapped[int] = mapped_column(ForeignKey("dom_fuels.id"), primary_key=True)
+
+    num_searches: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    num_stations: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    sum_price_avg: Mapped[Decimal] = mapped_column(Numeric(16, 4), nullable=False, default=0)
+    sum_price_min: Mapped[Decimal] = mapped_column(Numeric(16, 4), nullable=False, default=0)
+
+    upd_ts: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"UserFuelStats(user_id={self.user_id}, fuel_id={self.fuel_id}, "
+            f"num_searches={self.num_searches}, num_stations={self.num_stations})"
+        )
@@ -0,0 +1,110 @@
+"""Instrumented connection pool for the async engine.
+
+`InstrumentedPool` is SQLAlchemy's `AsyncAdaptedQueuePool` with timing around
+checkouts: how long callers waited for a connection (including opening one
+under overflow) and how often the pool had to overflow or timed out. Pool
+events count connections opened and invalidated (e.g. after a disconnect).
+`pool_stats()` adds the live size/in-use counts so the pool can be sized
+against real concurrency.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+__all__ = ["InstrumentedPool", "instrument_engine", "pool_stats"]
+
+# Recent checkout waits kept for percentiles
+_WAIT_WINDOW = 1000
+
+
+class _PoolMetrics:
+    __slots__ = ("checkouts", "timeouts", "overflow_checkouts", "connects", "invalidations", "max_wait", "waits")
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.max_wait = 0.0
+        self.waits: Deque[float] = deque(maxlen=_WAIT_WINDOW)
+
+    def wait(self, q: float) -> Optional[float]:
+        if not self.waits:
+            return None
+        ordered = sorted(self.waits)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# Module-level so counters survive `Pool.recreate()` (e.g. after a disconnect)
+_metrics = _PoolMetrics()
+_pool: Optional["InstrumentedPool"] = None
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout wait times, overflow and timeouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        global _pool
+        super().__init__(*args, **kwargs)
+        _pool = self
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            _metrics.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - started
+        _metrics.checkouts += 1
+        _metrics.waits.append(elapsed)
+        _metrics.max_wait = max(_metrics.max_wait, elapsed)
+        if self.overflow() > 0:
+            _metrics.overflow_checkouts += 1
+        return record
+
+
+def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    _metrics.connects += 1
+
+
+def _on_invalidate(dbapi_connection: Any, connection_record: Any, exception: Optional[BaseException]) -> None:
+    _metrics.invalidations += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Register the pool event hooks (connect, invalidate) on an engine."""
+    event.listen(engine.sync_engine, "connect", _on_connect)
+    event.listen(engine.sync_engine, "invalidate", _on_invalidate)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Return connection pool usage and checkout latency.
+
+    Returns:
+        Dict[str, Any]: Live `size`, `checked_out` (in use), `idle` and
+        `overflow` counts, plus `checkouts`, `overflow_checkouts`, `timeouts`,
+        `connects`, `invalidations` and checkout wait `wait_p50`/`wait_p95`/
+        `wait_max` in seconds.
+    """
+    pool = _pool
+    return {
+        "size": pool.size() if pool is not None else 0,
+        "checked_out": pool.checkedout() if pool is not None else 0,
+        "idle": pool.checkedin() if pool is not None else 0,
+        "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+        "checkouts": _metrics.checkouts,
+        "overflow_checkouts": _metrics.overflow_checkouts,
+        "timeouts": _metrics.timeouts,
+        "connects": _metrics.connects,
+        "invalidations": _metrics.invalidations,
+        "wait_p50": _metrics.wait(0.5),
+        "wait_p95": _metrics.wait(0.95),
+        "wait_max": _metrics.max_wait,
+    }
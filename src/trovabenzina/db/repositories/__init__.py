@@ -10,13 +10,26 @@ from .fuel_repository import (
     get_uom_by_code,
     get_fuel_name_by_code,
 )
-from .geocache_repository import get_geocache, save_geocache, delete_old_geocache
+from .geocache_repository import (
+    get_geocache,
+    save_geocache,
+    delete_old_geocache,
+    rekey_geocache,
+    enable_geocache_fuzzy,
+    geocache_stats,
+)
+from .maintenance_repository import delete_in_batches, purge_soft_deleted
 from .language_repository import get_language_map, get_language_id_by_code
+from .quota_repository import record_geocoding_calls, sum_geocoding_calls
+from .profile_repository import UserProfile, get_user_profile, invalidate_user_profile
 from .search_repository import (
     save_search,
+    save_searches,
     soft_delete_user_searches,
     soft_delete_user_searches_by_tg_id,
+    reconcile_user_fuel_stats,
 )
+from .station_repository import get_station, save_station
 from .stats_repository import count_geocoding_month_calls, get_user_stats
 from .user_repository import (
     upsert_user,
@@ -34,6 +47,9 @@ __all__ = [
     "get_fuel_name_by_code",
     "get_language_map",
     "get_language_id_by_code",
+    "UserProfile",
+    "get_user_profile",
+    "invalidate_user_profile",
     "upsert_user",
     "get_user",
     "get_user_language_code_by_tg_id",
@@ -41,11 +57,22 @@ __all__ = [
     "get_user_id_by_tg_id",
     "get_search_users",
     "save_search",
+    "save_searches",
     "soft_delete_user_searches",
     "soft_delete_user_searches_by_tg_id",
+    "reconcile_user_fuel_stats",
     "get_geocache",
     "save_geocache",
     "delete_old_geocache",
+    "rekey_geocache",
+    "enable_geocache_fuzzy",
+    "geocache_stats",
+    "delete_in_batches",
+    "purge_soft_deleted",
+    "record_geocoding_calls",
+    "sum_geocoding_calls",
+    "get_station",
+    "save_station",
     "count_geocoding_month_calls",
     "get_user_stats",
 ]
@@ -6,10 +6,12 @@ from typing import Dict, Iterable, Optional
 
 from sqlalchemy import select
 
+from ..instrumentation import tagged
 from ..models import Fuel
 from ..session import AsyncSession
 
 
+@tagged
 async def get_fuel_map() -> Dict[str, str]:
     """Return a mapping of fuel names to fuel codes.
 
@@ -24,6 +26,7 @@ async def get_fuel_map() -> Dict[str, str]:
     return {f.name: f.code for f in fuels}
 
 
+@tagged
 async def get_fuels_by_ids_map(ids: Iterable[int]) -> Dict[int, Fuel]:
     """Return a dict {fuel_id: Fuel} for the given IDs.
 
@@ -42,6 +45,7 @@ async def get_fuels_by_ids_map(ids: Iterable[int]) -> Dict[int, Fuel]:
     return {f.id: f for f in fuels}
 
 
+@tagged
 async def get_fuel_by_code(code: str) -> Optional[Fuel]:
     """Return Fuel by its `code`, or None if not found or soft-deleted."""
     code = (code or "").strip()
@@ -54,6 +58,7 @@ async def get_fuel_by_code(code: str) -> Optional[Fuel]:
         return row.scalars().first()
 
 
+@tagged
 async def get_fuel_name_by_code(code: str) -> Optional[str]:
     """Return the fuel name for a given `fuel_code`, or None if not found/soft-deleted."""
     code = (code or "").strip()
@@ -66,6 +71,7 @@ async def get_fuel_name_by_code(code: str) -> Optional[str]:
         return row.scalar_one_or_none()
 
 
+@tagged
 async def get_fuels_by_codes_map(codes: Iterable[str]) -> Dict[str, Fuel]:
     """Return a dict {fuel_code: Fuel} for the given codes.
 
@@ -87,6 +93,7 @@ async def get_fuels_by_codes_map(codes: Iterable[str]) -> Dict[str, Fuel]:
     return {f.code: f for f in fuels}
 
 
+@tagged
 async def get_uom_by_code(code: str) -> Optional[str]:
     """Return the UOM (e.g., 'liter' or 'kilo') for a given `fuel_code`."""
     code = (code or "").strip()
@@ -99,6 +106,7 @@ async def get_uom_by_code(code: str) -> Optional[str]:
         return row.scalar_one_or_none()
 
 
+@tagged
 async def get_uom_map_by_codes(codes: Iterable[str]) -> Dict[str, str]:
     """Return a dict {fuel_code: uom} for the given codes.
 
@@ -1,63 +1,270 @@
-"""Geocache repository: caching results of geocoding lookups."""
-from typing import Optional
+"""Geocache repository: caching results of geocoding lookups.
 
-from sqlalchemy import delete, func, select, text
+Rows are keyed by the normalized address (`GeoCache.address_key`), which has a
+unique index: reads are index lookups and writes are a single upsert. When
+`GEOCACHE_FUZZY_ENABLED` is set, an exact miss falls back to a pg_trgm
+similarity match whose house numbers and locality must agree with the query.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
 
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession as SASession
+
+from .maintenance_repository import delete_in_batches
+from ..instrumentation import tagged
+from ..locks import advisory_lock
 from ..models import GeoCache
 from ..session import AsyncSession
+from ...config import GEOCACHE_FUZZY_ENABLED, GEOCACHE_FUZZY_THRESHOLD
+from ...utils.address import ADDRESS_KEY_VERSION, address_locality, address_numbers, normalize_address_key
+
+log = logging.getLogger(__name__)
+
+_FUZZY_CANDIDATES = 5
+_KEY_LENGTH = GeoCache.__table__.c.address_key.type.length
+
+_fuzzy_enabled = GEOCACHE_FUZZY_ENABLED
+_stats = {"lookups": 0, "hits": 0, "fuzzy_hits": 0}
+
+
+def _address_key(address: str) -> str:
+    """Return the stored key of an address: normalized and cut to the column width."""
+    return normalize_address_key(address)[:_KEY_LENGTH]
 
 
+def _fuzzy_compatible(key: str, candidate: str) -> bool:
+    """Tell whether a similar key may stand for the same address as `key`.
+
+    Numbers (house number, postcode) must agree, and so must the locality
+    after them: "via garibaldi 10 roma" is very similar to "via garibaldi 10
+    bari". Without a number to find the locality, every word of `key` must
+    appear in the candidate, so only extra words and reordering are tolerated.
+    """
+    if address_numbers(candidate) != address_numbers(key):
+        return False
+    locality = address_locality(key)
+    if locality is not None:
+        return address_locality(candidate) == locality
+    return set(key.split()) <= set(candidate.split())
+
+
+async def _get_geocache_fuzzy(session: SASession, key: str) -> Optional[GeoCache]:
+    """Return the most similar active row that `_fuzzy_compatible` accepts for `key`."""
+    similarity = func.similarity(GeoCache.address_key, key)
+    result = await session.execute(
+        select(GeoCache)
+        .where(
+            GeoCache.address_key.op("%")(key),
+            GeoCache.del_ts.is_(None),
+            similarity >= GEOCACHE_FUZZY_THRESHOLD,
+        )
+        .order_by(similarity.desc())
+        .limit(_FUZZY_CANDIDATES)
+    )
+    for row in result.scalars():
+        if _fuzzy_compatible(key, row.address_key):
+            return row
+    return None
+
+
+@tagged
 async def get_geocache(address: str) -> Optional[GeoCache]:
     """Fetch a geocache entry by address, excluding soft-deleted rows.
 
     Args:
-        address: Address string as stored in the cache.
+        address: Address string; normalized before the lookup.
 
     Returns:
         Optional[GeoCache]: The matching row or `None`.
     """
+    key = _address_key(address)
+    _stats["lookups"] += 1
     async with AsyncSession() as session:
         result = await session.execute(
             select(GeoCache).where(
-                GeoCache.address == address,
+                GeoCache.address_key == key,
                 GeoCache.del_ts.is_(None),
             )
         )
-        return result.scalar_one_or_none()
+        record = result.scalar_one_or_none()
+        if record is not None:
+            _stats["hits"] += 1
+            return record
+
+        if _fuzzy_enabled and key:
+            record = await _get_geocache_fuzzy(session, key)
+            if record is not None:
+                _stats["fuzzy_hits"] += 1
+                log.debug("Geocache fuzzy hit: %r -> %r", key, record.address_key)
+        return record
 
 
+@tagged
 async def save_geocache(address: str, lat: float, lng: float) -> None:
-    """Insert or update a cache entry for an address.
+    """Insert or update a cache entry for an address with one upsert.
+
+    A soft-deleted row with the same key is revived.
 
     Args:
-        address: Address string key.
+        address: Address string; its normalized form is the key.
         lat: Latitude.
         lng: Longitude.
     """
+    stmt = pg_insert(GeoCache).values(
+        address=address[:255],
+        address_key=_address_key(address),
+        key_version=ADDRESS_KEY_VERSION,
+        lat=lat,
+        lng=lng,
+    )
     async with AsyncSession() as session:
-        existing = (await session.execute(
-            select(GeoCache).where(GeoCache.address == address)
-        )).scalar_one_or_none()
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[GeoCache.address_key],
+                set_={
+                    "address": stmt.excluded.address,
+                    "key_version": stmt.excluded.key_version,
+                    "lat": stmt.excluded.lat,
+                    "lng": stmt.excluded.lng,
+                    "upd_ts": func.now(),
+                    "del_ts": None,
+                },
+            )
+        )
+        await session.commit()
 
-        if existing:
-            existing.lat = lat
-            existing.lng = lng
-        else:
-            session.add(GeoCache(address=address, lat=lat, lng=lng))
 
-        await session.commit()
+@tagged
+async def rekey_geocache() -> int:
+    """Recompute `address_key` once for rows keyed by an older normalization.
+
+    Does nothing (one index probe) unless some row has a `key_version` below
+    `ADDRESS_KEY_VERSION`: rows backfilled by the SQL migration (005) or
+    written before the normalization last changed. Then every row is re-keyed
+    against the new normalization, since stale keys may collide with current
+    ones, and stamped with the current version. Rows whose addresses now share
+    a key are merged, keeping the active, most recently updated one. Keys are
+    first moved to unique placeholders so the unique index is never violated
+    mid-way. Run at startup after `init_db()`; a replica starting concurrently
+    skips it while another holds the lock.
+
+    Returns:
+        int: Number of rows re-keyed or removed.
+    """
+    async with advisory_lock("trovabenzina:geocache_rekey") as acquired:
+        if not acquired:
+            log.info("Geocache re-key running on another replica, skipped")
+            return 0
+        async with AsyncSession() as session:
+            stale = (await session.execute(
+                select(GeoCache.id).where(GeoCache.key_version < ADDRESS_KEY_VERSION).limit(1)
+            )).first()
+            if stale is None:
+                return 0
+
+            rows = (await session.execute(
+                select(
+                    GeoCache.id,
+                    GeoCache.address,
+                    GeoCache.address_key,
+                    GeoCache.del_ts.is_(None),
+                    func.coalesce(GeoCache.upd_ts, GeoCache.ins_ts),
+                )
+            )).all()
+
+            best: Dict[str, Any] = {}
+            for row_id, address, old_key, active, ts in rows:
+                key = _address_key(address)
+                rank = (active, ts, row_id)
+                current = best.get(key)
+                if current is None or rank > current[0]:
+                    best[key] = (rank, row_id, old_key)
+
+            keep = {row_id: key for key, (_, row_id, _) in best.items()}
+            drop = [row[0] for row in rows if row[0] not in keep]
+            moved = [
+                {"id": row_id, "address_key": key}
+                for key, (_, row_id, old_key) in best.items()
+                if key != old_key
+            ]
+
+            if drop:
+                await session.execute(delete(GeoCache).where(GeoCache.id.in_(drop)))
+            if moved:
+                # Keys never mix '~' with digits, so placeholders cannot collide
+                await session.execute(
+                    update(GeoCache), [{"id": m["id"], "address_key": f"~{m['id']}"} for m in moved]
+                )
+                await session.execute(update(GeoCache), moved)
+            await session.execute(
+                update(GeoCache)
+                .where(GeoCache.key_version < ADDRESS_KEY_VERSION)
+                # Re-keying is not an update of the cached result: keep upd_ts
+                .values(key_version=ADDRESS_KEY_VERSION, upd_ts=GeoCache.upd_ts)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
 
+    log.info(
+        "Geocache re-keyed to version %d: %d moved, %d merged away",
+        ADDRESS_KEY_VERSION, len(moved), len(drop),
+    )
+    return len(moved) + len(drop)
+
+
+@tagged
+async def enable_geocache_fuzzy() -> bool:
+    """Ensure pg_trgm and the trigram index exist when fuzzy matching is enabled.
+
+    Fuzzy matching is switched off (with a warning) if the extension cannot
+    be installed, e.g. for lack of privileges.
+
+    Returns:
+        bool: Whether fuzzy matching is active.
+    """
+    global _fuzzy_enabled
+    if not _fuzzy_enabled:
+        return False
+    try:
+        async with AsyncSession() as session:
+            await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_geocache_address_key_trgm "
+                "ON geocache USING gin (address_key gin_trgm_ops)"
+            ))
+            await session.commit()
+    except Exception as exc:
+        log.warning("Geocache fuzzy matching disabled, pg_trgm unavailable: %s", exc)
+        _fuzzy_enabled = False
+    return _fuzzy_enabled
 
-async def delete_old_geocache(days: int = 90) -> None:
+
+def geocache_stats() -> Dict[str, Any]:
+    """Return geocache lookup counters and hit rates since startup."""
+    lookups = _stats["lookups"]
+    hits = _stats["hits"] + _stats["fuzzy_hits"]
+    return {
+        **_stats,
+        "misses": lookups - hits,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "fuzzy_enabled": _fuzzy_enabled,
+    }
+
+
+@tagged
+async def delete_old_geocache(days: int = 90, batch_size: int = 1000) -> int:
     """Hard-delete cache rows older than the given number of days.
 
+    Rows are deleted in batches along the `ins_ts` index, one transaction each.
+
     Args:
         days: Age threshold in days (default 90).
+        batch_size: Maximum rows deleted per transaction.
+
+    Returns:
+        int: Number of rows deleted.
     """
-    async with AsyncSession() as session:
-        await session.execute(
-            delete(GeoCache).where(
-                GeoCache.ins_ts < func.now() - text(f"INTERVAL '{days} days'")
-            )
-        )
-        await session.commit()
+    return await delete_in_batches(GeoCache, GeoCache.ins_ts < func.now() - timedelta(days=days), batch_size)
@@ -4,10 +4,12 @@ from typing import Dict, Optional
 
 from sqlalchemy import select
 
+from ..instrumentation import tagged
 from ..models import Language
 from ..session import AsyncSession
 
 
+@tagged
 async def get_language_map() -> Dict[str, str]:
     """Return a mapping of language names to language codes.
 
@@ -22,6 +24,7 @@ async def get_language_map() -> Dict[str, str]:
     return {l.name: l.code for l in languages}
 
 
+@tagged
 async def get_language_id_by_code(code: str) -> Optional[int]:
     """Resolve a language internal ID from its code.
 
@@ -0,0 +1,64 @@
+"""Maintenance repository: batched hard deletes for retention and purges.
+
+Deletes run in transactions of at most `batch_size` rows, each committed on
+its own, so locks are short, WAL is written in small chunks and autovacuum can
+reclaim space between batches instead of after one huge transaction.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict
+
+from sqlalchemy import ColumnElement, delete, func, select
+
+from ..instrumentation import tagged
+from ..models import GeoCache, Search
+from ..session import AsyncSession
+
+
+@tagged
+async def delete_in_batches(model: Any, condition: ColumnElement[bool], batch_size: int) -> int:
+    """Hard-delete the rows of `model` matching `condition`, `batch_size` at a time.
+
+    Args:
+        model: Mapped class with an `id` primary key.
+        condition: Filter selecting the rows to delete (should be index-backed).
+        batch_size: Maximum rows deleted per transaction.
+
+    Returns:
+        int: Total number of rows deleted.
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size).scalar_subquery()
+        async with AsyncSession() as session:
+            res = await session.execute(
+                delete(model)
+                .where(model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        deleted = res.rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            return total
+        # Let other tasks use the loop (and the pool) between batches
+        await asyncio.sleep(0)
+
+
+@tagged
+async def purge_soft_deleted(days: int, batch_size: int) -> Dict[str, int]:
+    """Hard-delete searches and geocache rows soft-deleted more than `days` ago.
+
+    Args:
+        days: Grace period in days after `del_ts`.
+        batch_size: Maximum rows deleted per transaction.
+
+    Returns:
+        Dict[str, int]: Rows deleted per table.
+    """
+    cutoff = func.now() - timedelta(days=days)
+    return {
+        "searches": await delete_in_batches(Search, Search.del_ts < cutoff, batch_size),
+        "geocache": await delete_in_batches(GeoCache, GeoCache.del_ts < cutoff, batch_size),
+    }
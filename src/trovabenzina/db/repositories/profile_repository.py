@@ -0,0 +1,82 @@
+"""Profile repository: cached per-user view joining user, fuel and language.
+
+A single lookup resolves everything a handler needs about a Telegram user.
+Entries live in an in-process LRU with a short TTL and are invalidated on
+every write through `upsert_user`.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+
+from ..instrumentation import tagged
+from ..models import Fuel, Language, User
+from ..session import AsyncSession
+from ...config import DEFAULT_LANGUAGE, USER_PROFILE_CACHE_SIZE, USER_PROFILE_CACHE_TTL
+from ...utils.cache import LRUCache
+
+
+class UserProfile(NamedTuple):
+    """Resolved preferences of a user.
+
+    Attributes:
+        user_id: Internal `User.id`.
+        fuel_id: Internal `Fuel.id` of the preferred fuel.
+        fuel_code: Public `Fuel.code`.
+        uom: Unit of measure of the fuel (e.g., 'liter').
+        fuel_name: Fuel name (translation key).
+        lang: Language code, falling back to `DEFAULT_LANGUAGE` if unset.
+    """
+
+    user_id: int
+    fuel_id: int
+    fuel_code: str
+    uom: str
+    fuel_name: str
+    lang: str
+
+
+_cache: LRUCache[int, UserProfile] = LRUCache(
+    maxsize=USER_PROFILE_CACHE_SIZE,
+    ttl=USER_PROFILE_CACHE_TTL,
+)
+
+
+@tagged
+async def get_user_profile(tg_id: int) -> Optional[UserProfile]:
+    """Return the cached profile for a Telegram user, loading it in one query.
+
+    Args:
+        tg_id: Telegram user ID.
+
+    Returns:
+        Optional[UserProfile]: The profile, or `None` if the user does not exist.
+    """
+    profile = _cache.get(tg_id)
+    if profile is not None:
+        return profile
+
+    async with AsyncSession() as session:
+        result = await session.execute(
+            select(User.id, Fuel.id, Fuel.code, Fuel.uom, Fuel.name, Language.code)
+            .select_from(User)
+            .join(Fuel, User.fuel_id == Fuel.id)
+            .outerjoin(Language, User.language_id == Language.id)
+            .where(User.tg_id == tg_id)
+        )
+        row = result.first()
+
+    if row is None:
+        return None
+
+    user_id, fuel_id, fuel_code, uom, fuel_name, lang_code = row
+    profile = UserProfile(user_id, fuel_id, fuel_code, uom, fuel_name, lang_code or DEFAULT_LANGUAGE)
+    _cache.set(tg_id, profile)
+    return profile
+
+
+def invalidate_user_profile(tg_id: int) -> None:
+    """Drop the cached profile of a user (call after any write to the user row)."""
+    _cache.pop(tg_id)
@@ -0,0 +1,49 @@
+"""Quota repository: per-day counters of Google Geocoding calls."""
+
+from __future__ import annotations
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..instrumentation import tagged
+from ..models import GeocodingQuota
+from ..session import AsyncSession
+
+
+@tagged
+async def record_geocoding_calls(n: int = 1) -> None:
+    """Add `n` calls to today's counter row (created on first use).
+
+    Args:
+        n: Number of Google requests to record.
+    """
+    stmt = pg_insert(GeocodingQuota).values(day=func.current_date(), calls=n)
+    async with AsyncSession() as session:
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[GeocodingQuota.day],
+                set_={"calls": GeocodingQuota.calls + stmt.excluded.calls, "upd_ts": func.now()},
+            )
+        )
+        await session.commit()
+
+
+@tagged
+async def sum_geocoding_calls(days: int = 30) -> int:
+    """Return the number of geocoding calls in the last `days` days, today included.
+
+    Reads at most `days` rows through the primary key.
+
+    Args:
+        days: Window length in days.
+
+    Returns:
+        int: Total calls in the window.
+    """
+    async with AsyncSession() as session:
+        result = await session.execute(
+            select(func.coalesce(func.sum(GeocodingQuota.calls), 0)).where(
+                GeocodingQuota.day > func.current_date() - text(f"{int(days)}")
+            )
+        )
+        return int(result.scalar_one())
@@ -1,59 +1,207 @@
-"""Search repository: writes and analytics helpers for searches."""
+"""Search repository: writes and analytics helpers for searches.
+
+Every write keeps the `user_fuel_stats` rollup in step with `searches` in the
+same transaction: inserts add their totals, resets delete the user's rows.
+`reconcile_user_fuel_stats()` recomputes it from `searches` to repair drift.
+"""
 
 from __future__ import annotations
 
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, exists, func, insert, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.ext.asyncio import AsyncSession as SASession
 
-from ..models import Search, User, Fuel
+from .profile_repository import get_user_profile
+from ..instrumentation import tagged
+from ..models import Search, UserFuelStats
 from ..session import AsyncSession
 
 
+def _rollup_deltas(rows: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate search rows into per-(user, fuel) increments for the rollup.
+
+    Rows the statistics would ignore (no stations or missing prices) are skipped.
+
+    Args:
+        rows: Search column mappings.
+
+    Returns:
+        List[Dict[str, Any]]: One `UserFuelStats` values dict per (user, fuel).
+    """
+    acc: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for r in rows:
+        if not r.get("num_stations") or r.get("price_avg") is None or r.get("price_min") is None:
+            continue
+        key = (r["user_id"], r["fuel_id"])
+        d = acc.get(key)
+        if d is None:
+            d = acc[key] = {
+                "user_id": key[0],
+                "fuel_id": key[1],
+                "num_searches": 0,
+                "num_stations": 0,
+                "sum_price_avg": Decimal(0),
+                "sum_price_min": Decimal(0),
+            }
+        d["num_searches"] += 1
+        d["num_stations"] += r["num_stations"]
+        d["sum_price_avg"] += Decimal(str(r["price_avg"]))
+        d["sum_price_min"] += Decimal(str(r["price_min"]))
+    return list(acc.values())
+
+
+async def _bump_user_fuel_stats(session: SASession, rows: Sequence[Mapping[str, Any]]) -> None:
+    """Add the totals of `rows` to `user_fuel_stats` with one upsert (no commit)."""
+    deltas = _rollup_deltas(rows)
+    if not deltas:
+        return
+    stmt = pg_insert(UserFuelStats).values(deltas)
+    excluded = stmt.excluded
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserFuelStats.user_id, UserFuelStats.fuel_id],
+            set_={
+                "num_searches": UserFuelStats.num_searches + excluded.num_searches,
+                "num_stations": UserFuelStats.num_stations + excluded.num_stations,
+                "sum_price_avg": UserFuelStats.sum_price_avg + excluded.sum_price_avg,
+                "sum_price_min": UserFuelStats.sum_price_min + excluded.sum_price_min,
+                "upd_ts": func.now(),
+            },
+        )
+    )
+
+
+def _rollup_source():
+    """Return the condition selecting the searches the rollup accumulates."""
+    return (
+        (Search.num_stations > 0)
+        & Search.price_avg.is_not(None)
+        & Search.price_min.is_not(None)
+        & Search.del_ts.is_(None)
+    )
+
+
+@tagged
+async def reconcile_user_fuel_stats() -> int:
+    """Recompute `user_fuel_stats` from `searches`, fixing rows that drifted.
+
+    Only rows whose totals differ are rewritten, and rows left without any
+    matching search are deleted. The rollup table is locked against concurrent
+    bumps for the duration, so searches saved meanwhile wait and are not lost.
+
+    Returns:
+        int: Number of rollup rows inserted, updated or deleted.
+    """
+    agg = (
+        select(
+            Search.user_id,
+            Search.fuel_id,
+            func.count(),
+            func.sum(Search.num_stations),
+            func.sum(Search.price_avg),
+            func.sum(Search.price_min),
+            func.now(),
+        )
+        .where(_rollup_source())
+        .group_by(Search.user_id, Search.fuel_id)
+    )
+    stmt = pg_insert(UserFuelStats).from_select(
+        ["user_id", "fuel_id", "num_searches", "num_stations", "sum_price_avg", "sum_price_min", "upd_ts"],
+        agg,
+    )
+    excluded = stmt.excluded
+    upsert = stmt.on_conflict_do_update(
+        index_elements=[UserFuelStats.user_id, UserFuelStats.fuel_id],
+        set_={
+            "num_searches": excluded.num_searches,
+            "num_stations": excluded.num_stations,
+            "sum_price_avg": excluded.sum_price_avg,
+            "sum_price_min": excluded.sum_price_min,
+            "upd_ts": func.now(),
+        },
+        where=or_(
+            UserFuelStats.num_searches.is_distinct_from(excluded.num_searches),
+            UserFuelStats.num_stations.is_distinct_from(excluded.num_stations),
+            UserFuelStats.sum_price_avg.is_distinct_from(excluded.sum_price_avg),
+            UserFuelStats.sum_price_min.is_distinct_from(excluded.sum_price_min),
+        ),
+    )
+    orphans = delete(UserFuelStats).where(
+        ~exists().where(
+            Search.user_id == UserFuelStats.user_id,
+            Search.fuel_id == UserFuelStats.fuel_id,
+            _rollup_source(),
+        )
+    )
+
+    async with AsyncSession() as session:
+        await session.execute(text("LOCK TABLE user_fuel_stats IN SHARE ROW EXCLUSIVE MODE"))
+        upserted = await session.execute(upsert)
+        deleted = await session.execute(orphans.execution_options(synchronize_session=False))
+        await session.commit()
+    return (upserted.rowcount or 0) + (deleted.rowcount or 0)
+
+
+@tagged
 async def save_search(
-        tg_id: int,
-        fuel_code: str,
+        user_id: int,
+        fuel_id: int,
         radius: float,
         num_stations: int,
         price_avg: Optional[float] = None,
         price_min: Optional[float] = None,
 ) -> None:
-    """Persist a search record linked to the given Telegram user.
+    """Persist a search record for an already-resolved user and fuel.
+
+    Callers get both IDs from the cached user profile, so no lookups are needed.
 
     Args:
-        tg_id: Telegram user ID.
-        fuel_code: Fuel code for the search.
+        user_id: Internal `User.id`.
+        fuel_id: Internal `Fuel.id` for the search.
         radius: Search radius (km).
         num_stations: Number of stations considered.
         price_avg: Average price among stations (optional).
         price_min: Minimum price among stations (optional).
+    """
+    await save_searches([{
+        "user_id": user_id,
+        "fuel_id": fuel_id,
+        "radius": radius,
+        "num_stations": num_stations,
+        "price_avg": price_avg,
+        "price_min": price_min,
+    }])
 
-    Raises:
-        sqlalchemy.exc.NoResultFound: If the user or fuel cannot be resolved.
+
+@tagged
+async def save_searches(rows: Sequence[Mapping[str, Any]]) -> int:
+    """Persist many search records with a single multi-row INSERT.
+
+    The per-user rollup is updated in the same transaction.
+
+    Args:
+        rows: Mappings with the `save_search` fields (`user_id`, `fuel_id`,
+            `radius`, `num_stations`, `price_avg`, `price_min`).
+
+    Returns:
+        int: Number of rows inserted.
     """
+    if not rows:
+        return 0
     async with AsyncSession() as session:
-        user_id = (await session.execute(
-            select(User.id).where(User.tg_id == tg_id)
-        )).scalar_one()
-
-        fuel_id = (await session.execute(
-            select(Fuel.id).where(Fuel.code == fuel_code)
-        )).scalar_one()
-
-        new_search = Search(
-            user_id=user_id,
-            fuel_id=fuel_id,
-            radius=radius,
-            num_stations=num_stations,
-            price_avg=price_avg,
-            price_min=price_min,
-        )
-        session.add(new_search)
+        await session.execute(insert(Search).values(list(rows)))
+        await _bump_user_fuel_stats(session, rows)
         await session.commit()
+    return len(rows)
 
 
+@tagged
 async def soft_delete_user_searches(user_id: int) -> int:
-    """Soft-delete all active searches for a given user.
+    """Soft-delete all active searches for a given user and clear their rollup.
 
     Args:
         user_id: Internal `User.id`.
@@ -68,10 +216,14 @@ async def soft_delete_user_searches(user_id: int) -> int:
             .where(Search.del_ts.is_(None))
             .values(del_ts=func.now())
         )
+        await session.execute(
+            delete(UserFuelStats).where(UserFuelStats.user_id == user_id)
+        )
         await session.commit()
         return res.rowcount or 0
 
 
+@tagged
 async def soft_delete_user_searches_by_tg_id(tg_id: int) -> int:
     """Soft-delete all active searches for a given Telegram user.
 
@@ -80,10 +232,11 @@ async def soft_delete_user_searches_by_tg_id(tg_id: int) -> int:
 
     Returns:
         int: Number of rows updated.
-    """
-    async with AsyncSession() as session:
-        user_id = (await session.execute(
-            select(User.id).where(User.tg_id == tg_id)
-        )).scalar_one()
 
-    return await soft_delete_user_searches(user_id)
+    Raises:
+        sqlalchemy.exc.NoResultFound: If the user does not exist.
+    """
+    profile = await get_user_profile(tg_id)
+    if profile is None:
+        raise NoResultFound(f"User not found: tg_id={tg_id}")
+    return await soft_delete_user_searches(profile.user_id)
@@ -0,0 +1,99 @@
+"""Station repository: MISE service-area registry with an in-process LRU."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from ..instrumentation import tagged
+from ..models import Station
+from ..session import AsyncSession
+from ...config import STATION_CACHE_SIZE
+from ...utils.cache import LRUCache
+
+_cache: LRUCache[int, Station] = LRUCache(maxsize=STATION_CACHE_SIZE)
+
+
+@tagged
+async def get_station(station_id: int) -> Optional[Station]:
+    """Fetch a registry entry, serving from the in-process LRU when possible.
+
+    Args:
+        station_id: MISE station identifier.
+
+    Returns:
+        Optional[Station]: The cached row or `None` if the station is unknown.
+    """
+    station = _cache.get(station_id)
+    if station is not None:
+        return station
+
+    async with AsyncSession() as session:
+        result = await session.execute(
+            select(Station).where(
+                Station.id == station_id,
+                Station.del_ts.is_(None),
+            )
+        )
+        station = result.scalar_one_or_none()
+
+    if station is not None:
+        _cache.set(station_id, station)
+    return station
+
+
+@tagged
+async def save_station(
+        station_id: int,
+        *,
+        brand: Optional[str] = None,
+        name: Optional[str] = None,
+        address: Optional[str] = None,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+) -> Station:
+    """Insert or refresh a registry entry and bump its `last_seen_ts`.
+
+    `None` values never overwrite data already stored for the station.
+
+    Args:
+        station_id: MISE station identifier.
+        brand: Station brand.
+        name: Station name.
+        address: Full address.
+        lat: Latitude.
+        lng: Longitude.
+
+    Returns:
+        Station: The stored row (also placed in the LRU).
+    """
+    stmt = insert(Station).values(
+        id=station_id,
+        brand=brand,
+        name=name,
+        address=address,
+        lat=lat,
+        lng=lng,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Station.id],
+        set_={
+            "brand": func.coalesce(stmt.excluded.brand, Station.brand),
+            "name": func.coalesce(stmt.excluded.name, Station.name),
+            "address": func.coalesce(stmt.excluded.address, Station.address),
+            "lat": func.coalesce(stmt.excluded.lat, Station.lat),
+            "lng": func.coalesce(stmt.excluded.lng, Station.lng),
+            "last_seen_ts": func.now(),
+            "upd_ts": func.now(),
+            "del_ts": None,
+        },
+    ).returning(Station)
+
+    async with AsyncSession() as session:
+        station = (await session.execute(stmt)).scalar_one()
+        await session.commit()
+
+    _cache.set(station_id, station)
+    return station
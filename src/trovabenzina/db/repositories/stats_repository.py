@@ -1,18 +1,25 @@
-"""Stats repository: read-only helpers built on DB views."""
+"""Stats repository: read-only helpers built on DB views and rollups."""
 
+from decimal import Decimal
 from typing import Any, Dict, List
 
 from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound
 
-from ..models import User, VGeocodingMonthCalls, VUsersSearchesStats
+from .profile_repository import get_user_profile
+from ..catalog import FuelEntry, get_catalog
+from ..instrumentation import tagged
+from ..models import Fuel, UserFuelStats, VGeocodingMonthCalls
 from ..session import AsyncSession
 
 
+@tagged
 async def count_geocoding_month_calls() -> int:
     """Return the number of geocoding calls in the last 30 days.
 
     Returns:
-        int: Value from the `v_geocoding_month_calls` view.
+        int: Value from the `v_geocoding_month_calls` view (sum of the
+            `geocoding_quota` daily counters).
     """
     async with AsyncSession() as session:
         result = await session.execute(
@@ -22,22 +29,72 @@ async def count_geocoding_month_calls() -> int:
         return cnt or 0
 
 
+@tagged
 async def get_user_stats(tg_id: int) -> List[Dict[str, Any]]:
-    """Return per-fuel statistics for a user, from the materialized view.
+    """Return per-fuel statistics for a user, from the `user_fuel_stats` rollup.
+
+    Reads one row per fuel and derives the same figures as the
+    `v_users_searches_stats` view; fuel metadata comes from the catalog, or
+    from `dom_fuels` for fuels retired since the searches (the catalog only
+    holds active ones).
 
     Args:
         tg_id: Telegram user ID.
 
     Returns:
-        List[Dict[str, Any]]: One dict per fuel with fields from `VUsersSearchesStats`.
+        List[Dict[str, Any]]: One dict per fuel with the fields of `VUsersSearchesStats`.
+
+    Raises:
+        sqlalchemy.exc.NoResultFound: If the user does not exist.
     """
-    async with AsyncSession() as session:
-        user_id = (await session.execute(
-            select(User.id).where(User.tg_id == tg_id)
-        )).scalar_one()
+    profile = await get_user_profile(tg_id)
+    if profile is None:
+        raise NoResultFound(f"User not found: tg_id={tg_id}")
 
-        stmt = select(*VUsersSearchesStats.__table__.c).where(
-            VUsersSearchesStats.user_id == user_id
+    async with AsyncSession() as session:
+        result = await session.execute(
+            select(
+                UserFuelStats.fuel_id,
+                UserFuelStats.num_searches,
+                UserFuelStats.num_stations,
+                UserFuelStats.sum_price_avg,
+                UserFuelStats.sum_price_min,
+            )
+            .where(UserFuelStats.user_id == profile.user_id)
+            .where(UserFuelStats.num_searches > 0)
+            .order_by(UserFuelStats.fuel_id)
         )
-        result = await session.execute(stmt)
-        return [dict(row) for row in result.mappings().all()]
+        rows = result.all()
+
+        catalog = get_catalog()
+        fuels = {row[0]: catalog.fuel_by_id(row[0]) for row in rows}
+        retired = [fuel_id for fuel_id, fuel in fuels.items() if fuel is None]
+        if retired:
+            result = await session.execute(
+                select(Fuel.id, Fuel.code, Fuel.name, Fuel.uom, Fuel.avg_consumption_per_100km)
+                .where(Fuel.id.in_(retired))
+            )
+            fuels.update((row[0], FuelEntry(*row)) for row in result.all())
+
+    stats: List[Dict[str, Any]] = []
+    for fuel_id, num_searches, num_stations, sum_avg, sum_min in rows:
+        fuel = fuels[fuel_id]
+        if fuel is None:
+            # Fuel row hard-deleted; nothing to label the figures with
+            continue
+        save_per_unit = (sum_avg - sum_min) / num_searches
+        avg_price = sum_avg / num_searches
+        stats.append({
+            "user_id": profile.user_id,
+            "fuel_id": fuel_id,
+            "fuel_code": fuel.code,
+            "fuel_name": fuel.name,
+            "uom": fuel.uom,
+            "avg_consumption_per_100km": fuel.avg_consumption_per_100km,
+            "num_searches": num_searches,
+            "num_stations": num_stations,
+            "avg_eur_save_per_unit": save_per_unit,
+            "avg_pct_save": save_per_unit / avg_price if avg_price else Decimal(0),
+            "estimated_annual_save_eur": save_per_unit * (fuel.avg_consumption_per_100km * 100),
+        })
+    return stats
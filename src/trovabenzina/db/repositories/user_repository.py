@@ -4,12 +4,16 @@ from typing import Optional, Tuple, List
 
 from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import NoResultFound
 
+from .profile_repository import get_user_profile, invalidate_user_profile
+from ..instrumentation import tagged
 from ..models import User, Fuel, Language, Search
 from ..session import AsyncSession
 from ...config import DEFAULT_LANGUAGE
 
 
+@tagged
 async def upsert_user(
         tg_id: int,
         tg_username: str,
@@ -19,7 +23,8 @@ async def upsert_user(
     """Insert or update a user by Telegram ID.
 
     If the user exists, updates preferred fuel (and language if provided).
-    Uses a DB-side upsert on the unique index over `User.tg_id`.
+    Uses a DB-side upsert on the unique index over `User.tg_id` and
+    invalidates the cached profile (write-through).
 
     Args:
         tg_id: Telegram user ID.
@@ -60,7 +65,10 @@ async def upsert_user(
         await session.execute(stmt)
         await session.commit()
 
+    invalidate_user_profile(tg_id)
 
+
+@tagged
 async def get_user(tg_id: int) -> Optional[Tuple[str, Optional[str]]]:
     """Fetch the user's preferences (fuel code, language code).
 
@@ -71,18 +79,11 @@ async def get_user(tg_id: int) -> Optional[Tuple[str, Optional[str]]]:
         Optional[Tuple[str, Optional[str]]]: `(fuel_code, language_code)` or `None`
         if the user does not exist.
     """
-    async with AsyncSession() as session:
-        result = await session.execute(
-            select(Fuel.code, Language.code)
-            .select_from(User)
-            .join(Fuel, User.fuel_id == Fuel.id)
-            .outerjoin(Language, User.language_id == Language.id)
-            .where(User.tg_id == tg_id)
-        )
-        row = result.first()
-        return None if not row else row
+    profile = await get_user_profile(tg_id)
+    return None if profile is None else (profile.fuel_code, profile.lang)
 
 
+@tagged
 async def get_user_fuel_code_by_tg_id(tg_id: int) -> str:
     """Return the user's preferred fuel code.
 
@@ -95,16 +96,13 @@ async def get_user_fuel_code_by_tg_id(tg_id: int) -> str:
     Raises:
         sqlalchemy.exc.NoResultFound: If the user does not exist.
     """
-    async with AsyncSession() as session:
-        result = await session.execute(
-            select(Fuel.code)
-            .select_from(User)
-            .join(Fuel, User.fuel_id == Fuel.id)
-            .where(User.tg_id == tg_id)
-        )
-        return result.scalar_one()
+    profile = await get_user_profile(tg_id)
+    if profile is None:
+        raise NoResultFound(f"User not found: tg_id={tg_id}")
+    return profile.fuel_code
 
 
+@tagged
 async def get_user_language_code_by_tg_id(tg_id: int) -> str:
     """Return the user's preferred language code, if set.
 
@@ -112,19 +110,13 @@ async def get_user_language_code_by_tg_id(tg_id: int) -> str:
         tg_id: Telegram user ID.
 
     Returns:
-        Optional[str]: `Language.code` or `None` if not set or user not found.
+        str: `Language.code`, or `DEFAULT_LANGUAGE` if not set or user not found.
     """
-    async with AsyncSession() as session:
-        result = await session.execute(
-            select(Language.code)
-            .select_from(User)
-            .outerjoin(Language, User.language_id == Language.id)
-            .where(User.tg_id == tg_id)
-        )
-        code = result.scalar_one_or_none()
-        return code or DEFAULT_LANGUAGE
+    profile = await get_user_profile(tg_id)
+    return profile.lang if profile is not None else DEFAULT_LANGUAGE
 
 
+@tagged
 async def get_user_id_by_tg_id(tg_id: int) -> Optional[int]:
     """Get internal user ID from Telegram ID.
 
@@ -134,13 +126,11 @@ async def get_user_id_by_tg_id(tg_id: int) -> Optional[int]:
     Returns:
         Optional[int]: Internal `User.id` or `None` if not found.
     """
-    async with AsyncSession() as session:
-        result = await session.execute(
-            select(User.id).where(User.tg_id == tg_id)
-        )
-        return result.scalar_one_or_none()
+    profile = await get_user_profile(tg_id)
+    return None if profile is None else profile.user_id
 
 
+@tagged
 async def get_search_users() -> List[Tuple[int, int]]:
     """Return distinct users that have at least one search.
 
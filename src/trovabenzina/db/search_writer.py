@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+"""
+Write-behind queue for search analytics.
+
+Handlers enqueue search events without awaiting a DB transaction; a background
+task flushes them in batched multi-row INSERTs when the batch is full or the
+flush interval elapses. A batch whose INSERT fails is retried with backoff
+before it is counted as failed. The queue is bounded: when it is full, new
+events are dropped and counted rather than slowing down replies.
+
+`flush_pending_searches()` writes everything queued so far at once; callers
+that delete a user's searches await it first, so no queued event recreates
+them afterwards.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .repositories.search_repository import save_searches
+from ..config import SEARCH_FLUSH_BATCH, SEARCH_FLUSH_INTERVAL, SEARCH_QUEUE_MAXSIZE
+
+__all__ = [
+    "SearchWriter",
+    "enqueue_search",
+    "flush_pending_searches",
+    "start_search_writer",
+    "stop_search_writer",
+    "search_writer_stats",
+]
+
+log = logging.getLogger(__name__)
+
+# Attempts per batch and the first retry delay (seconds), doubled on each retry
+_FLUSH_ATTEMPTS = 3
+_FLUSH_BACKOFF = 1.0
+
+
+class SearchWriter:
+    """Bounded in-process queue flushed to the `searches` table in batches.
+
+    Attributes:
+        batch_size: Flush as soon as this many events are pending.
+        flush_interval: Flush pending events at least this often (seconds).
+    """
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Events taken off the queue by the flusher but not written yet
+        self._pending: List[Dict[str, Any]] = []
+        # Held while a batch is written, so `flush_pending` can wait for it
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+        self._retries = 0
+        self._batches = 0
+        self._high_water = 0
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Queue a search row without blocking.
+
+        Args:
+            row: Column values for one `Search` row.
+
+        Returns:
+            bool: False if the queue was full and the row was dropped.
+        """
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 100 == 0:
+                log.warning("Search write queue full; dropped %d events so far", self._dropped)
+            return False
+        self._enqueued += 1
+        self._high_water = max(self._high_water, self._queue.qsize())
+        return True
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch, retrying transient failures with exponential backoff.
+
+        Each attempt is one transaction, so a failed attempt writes nothing and
+        retrying cannot duplicate rows. New events keep queueing meanwhile.
+        """
+        delay = _FLUSH_BACKOFF
+        for attempt in range(1, _FLUSH_ATTEMPTS + 1):
+            try:
+                self._written += await save_searches(batch)
+                self._batches += 1
+                return
+            except Exception:
+                if attempt == _FLUSH_ATTEMPTS:
+                    self._failed += len(batch)
+                    log.exception("Failed to flush %d search events after %d attempts", len(batch), attempt)
+                    return
+                self._retries += 1
+                log.warning("Flushing %d search events failed, retrying in %.1fs", len(batch), delay, exc_info=True)
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    async def _collect(self) -> None:
+        """Wait for the first event, then gather more into `_pending` until full or the interval elapses."""
+        loop = asyncio.get_running_loop()
+        deadline = None
+        while len(self._pending) < self.batch_size:
+            if deadline is None:
+                timeout = min(self.flush_interval, 1.0)
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+            try:
+                row = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                if self._pending or self._stopping:
+                    break
+                continue
+            # Appended only now: `flush_pending` may have swapped the list meanwhile
+            self._pending.append(row)
+            if deadline is None:
+                deadline = loop.time() + self.flush_interval
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self._collect()
+            async with self._lock:
+                # `flush_pending` may have written the collected events already
+                batch, self._pending = self._pending, []
+                if batch:
+                    await self._flush(batch)
+
+    async def flush_pending(self) -> None:
+        """Write every event enqueued so far without waiting for the flush interval.
+
+        Also waits for a batch the background task is writing, so when this
+        returns every earlier event is in the DB (or counted as failed).
+        """
+        async with self._lock:
+            while not self._queue.empty():
+                self._pending.append(self._queue.get_nowait())
+            batch, self._pending = self._pending, []
+            for start in range(0, len(batch), self.batch_size):
+                await self._flush(batch[start:start + self.batch_size])
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain every pending event to the DB."""
+        self._stopping = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush_pending()
+        log.info("Search writer stopped: %s", self.stats())
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue depth and enqueue/drop/flush/retry counters."""
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "high_water": self._high_water,
+            "enqueued": self._enqueued,
+            "dropped": self._dropped,
+            "written": self._written,
+            "failed": self._failed,
+            "retries": self._retries,
+            "batches": self._batches,
+        }
+
+
+_writer = SearchWriter(
+    maxsize=SEARCH_QUEUE_MAXSIZE,
+    batch_size=SEARCH_FLUSH_BATCH,
+    flush_interval=SEARCH_FLUSH_INTERVAL,
+)
+
+
+def enqueue_search(
+        user_id: int,
+        fuel_id: int,
+        radius: float,
+        num_stations: int,
+        price_avg: Optional[float] = None,
+        price_min: Optional[float] = None,
+) -> bool:
+    """Queue a search record for asynchronous persistence.
+
+    Args:
+        user_id: Internal `User.id`.
+        fuel_id: Internal `Fuel.id` for the search.
+        radius: Search radius (km).
+        num_stations: Number of stations considered.
+        price_avg: Average price among stations (optional).
+        price_min: Minimum price among stations (optional).
+
+    Returns:
+        bool: False if the event was dropped because the queue is full.
+    """
+    return _writer.enqueue({
+        "user_id": user_id,
+        "fuel_id": fuel_id,
+        "radius": radius,
+        "num_stations": num_stations,
+        "price_avg": price_avg,
+        "price_min": price_min,
+    })
+
+
+async def flush_pending_searches() -> None:
+    """Write every queued search event now, e.g. before deleting a user's searches."""
+    await _writer.flush_pending()
+
+
+async def start_search_writer() -> None:
+    """Start the background search writer."""
+    _writer.start()
+
+
+async def stop_search_writer() -> None:
+    """Stop the background search writer, draining pending events."""
+    await _writer.stop()
+
+
+def search_writer_stats() -> Dict[str, int]:
+    """Return metrics of the search write queue (depth, drops, flushes)."""
+    return _writer.stats()
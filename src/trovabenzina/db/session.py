@@ -4,7 +4,8 @@ from __future__ import annotations
 Database session and initialization helpers.
 
 This module exposes:
-- `engine`: the async SQLAlchemy engine (asyncpg for PostgreSQL).
+- `engine`: the async SQLAlchemy engine (asyncpg for PostgreSQL), with its
+  pool and driver options taken from settings.
 - `AsyncSession`: session factory for async ORM use.
 - `init_db()`: idempotent database initializer (tables + optional SQL scripts).
 
@@ -21,8 +22,19 @@ from sqlalchemy import text
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
-from ..config import DATABASE_URL
+from ..config import (
+    DATABASE_URL,
+    DB_APPLICATION_NAME,
+    DB_COMMAND_TIMEOUT,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+)
 from .models.base import Base
+from .instrumentation import instrument_queries
+from .pool import InstrumentedPool, instrument_engine
 
 log = logging.getLogger(__name__)
 
@@ -35,8 +47,28 @@ _url = make_url(DATABASE_URL)
 if _url.drivername == "postgresql":
     _url = _url.set(drivername="postgresql+asyncpg")
 
-# Async engine and session factory
-engine = create_async_engine(_url, echo=False, pool_pre_ping=True, future=True)
+# Async engine and session factory. Disconnects are handled optimistically: no
+# pre-ping round trip per checkout; connections are recycled before server/proxy
+# idle timeouts, and a connection found dead mid-use invalidates the pool so the
+# next checkout reconnects.
+engine = create_async_engine(
+    _url,
+    echo=False,
+    future=True,
+    poolclass=InstrumentedPool,
+    pool_pre_ping=False,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args={
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "command_timeout": DB_COMMAND_TIMEOUT,
+        "server_settings": {"application_name": DB_APPLICATION_NAME},
+    },
+)
+instrument_engine(engine)
+instrument_queries(engine)
 AsyncSession = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -61,7 +93,8 @@ async def _execute_sql_scripts_dir(dir_path: Path) -> None:
     """Execute all .sql files in a directory, sorted by filename.
 
     For each file:
-        - Try to execute as a single statement.
+        - Try to execute as a single statement (inside a savepoint, so a failure
+          does not abort the surrounding transaction).
         - If it fails, fallback to a naive split and execute statements one-by-one.
 
     Args:
@@ -84,7 +117,8 @@ async def _execute_sql_scripts_dir(dir_path: Path) -> None:
 
             try:
                 # Fast path: single-statement file
-                await conn.execute(text(raw))
+                async with conn.begin_nested():
+                    await conn.execute(text(raw))
                 log.info("Executed SQL script: %s", sql_file.name)
             except Exception as e:
                 # Fallback: naive split into multiple statements
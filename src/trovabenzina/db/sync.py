@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import aiofiles
 from sqlalchemy import Boolean, DateTime, Float, Integer, Numeric, String, select
 
+from .instrumentation import tagged
 from .models import Fuel, Language
 from .session import AsyncSession
 
@@ -242,6 +243,7 @@ async def _sync_model_from_csv(model, csv_filename: str) -> None:
     )
 
 
+@tagged
 async def sync_config_tables() -> None:
     """Synchronize domain config tables from CSV assets.
 
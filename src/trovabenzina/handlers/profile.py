@@ -21,8 +21,8 @@ from telegram.ext import (
     ContextTypes,
 )
 
-from ..config import DEFAULT_LANGUAGE, FUEL_MAP, LANGUAGE_MAP
-from ..db import get_user, upsert_user
+from ..config import DEFAULT_LANGUAGE
+from ..db import get_catalog, get_user, upsert_user
 from ..i18n import t
 from ..utils import (
     STEP_PROFILE_MENU,
@@ -58,6 +58,18 @@ def _build_profile_keyboard(locale: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_kb(items, per_row=1))
 
 
+def _language_name(code: str) -> str:
+    """Return the display name of a language code (the code itself if unknown)."""
+    entry = get_catalog().language_by_code(code)
+    return entry.name if entry else code
+
+
+def _fuel_name_key(code: str) -> str:
+    """Return the translation key (fuel name) of a fuel code (the code itself if unknown)."""
+    entry = get_catalog().fuel_by_code(code)
+    return entry.name if entry else code
+
+
 async def _get_or_create_defaults(uid: int, username: str) -> tuple[str, str]:
     """
     Return user's (fuel_code, language_code), creating defaults if missing.
@@ -80,7 +92,7 @@ async def _get_or_create_defaults(uid: int, username: str) -> tuple[str, str]:
         return fuel_code, lang_code or DEFAULT_LANGUAGE
 
     # Bootstrap defaults on first access
-    fuel_code = next(iter(FUEL_MAP.values()))
+    fuel_code = get_catalog().fuels[0].code
     await upsert_user(uid, username, fuel_code, DEFAULT_LANGUAGE)
     return fuel_code, DEFAULT_LANGUAGE
 
@@ -103,11 +115,8 @@ async def back_to_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     username = update.effective_user.username
     fuel_code, lang_code = await _get_or_create_defaults(uid, username)
 
-    lang_name = LANGUAGE_MAP.get(
-        lang_code,
-        next((n for n, c in LANGUAGE_MAP.items() if c == lang_code), lang_code),
-    )
-    fuel_name_key = next((n for n, c in FUEL_MAP.items() if c == fuel_code), fuel_code)
+    lang_name = _language_name(lang_code)
+    fuel_name_key = _fuel_name_key(fuel_code)
     fuel_label = t(fuel_name_key, lang_code)
 
     summary = f"{t('language', lang_code)}: {lang_name}\n{t('fuel', lang_code)}: {fuel_label}"
@@ -140,11 +149,8 @@ async def profile_ep(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     context.user_data["lang"] = lang_code
 
-    lang_name = LANGUAGE_MAP.get(
-        lang_code,
-        next((n for n, c in LANGUAGE_MAP.items() if c == lang_code), lang_code),
-    )
-    fuel_name_key = next((n for n, c in FUEL_MAP.items() if c == fuel_code), fuel_code)
+    lang_name = _language_name(lang_code)
+    fuel_name_key = _fuel_name_key(fuel_code)
     fuel_label = t(fuel_name_key, lang_code)
 
     summary = f"{t('language', lang_code)}: {lang_name}\n{t('fuel', lang_code)}: {fuel_label}"
@@ -174,7 +180,7 @@ async def ask_language(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     context.chat_data["current_state"] = STEP_PROFILE_LANGUAGE
     lang = context.user_data.get("lang", DEFAULT_LANGUAGE)
 
-    language_choices = {code: name for name, code in LANGUAGE_MAP.items()}
+    language_choices = {lang.code: lang.name for lang in get_catalog().languages}
     kb = inline_menu_from_map(language_choices, "set_lang", per_row=2)
     kb = with_back_row(kb, "profile")
 
@@ -207,11 +213,8 @@ async def save_language(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     await upsert_user(uid, username, fuel_code, new_lang)
     context.user_data["lang"] = new_lang
 
-    lang_name = LANGUAGE_MAP.get(
-        new_lang,
-        next((n for n, c in LANGUAGE_MAP.items() if c == new_lang), new_lang),
-    )
-    fuel_name_key = next((n for n, c in FUEL_MAP.items() if c == fuel_code), fuel_code)
+    lang_name = _language_name(new_lang)
+    fuel_name_key = _fuel_name_key(fuel_code)
     fuel_label = t(fuel_name_key, new_lang)
 
     summary = (
@@ -244,7 +247,7 @@ async def ask_fuel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     context.chat_data["current_state"] = STEP_PROFILE_FUEL
     lang = context.user_data.get("lang", DEFAULT_LANGUAGE)
 
-    fuel_choices = {code: t(name, lang) for name, code in FUEL_MAP.items()}
+    fuel_choices = {fuel.code: t(fuel.name, lang) for fuel in get_catalog().fuels}
     kb = inline_menu_from_map(fuel_choices, "set_fuel", per_row=2)
     kb = with_back_row(kb, "profile")
 
@@ -277,11 +280,8 @@ async def save_fuel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     _, lang_code = await _get_or_create_defaults(uid, username)
     await upsert_user(uid, username, new_fuel, lang_code)
 
-    lang_name = LANGUAGE_MAP.get(
-        lang_code,
-        next((n for n, c in LANGUAGE_MAP.items() if c == lang_code), lang_code),
-    )
-    fuel_name_key = next((n for n, c in FUEL_MAP.items() if c == new_fuel), new_fuel)
+    lang_name = _language_name(lang_code)
+    fuel_name_key = _fuel_name_key(new_fuel)
     fuel_label = t(fuel_name_key, lang_code)
 
     summary = (
@@ -5,7 +5,9 @@ Supports searching by GPS location or typed address, with radius refinement
 callbacks and a compact results layout.
 """
 
-from typing import Optional
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
 
 from telegram import Update, ReplyKeyboardRemove, InlineKeyboardMarkup
 from telegram.constants import ParseMode
@@ -18,28 +20,35 @@ from telegram.ext import (
     filters,
 )
 
-from ..api import get_station_address, search_stations, geocode_address_with_country
-from ..config import GEOCODE_HARD_CAP
+from ..api import (
+    get_station_address,
+    search_snapshot,
+    search_stations,
+    resolve_address,
+    GEOCODE_ERROR,
+    GEOCODE_FOREIGN,
+    GEOCODE_QUOTA,
+    StationRecord,
+)
+from ..config import STATION_ADDRESS_CONCURRENCY, STATION_ADDRESS_TIMEOUT, ZONE_CACHE_TTL
 from ..db import (
-    get_user,
-    save_search,
-    get_geocache,
-    save_geocache,
-    count_geocoding_month_calls,
-    get_uom_by_code,
+    get_user_profile,
+    enqueue_search,
     get_user_language_code_by_tg_id,
-    get_fuel_name_by_code,
 )
 from ..i18n import t
 from ..utils import (
     STEP_SEARCH_LOCATION,
+    counter,
     format_price_unit,
     format_price,
     format_avg_comparison_text,
     format_date,
     format_directions_url,
     format_radius,
+    haversine_km,
     inline_kb,
+    rank_stations,
     reroute_command,
 )
 
@@ -48,6 +57,16 @@ __all__ = ["search_ep", "search_handler", "radius_callback_handler"]
 _CB_NARROW = "search:r=2.5"
 _CB_WIDEN = "search:r=7.5"
 _INITIAL_RADIUS = 5.0
+_MAX_RADIUS = 7.5
+
+# How each search step ended: results, no_stations, upstream_error (MISE
+# unreachable), session_expired, or why the typed address was rejected
+# (invalid_address, foreign_address, geocode_quota, geocode_error)
+_OUTCOMES = counter(
+    "trovabenzina_search_outcomes_total",
+    "Search conversation steps by outcome",
+    ("outcome",),
+)
 
 
 def _message_from_update(update: Update):
@@ -73,6 +92,87 @@ async def _clear_processing_toast(ctx: ContextTypes.DEFAULT_TYPE, chat_id: int)
             pass
 
 
+async def _get_zone_stations(
+        ctx: ContextTypes.DEFAULT_TYPE,
+        lat: float,
+        lng: float,
+        fuel_code: str,
+) -> Optional[List[Tuple[float, StationRecord]]]:
+    """
+    Return stations within `_MAX_RADIUS` with their distance, fetching once per session.
+
+    The widest radius is queried on the first search and kept in `user_data`, so
+    narrower radii are answered by filtering locally without another MISE call.
+    The kept zone expires after `ZONE_CACHE_TTL` like the shared zone cache, so a
+    radius button pressed much later does not show outdated prices.
+    The local MISE snapshot is used when fresh; the live endpoint is the fallback.
+
+    Args:
+        ctx: Callback context.
+        lat: Latitude of the search center.
+        lng: Longitude of the search center.
+        fuel_code: Fuel code of the user.
+
+    Returns:
+        Optional[List[Tuple[float, StationRecord]]]: `(distance_km, station)`
+        pairs, or None if MISE could not be reached.
+    """
+    key = (lat, lng, fuel_code)
+    zone = ctx.user_data.get("search_zone")
+    if zone and zone["key"] == key and time.monotonic() - zone["fetched_at"] < ZONE_CACHE_TTL:
+        return zone["stations"]
+
+    res = search_snapshot(lat, lng, _MAX_RADIUS, int(fuel_code))
+    if res is None:
+        res = await search_stations(lat, lng, _MAX_RADIUS, f"{fuel_code}-x")
+    if res is None:
+        return None
+
+    stations = []
+    for st in res:
+        if st.lat is None or st.lng is None:
+            # Without coordinates we can only trust the station for the widest radius
+            stations.append((_MAX_RADIUS, st))
+            continue
+        stations.append((haversine_km(lat, lng, st.lat, st.lng), st))
+
+    ctx.user_data["search_zone"] = {"key": key, "stations": stations, "fetched_at": time.monotonic()}
+    return stations
+
+
+async def _fetch_missing_addresses(stations: List[StationRecord]) -> Dict[int, Optional[str]]:
+    """
+    Fetch registry addresses for stations that lack one, concurrently.
+
+    Fan-out is bounded by `STATION_ADDRESS_CONCURRENCY` and every call gets its
+    own `STATION_ADDRESS_TIMEOUT` deadline; a station that misses it maps to None.
+
+    Args:
+        stations: Station records as returned by MISE search.
+
+    Returns:
+        Dict[int, Optional[str]]: Station id -> address (None when unavailable).
+    """
+    missing = [st for st in stations if not st.address]
+    if not missing:
+        return {}
+
+    sem = asyncio.Semaphore(STATION_ADDRESS_CONCURRENCY)
+
+    async def _one(station: StationRecord) -> Optional[str]:
+        async with sem:
+            try:
+                return await asyncio.wait_for(
+                    get_station_address(station.id, seed=station),
+                    STATION_ADDRESS_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                return None
+
+    addresses = await asyncio.gather(*(_one(st) for st in missing))
+    return {st.id: addr for st, addr in zip(missing, addresses)}
+
+
 async def search_ep(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Entry point for /search: ask for a location or address.
@@ -116,6 +216,7 @@ async def search_receive_location(update: Update, ctx: ContextTypes.DEFAULT_TYPE
 
     ctx.user_data["radius_processing"] = False
     ctx.user_data["radius_clicked"] = set()
+    ctx.user_data.pop("search_zone", None)
 
     await run_search(update, ctx, radius_km=_INITIAL_RADIUS, show_initial_cta=True)
     return ConversationHandler.END
@@ -140,38 +241,30 @@ async def search_receive_text(update: Update, ctx: ContextTypes.DEFAULT_TYPE) ->
     ctx.user_data["processing_msg_id"] = proc_msg.message_id
 
     address = update.message.text.strip()
-    record = await get_geocache(address)
-    if record:
-        lat, lng = record.lat, record.lng
-    else:
-        stats = await count_geocoding_month_calls()
-        if stats >= GEOCODE_HARD_CAP:
-            await _clear_processing_toast(ctx, update.effective_chat.id)
+    geo = await resolve_address(address)
+    if not geo.ok:
+        await _clear_processing_toast(ctx, update.effective_chat.id)
+        if geo.status == GEOCODE_QUOTA:
+            _OUTCOMES.labels("geocode_quota").inc()
             await update.message.reply_text(t("geocode_cap_reached", lang))
-            return STEP_SEARCH_LOCATION
-
-        # Country-aware geocoding
-        coords = await geocode_address_with_country(address)
-        if not coords:
-            await _clear_processing_toast(ctx, update.effective_chat.id)
-            await update.message.reply_text(t("invalid_address", lang))
-            return STEP_SEARCH_LOCATION
-
-        lat, lng, country = coords
-
-        # If the address is not in Italy, inform the user and stop
-        if country and country != "IT":
-            await _clear_processing_toast(ctx, update.effective_chat.id)
+        elif geo.status == GEOCODE_ERROR:
+            # Same "unavailable, try again later" message as the quota
+            _OUTCOMES.labels("geocode_error").inc()
+            await update.message.reply_text(t("geocode_cap_reached", lang))
+        elif geo.status == GEOCODE_FOREIGN:
+            _OUTCOMES.labels("foreign_address").inc()
             await update.message.reply_text(t("italy_only", lang))
-            return STEP_SEARCH_LOCATION
-
-        # Cache if not already cached (idempotent)
-        await save_geocache(address, lat, lng)
+        else:
+            _OUTCOMES.labels("invalid_address").inc()
+            await update.message.reply_text(t("invalid_address", lang))
+        return STEP_SEARCH_LOCATION
+    lat, lng = geo.lat, geo.lng
 
     ctx.user_data["search_lat"] = lat
     ctx.user_data["search_lng"] = lng
     ctx.user_data["radius_processing"] = False
     ctx.user_data["radius_clicked"] = set()
+    ctx.user_data.pop("search_zone", None)
 
     await run_search(update, ctx, radius_km=_INITIAL_RADIUS, show_initial_cta=True)
     return ConversationHandler.END
@@ -197,96 +290,68 @@ async def run_search(
     """
     msg_obj = _message_from_update(origin)
 
-    uid = origin.effective_user.id
-    fuel_code, lang = await get_user(uid)
+    profile = await get_user_profile(origin.effective_user.id)
+    if profile is None:
+        _OUTCOMES.labels("session_expired").inc()
+        await msg_obj.reply_text(t("search_session_expired"))
+        return
+    fuel_code, lang = profile.fuel_code, profile.lang
     lat = ctx.user_data.get("search_lat")
     lng = ctx.user_data.get("search_lng")
     if lat is None or lng is None:
+        _OUTCOMES.labels("session_expired").inc()
         await msg_obj.reply_text(t("search_session_expired", lang))
         return
 
     # Fuel metadata
-    uom = (await get_uom_by_code(fuel_code)) or "L"
-    price_unit = format_price_unit(uom=uom, t=t, lang=lang)
-    fuel_name = await get_fuel_name_by_code(fuel_code)
+    price_unit = format_price_unit(uom=profile.uom or "L", t=t, lang=lang)
+    fuel_name = profile.fuel_name
 
     fid = int(fuel_code)
-    ft = f"{fuel_code}-x"
 
-    res = await search_stations(lat, lng, radius_km, ft)
-    stations = res.get("results", []) if res else []
-    num_stations = len(stations)
+    zone = await _get_zone_stations(ctx, lat, lng, fuel_code)
 
     # Clear "processing" toast if any
     await _clear_processing_toast(ctx, msg_obj.chat.id)
 
-    # Filter by fuelId and select the price candidate per station
-    filtered = []
-    for st in stations:
-        fuels = [f for f in st.get("fuels", []) if f.get("fuelId") == fid]
-        if fuels:
-            st["_filtered_fuels"] = fuels
-            filtered.append(st)
-
-    if not filtered:
-        await msg_obj.reply_text(
-            f"<u>{t('area_label', lang, radius=format_radius(radius_km))}</u> 📍\n\n{t('no_stations', lang)}",
-            parse_mode=ParseMode.HTML,
-        )
-        await save_search(uid, fuel_code, radius_km, num_stations, None, None)
+    if zone is None:
+        # MISE unreachable and nothing cached covers the area: not a search result
+        _OUTCOMES.labels("upstream_error").inc()
+        await msg_obj.reply_text(t("stations_unavailable", lang))
         return
 
-    # Keep cheapest; tie-break preferring self-service
-    all_fuels = [f for st in filtered for f in st["_filtered_fuels"]]
-    min_fuel = min(all_fuels, key=lambda f: (f["price"], not f.get("isSelf")))
-    target_is_self = min_fuel.get("isSelf")
+    stations = [st for dist, st in zone if dist <= radius_km]
 
-    for st in filtered:
-        st["_chosen_fuel"] = min(
-            st["_filtered_fuels"], key=lambda f: (f["price"], not f.get("isSelf"))
-        )
-    filtered = [st for st in filtered if st["_chosen_fuel"].get("isSelf") == target_is_self]
-    num_stations = len(filtered)
+    ranking = rank_stations(stations, fid, top_k=3)
+    num_stations = ranking.num_stations
 
-    if not filtered:
+    if not ranking.podium:
+        _OUTCOMES.labels("no_stations").inc()
         await msg_obj.reply_text(
             f"<u>{t('area_label', lang, radius=format_radius(radius_km))}</u> 📍\n\n{t('no_stations', lang)}",
             parse_mode=ParseMode.HTML,
         )
-        await save_search(uid, fuel_code, radius_km, num_stations, None, None)
+        enqueue_search(profile.user_id, profile.fuel_id, radius_km, num_stations, None, None)
         return
 
-    avg = sum(st["_chosen_fuel"]["price"] for st in filtered) / len(filtered)
-    below_avg = [st for st in filtered if st["_chosen_fuel"]["price"] <= avg]
-
-    if not below_avg:
-        await msg_obj.reply_text(
-            f"<u>{t('area_label', lang, radius=format_radius(radius_km))}</u> 📍\n\n{t('no_stations', lang)}",
-            parse_mode=ParseMode.HTML,
-        )
-        await save_search(uid, fuel_code, radius_km, num_stations, None, None)
-        return
-
-    sorted_res = sorted(below_avg, key=lambda r: r["_chosen_fuel"]["price"])
-    lowest = sorted_res[0]["_chosen_fuel"]["price"]
+    _OUTCOMES.labels("results").inc()
+    avg = ranking.average
+    lowest = ranking.lowest
+    fetched_addresses = await _fetch_missing_addresses([station for station, _ in ranking.podium])
 
     lines = []
     medals = ["🥇", "🥈", "🥉"]
-    for i, station in enumerate(sorted_res[:3]):
-        f0 = station["_chosen_fuel"]
-        price = f0["price"]
-        dir_url = format_directions_url(
-            station["location"]["lat"], station["location"]["lng"]
-        )
-        if not station.get("address"):
-            station["address"] = await get_station_address(station["id"]) or t("no_address", lang)
-        formatted_date = format_date(station.get("insertDate"), t=t, lang=lang)
+    for i, (station, chosen_fuel) in enumerate(ranking.podium):
+        price = chosen_fuel.price
+        dir_url = format_directions_url(station.lat, station.lng)
+        address = station.address or fetched_addresses.get(station.id) or t("no_address", lang)
+        formatted_date = format_date(station.insert_date, t=t, lang=lang)
         price_txt = format_price(price, price_unit)
         price_note = format_avg_comparison_text(price, avg, t=t, lang=lang)
 
         lines.append(
-            f"{medals[i]} <b><a href=\"{dir_url}\">{station['brand']} • {station['name']}</a></b>\n"
-            f"• <u>{t('address', lang)}</u>: {station['address']}\n"
+            f"{medals[i]} <b><a href=\"{dir_url}\">{station.brand} • {station.name}</a></b>\n"
+            f"• <u>{t('address', lang)}</u>: {address}\n"
             f"• <u>{t('price', lang)}</u>: <b>{price_txt}</b>, {price_note}\n"
             f"<i>[{t('last_update', lang)}: {formatted_date}]</i>"
         )
@@ -319,9 +384,9 @@ async def run_search(
         reply_markup=reply_markup,
     )
 
-    await save_search(
-        uid,
-        fuel_code,
+    enqueue_search(
+        profile.user_id,
+        profile.fuel_id,
         radius_km,
         num_stations,
         round(avg, 3),
@@ -14,8 +14,8 @@ from telegram.ext import (
     filters,
 )
 
-from ..config import DEFAULT_LANGUAGE, FUEL_MAP, LANGUAGE_MAP
-from ..db import upsert_user, get_user
+from ..config import DEFAULT_LANGUAGE
+from ..db import get_catalog, upsert_user, get_user
 from ..i18n import t
 from ..utils import (
     STEP_START_FUEL,
@@ -186,7 +186,7 @@ async def start_ep(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
         return ConversationHandler.END
 
     # Language selection
-    language_choices = {code: name for name, code in LANGUAGE_MAP.items()}
+    language_choices = {lang.code: lang.name for lang in get_catalog().languages}
     kb = inline_menu_from_map(language_choices, "lang", per_row=2)
     sent = await update.effective_message.reply_text(
         t("select_language", DEFAULT_LANGUAGE),
@@ -199,7 +199,7 @@ async def start_ep(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> int:
 # Handlers via factories
 
 language_selected = make_selection_handler(
-    lambda lang: {code: t(name, lang) for name, code in FUEL_MAP.items()},
+    lambda lang: {fuel.code: t(fuel.name, lang) for fuel in get_catalog().fuels},
     "lang",
     "select_fuel",
     "fuel",
@@ -218,7 +218,7 @@ fuel_selected = make_selection_handler(
 )
 
 back_to_lang = make_back_handler(
-    lambda lang: {code: name for name, code in LANGUAGE_MAP.items()},
+    lambda lang: {lang.code: lang.name for lang in get_catalog().languages},
     "select_language",
     "lang",
     STEP_START_LANGUAGE,
@@ -226,7 +226,7 @@ back_to_lang = make_back_handler(
 
 # Repeat prompts on invalid input
 repeat_lang_prompt = make_repeat_handler(
-    lambda lang: {code: name for name, code in LANGUAGE_MAP.items()},
+    lambda lang: {lang.code: lang.name for lang in get_catalog().languages},
     "select_language",
     "lang",
     None,
@@ -234,7 +234,7 @@ repeat_lang_prompt = make_repeat_handler(
 )
 
 repeat_fuel_prompt = make_repeat_handler(
-    lambda lang: {code: t(name, lang) for name, code in FUEL_MAP.items()},
+    lambda lang: {fuel.code: t(fuel.name, lang) for fuel in get_catalog().fuels},
     "select_fuel",
     "fuel",
     "back_lang",
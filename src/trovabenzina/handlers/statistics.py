@@ -9,8 +9,8 @@ from telegram.constants import ParseMode
 from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
 
 from ..db import (
+    flush_pending_searches,
     get_user_stats,
-    get_fuels_by_ids_map,
     get_user_language_code_by_tg_id,
     soft_delete_user_searches_by_tg_id,
 )
@@ -41,9 +41,6 @@ async def statistics_ep(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await update.effective_message.reply_text(t("no_statistics", lang))
         return
 
-    fuel_ids = [s["fuel_id"] for s in stats]
-    fuels = await get_fuels_by_ids_map(fuel_ids)
-
     blocks = []
     consumption_lines = []
     for s in stats:
@@ -53,12 +50,11 @@ async def statistics_ep(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         avg_eur = s.get("avg_eur_save_per_unit") or 0.0
         avg_pct = (s.get("avg_pct_save") or 0.0) * 100
         est_save = s.get("estimated_annual_save_eur") or 0.0
-        fid = s.get("fuel_id")
 
-        fmeta = fuels.get(fid)
+        # Fuel metadata comes with the stats, also for fuels no longer in the catalog.
         # More robust uom handling; default to liters for symbols and unit label.
-        uom = ((getattr(fmeta, "uom", None) or "").strip() or "L")
-        cons = float(getattr(fmeta, "avg_consumption_per_100km", 0.0)) if fmeta else 0.0
+        uom = ((s.get("uom") or "").strip() or "L")
+        cons = float(s.get("avg_consumption_per_100km") or 0.0)
 
         pu = format_price_unit(uom=uom, t=t, lang=lang)
         uom_symbol = symbol_kilo(t, lang) if uom.lower() in {"kg", "kilogram"} else symbol_liter(t, lang)
@@ -105,6 +101,9 @@ async def reset_stats_cb(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """
     Soft-delete all user searches and confirm reset.
 
+    Queued search events are written first; otherwise they would land after
+    the reset and bring the statistics back.
+
     Args:
         update: Telegram update.
         context: Callback context.
@@ -114,6 +113,7 @@ async def reset_stats_cb(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     tg_id = update.effective_user.id
     lang = await get_user_language_code_by_tg_id(tg_id)
 
+    await flush_pending_searches()
     await soft_delete_user_searches_by_tg_id(tg_id)
     await query.edit_message_text(t("statistics_reset", lang))
 
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "جارٍ البحث...🔍",
     "please_wait": "جارٍ العمل، يرجى الانتظار...⏳",
     "no_stations": "❌ لم يتم العثور على محطات",
+    "stations_unavailable": "⚠️ خدمة أسعار الوقود غير متاحة مؤقتًا!\n\nيرجى المحاولة مرة أخرى بعد قليل.",
     "area_label": "محطات ضمن نطاق {radius} كم",
     "stations_analyzed": "محطات مُحلّلة",
     "average_zone_price": "متوسط سعر {fuel_name} في المنطقة",
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Suche läuft.🔍",
     "please_wait": "Vorgang läuft, bitte einen Moment warten.⏳",
     "no_stations": "❌ Keine Tankstellen gefunden",
+    "stations_unavailable": "⚠️ Der Kraftstoffpreisdienst ist vorübergehend nicht erreichbar!\n\nBitte versuche es gleich noch einmal.",
     "area_label": "Tankstellen im Umkreis von {radius} km",
     "stations_analyzed": "Tankstellen analysiert",
     "average_zone_price": "Durchschnittspreis {fuel_name} in der Umgebung",
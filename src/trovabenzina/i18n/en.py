@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Search in progress...🔍",
     "please_wait": "Working on it, please wait...⏳",
     "no_stations": "❌ No stations found",
+    "stations_unavailable": "⚠️ The fuel price service is temporarily unavailable!\n\nPlease try again in a moment.",
     "area_label": "Stations within {radius} km",
     "stations_analyzed": "stations analyzed",
     "average_zone_price": "Average {fuel_name} price in the area",
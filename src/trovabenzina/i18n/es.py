@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Búsqueda en curso.🔍",
     "please_wait": "Operación en curso, espera un momento.⏳",
     "no_stations": "❌ No se han encontrado estaciones",
+    "stations_unavailable": "⚠️ ¡El servicio de precios de combustible no está disponible temporalmente!\n\nPor favor, inténtalo de nuevo en un momento.",
     "area_label": "Estaciones en un radio de {radius} km",
     "stations_analyzed": "estaciones analizadas",
     "average_zone_price": "Precio medio de {fuel_name} en la zona",
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Recherche en cours...🔍",
     "please_wait": "Un instant, s’il vous plaît...⏳",
     "no_stations": "❌ Aucune station trouvée",
+    "stations_unavailable": "⚠️ Le service des prix des carburants est temporairement indisponible !\n\nVeuillez réessayer dans un instant.",
     "area_label": "Stations dans un rayon de {radius} km",
     "stations_analyzed": "stations analysées",
     "average_zone_price": "Prix moyen {fuel_name} dans la zone",
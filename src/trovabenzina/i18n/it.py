@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Ricerca in corso...🔍",
     "please_wait": "Operazione in corso, attendi un attimo...⏳",
     "no_stations": "❌ Nessun distributore trovato",
+    "stations_unavailable": "⚠️ Il servizio prezzi carburanti è momentaneamente non disponibile!\n\nPer favore riprova tra poco.",
     "area_label": "Distributori nel raggio di {radius} km",
     "stations_analyzed": "stazioni analizzate",
     "average_zone_price": "Prezzo medio {fuel_name} nella zona",
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "検索中です。🔍",
     "please_wait": "処理中です。少々お待ちください。⏳",
     "no_stations": "❌ スタンドが見つかりませんでした",
+    "stations_unavailable": "⚠️ 燃料価格サービスは一時的に利用できません！\n\nしばらくしてからもう一度お試しください。",
     "area_label": "{radius} km 圏内のスタンド",
     "stations_analyzed": "件のスタンドを分析",
     "average_zone_price": "エリアの {fuel_name} 平均価格",
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Busca em andamento.🔍",
     "please_wait": "Processando, aguarde um instante.⏳",
     "no_stations": "❌ Nenhum posto encontrado",
+    "stations_unavailable": "⚠️ O serviço de preços de combustível está temporariamente indisponível!\n\nTente novamente em instantes.",
     "area_label": "Postos num raio de {radius} km",
     "stations_analyzed": "postos analisados",
     "average_zone_price": "Preço médio de {fuel_name} na zona",
@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "Выполняется поиск.🔍",
     "please_wait": "Выполняется операция, подождите немного.⏳",
     "no_stations": "❌ Заправки не найдены",
+    "stations_unavailable": "⚠️ Сервис цен на топливо временно недоступен!\n\nПожалуйста, повторите попытку чуть позже.",
     "area_label": "Заправки в радиусе {radius} км",
     "stations_analyzed": "станций проанализировано",
     "average_zone_price": "Средняя цена {fuel_name} в зоне",
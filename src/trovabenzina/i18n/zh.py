@@ -48,6 +48,7 @@ TRANSLATIONS = {
     "processing_search": "正在搜索。🔍",
     "please_wait": "正在处理，请稍候。⏳",
     "no_stations": "❌ 未找到加油站",
+    "stations_unavailable": "⚠️ 油价服务暂时不可用！\n\n请稍后再试。",
     "area_label": "半径 {radius} 公里内的加油站",
     "stations_analyzed": "个加油站已分析",
     "average_zone_price": "区域 {fuel_name} 平均价格",
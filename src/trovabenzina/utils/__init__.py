@@ -4,6 +4,8 @@ This file re-exports convenience functions and constants so they can be
 imported as ``from trovabenzina.utils import ...``.
 """
 
+from .address import ADDRESS_KEY_VERSION, address_locality, address_numbers, normalize_address_key
+from .cache import LRUCache
 from .formatting import (
     symbol_eur,
     symbol_kilo,
@@ -17,7 +19,27 @@ from .formatting import (
     format_directions_url,
     format_radius,
 )
+from .geo import (
+    EARTH_RADIUS_KM,
+    haversine_km,
+    geohash_encode,
+    geohash_bounds,
+    geohash_neighbors,
+)
 from .logging import RailwayLogFormatter, describe, setup_logging
+from .metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    counter,
+    gauge,
+    histogram,
+    stats_metrics,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from .pricing import Ranking, rank_stations
 from .routing import reroute_command
 from .states import (
     STEP_PROFILE_FUEL,
@@ -36,6 +58,13 @@ from .telegram import (
 )
 
 __all__ = [
+    # address
+    "ADDRESS_KEY_VERSION",
+    "normalize_address_key",
+    "address_locality",
+    "address_numbers",
+    # cache
+    "LRUCache",
     # formatting
     "symbol_eur",
     "symbol_slash",
@@ -48,10 +77,30 @@ __all__ = [
     "format_date",
     "format_directions_url",
     "format_radius",
+    # geo
+    "EARTH_RADIUS_KM",
+    "haversine_km",
+    "geohash_encode",
+    "geohash_bounds",
+    "geohash_neighbors",
     # logging
     "RailwayLogFormatter",
     "setup_logging",
     "describe",
+    # metrics
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "counter",
+    "gauge",
+    "histogram",
+    "stats_metrics",
+    "start_metrics_server",
+    "stop_metrics_server",
+    # pricing
+    "Ranking",
+    "rank_stations",
     # routing
     "reroute_command",
     # states
@@ -0,0 +1,126 @@
+"""Address helpers used to key the geocoding cache."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import FrozenSet, List, Optional, Tuple
+
+__all__ = ["ADDRESS_KEY_VERSION", "normalize_address_key", "address_numbers", "address_locality"]
+
+# Version of `normalize_address_key`, stored with every geocache row; bump it on
+# any change to the normalization so rows keyed by an older one are re-keyed
+ADDRESS_KEY_VERSION = 2
+
+# Italian street-type abbreviations (lowercase, accents and dots removed) -> full word
+_ABBREVIATIONS = {
+    "v": "via",
+    "vle": "viale",
+    "vl": "viale",
+    "pza": "piazza",
+    "pzza": "piazza",
+    "pzz": "piazza",
+    "ple": "piazzale",
+    "pzle": "piazzale",
+    "cso": "corso",
+    "lgo": "largo",
+    "vlo": "vicolo",
+    "vic": "vicolo",
+    "str": "strada",
+    "loc": "localita",
+    "fraz": "frazione",
+    "cda": "contrada",
+    "ctr": "contrada",
+    "lgmare": "lungomare",
+    "sta": "santa",
+    "sto": "santo",
+}
+
+# Markers announcing a house number ("n. 12", "nr12", "civ. 12"), dropped before digits
+_NUMBER_MARKERS = re.compile(r"\b(?:n|nr|no|num|civ)\.?\s*(?=\d)")
+
+# Everything except letters, digits (of any script) and dots separates tokens
+_SEPARATORS = re.compile(r"(?:[^\w.]|_)+")
+_DIGITS = re.compile(r"\d+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents from Latin letters ("Città" -> "citta").
+
+    Marks on other scripts are kept (recomposed), since there they tell words
+    apart: dropping the dakuten would turn "が" into "か".
+    """
+    chars: List[str] = []
+    for ch in unicodedata.normalize("NFKD", text.lower()):
+        if unicodedata.combining(ch) and chars and "a" <= chars[-1] <= "z":
+            continue
+        chars.append(ch)
+    return unicodedata.normalize("NFC", "".join(chars))
+
+
+def normalize_address_key(address: str) -> str:
+    """Return the cache key of a free-form Italian address.
+
+    Keys written under an older `ADDRESS_KEY_VERSION` are migrated once at
+    startup by `db.rekey_geocache()`.
+
+    Folds case and Latin accents, turns punctuation into spaces (letters and
+    digits of any script are kept), expands common street-type abbreviations
+    (``v.`` -> ``via``, ``p.za`` -> ``piazza``, ...) and drops house-number
+    markers, so that "Via Roma 1, Milano", "via roma 1 milano" and
+    "V. Roma, n. 1 - Milano" share one key. Text with no letters or digits at
+    all (only symbols or emoji) keys on its stripped, case-folded self rather
+    than on a shared empty key.
+
+    Args:
+        address: Address as typed by the user.
+
+    Returns:
+        str: Normalized key; empty only for blank input.
+    """
+    folded = _NUMBER_MARKERS.sub(" ", _fold(address))
+    tokens = []
+    for raw in _SEPARATORS.split(folded):
+        token = raw.replace(".", "")
+        if token:
+            tokens.append(_ABBREVIATIONS.get(token, token))
+    if not tokens:
+        return " ".join(address.casefold().split())
+    return " ".join(tokens)
+
+
+def address_numbers(key: str) -> FrozenSet[str]:
+    """Return the numbers (house numbers, postcodes) found in an address key.
+
+    Fuzzy matches are only accepted when these agree, so "via roma 1" never
+    resolves to "via roma 10".
+
+    Args:
+        key: A key produced by `normalize_address_key`.
+
+    Returns:
+        FrozenSet[str]: Digit runs in the key.
+    """
+    return frozenset(_DIGITS.findall(key))
+
+
+def address_locality(key: str) -> Optional[Tuple[str, ...]]:
+    """Return the tokens after the last number of an address key: its locality.
+
+    Typed addresses put the town after the house number or postcode, so in
+    "via garibaldi 10 roma" this is ``("roma",)``. Fuzzy matches must agree
+    on it: street names repeat across towns and would otherwise be similar
+    enough to match.
+
+    Args:
+        key: A key produced by `normalize_address_key`.
+
+    Returns:
+        Optional[Tuple[str, ...]]: Tokens after the last number (empty if the
+        key ends with it), or None if the key has no number to split on.
+    """
+    tokens = key.split()
+    for i in range(len(tokens) - 1, -1, -1):
+        if _DIGITS.search(tokens[i]):
+            return tuple(tokens[i + 1:])
+    return None
@@ -0,0 +1,136 @@
+"""Geographic helpers (great-circle distances and geohash cells)."""
+
+from __future__ import annotations
+
+from math import asin, cos, radians, sin, sqrt
+from typing import List, Tuple
+
+__all__ = [
+    "EARTH_RADIUS_KM",
+    "haversine_km",
+    "geohash_encode",
+    "geohash_bounds",
+    "geohash_neighbors",
+]
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Return the great-circle distance between two points in kilometers.
+
+    Args:
+        lat1: Latitude of the first point.
+        lng1: Longitude of the first point.
+        lat2: Latitude of the second point.
+        lng2: Longitude of the second point.
+
+    Returns:
+        Distance in kilometers.
+    """
+    phi1, phi2 = radians(lat1), radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = radians(lng2 - lng1)
+    a = sin(d_phi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """Encode a coordinate into a geohash of the given length.
+
+    Args:
+        lat: Latitude.
+        lng: Longitude.
+        precision: Number of base32 characters (6 ≈ 1.2 km × 0.6 km cells).
+
+    Returns:
+        The geohash string.
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Return the bounding box of a geohash cell.
+
+    Args:
+        geohash: Geohash string.
+
+    Returns:
+        ``(lat_lo, lat_hi, lng_lo, lng_hi)``.
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for ch in geohash:
+        value = _GEOHASH_BASE32.index(ch)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """Return the (up to) 8 cells surrounding a geohash cell, same precision.
+
+    Args:
+        geohash: Geohash string.
+
+    Returns:
+        Neighbouring geohashes; cells beyond the poles are skipped.
+    """
+    lat_lo, lat_hi, lng_lo, lng_hi = geohash_bounds(geohash)
+    d_lat, d_lng = lat_hi - lat_lo, lng_hi - lng_lo
+    c_lat, c_lng = (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+    out = []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dx == 0 and dy == 0:
+                continue
+            n_lat = c_lat + dy * d_lat
+            if not -90.0 <= n_lat <= 90.0:
+                continue
+            n_lng = (c_lng + dx * d_lng + 180.0) % 360.0 - 180.0
+            out.append(geohash_encode(n_lat, n_lng, len(geohash)))
+    return out
@@ -0,0 +1,362 @@
+"""In-process metrics registry exported in the Prometheus text format.
+
+Counters, gauges and histograms are plain objects updated in place. Everything
+that records them runs on the bot's event loop thread, so no lock is taken:
+recording is a dict lookup plus an addition, and hot paths can keep the child
+returned by `labels()` to skip the lookup too. State that modules already keep
+for their `*_stats()` functions is not duplicated: collectors added with
+`Registry.add_collector` turn it into metrics at scrape time, so it costs
+nothing between scrapes.
+
+`start_metrics_server()` serves the default registry over HTTP.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from aiohttp import web
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "counter",
+    "gauge",
+    "histogram",
+    "stats_metrics",
+    "start_metrics_server",
+    "stop_metrics_server",
+]
+
+log = logging.getLogger(__name__)
+
+Number = Union[int, float]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets (seconds) suited to Telegram handlers and upstream HTTP calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_INF = float("inf")
+
+
+def _format_value(value: Number) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(value)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: Number = 0
+
+    def samples(self, name: str) -> Iterator[Tuple[str, Tuple[Tuple[str, Any], ...], Number]]:
+        yield name, (), self.value
+
+
+class _CounterChild(_Value):
+    __slots__ = ()
+
+    def inc(self, amount: Number = 1) -> None:
+        self.value += amount
+
+
+class _GaugeChild(_Value):
+    __slots__ = ()
+
+    def set(self, value: Number) -> None:
+        self.value = value
+
+    def inc(self, amount: Number = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: Number = 1) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # One slot per bound plus the +Inf overflow slot; not cumulative
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return `(upper_bound, count)` pairs as exposed by Prometheus, ending with `inf`."""
+        pairs, running = [], 0
+        for bound, n in zip((*self.bounds, _INF), self.counts):
+            running += n
+            pairs.append((bound, running))
+        return pairs
+
+    def samples(self, name: str) -> Iterator[Tuple[str, Tuple[Tuple[str, Any], ...], Number]]:
+        cumulative = self.cumulative()
+        for bound, n in cumulative:
+            yield f"{name}_bucket", (("le", _format_value(bound)),), n
+        yield f"{name}_sum", (), self.sum
+        yield f"{name}_count", (), cumulative[-1][1]
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[Any, ...], Any] = {}
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Return a fresh child holding the value(s) of one label set."""
+
+    def labels(self, *values: Any) -> Any:
+        """Return the child for these label values, creating it on first use.
+
+        Values are stringified only when rendering, so callers must pass them
+        consistently (e.g. always an int status code).
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values!r}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in self._children.items():
+            base = tuple(zip(self.labelnames, values))
+            for name, extra, value in child.samples(self.name):
+                pairs = base + extra
+                if pairs:
+                    labels = ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs)
+                    yield f"{name}{{{labels}}} {_format_value(value)}"
+                else:
+                    yield f"{name} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    """Monotonic counter; name it with a `_total` suffix."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: Number = 1) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: Number) -> None:
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed upper bounds.
+
+    Args:
+        name: Metric name.
+        documentation: Help text.
+        labelnames: Label names.
+        buckets: Sorted upper bounds; `+Inf` is implicit.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabelled histogram."""
+        self.labels().observe(value)
+
+
+class Registry:
+    """Set of metrics and scrape-time collectors rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; names must be unique."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Add a callable returning fresh metrics on every scrape."""
+        self._collectors.append(collector)
+
+    def collect(self) -> Iterator[_Metric]:
+        """Yield registered metrics, then those of every collector.
+
+        A failing collector is logged and skipped so one broken source does
+        not blank the whole scrape.
+        """
+        yield from self._metrics.values()
+        for collector in self._collectors:
+            try:
+                metrics = list(collector())
+            except Exception:
+                log.exception("Metrics collector %s failed", getattr(collector, "__name__", collector))
+                continue
+            yield from metrics
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.extend(metric.render())
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Create a counter in the default registry."""
+    return REGISTRY.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Create a gauge in the default registry."""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def histogram(
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Create a histogram in the default registry."""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+
+def stats_metrics(prefix: str, stats: Mapping[str, Any], label: Optional[str] = None) -> List[Gauge]:
+    """Turn a `*_stats()` result into gauges named `<prefix>_<key>`.
+
+    Non-numeric values (states, timestamps, missing percentiles) are skipped;
+    booleans become 0/1.
+
+    Args:
+        prefix: Metric name prefix.
+        stats: Flat mapping of numbers, or with `label`, a mapping of label
+            value (e.g. breaker name) to such a mapping.
+        label: Label name for nested stats.
+
+    Returns:
+        List[Gauge]: One unregistered gauge per numeric key.
+    """
+    gauges: Dict[str, Gauge] = {}
+    rows = stats.items() if label else [((), stats)]
+    for key_value, values in rows:
+        labelvalues = (key_value,) if label else ()
+        for key, value in values.items():
+            if isinstance(value, bool):
+                value = int(value)
+            elif not isinstance(value, (int, float)):
+                continue
+            metric = gauges.get(key)
+            if metric is None:
+                metric = gauges[key] = Gauge(
+                    f"{prefix}_{key}",
+                    f"{key.replace('_', ' ')} ({prefix})",
+                    (label,) if label else (),
+                )
+            metric.labels(*labelvalues).set(value)
+    return list(gauges.values())
+
+
+_runner: Optional[web.AppRunner] = None
+
+
+async def _handle_metrics(request: web.Request) -> web.Response:
+    body = REGISTRY.render().encode("utf-8")
+    return web.Response(body=body, headers={"Content-Type": CONTENT_TYPE})
+
+
+async def start_metrics_server(host: str, port: int, path: str = "/metrics") -> None:
+    """Serve the default registry on `http://host:port/path` (idempotent).
+
+    Args:
+        host: Interface to bind.
+        port: TCP port.
+        path: URL path of the scrape endpoint.
+    """
+    global _runner
+    if _runner is not None:
+        return
+    app = web.Application()
+    app.router.add_get(path, _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    _runner = runner
+    log.info("Metrics endpoint listening on %s:%s%s", host, port, path)
+
+
+async def stop_metrics_server() -> None:
+    """Stop the metrics endpoint (idempotent)."""
+    global _runner
+    if _runner is None:
+        return
+    await _runner.cleanup()
+    _runner = None
+    log.info("Metrics endpoint stopped")
@@ -1,6 +1,87 @@
 """
-Business logic for analysing fuel prices and rendering
-a human-friendly HTML snippet.
+Business logic for analysing fuel prices: ranks the stations of a MISE zone
+search for one fuel without mutating them.
 """
 
+from __future__ import annotations
 
+import heapq
+from array import array
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from trovabenzina.api.mise.records import FuelPrice, StationRecord
+
+__all__ = ["Ranking", "rank_stations"]
+
+
+class Ranking(NamedTuple):
+    """Outcome of ranking a zone for one fuel.
+
+    Attributes:
+        num_stations: Stations analysed (same service type as the cheapest one);
+            when nothing matches the fuel, the raw number of stations.
+        average: Average chosen price over analysed stations, or None.
+        lowest: Lowest chosen price, or None.
+        podium: Up to `top_k` cheapest below-average `(station, fuel)` pairs,
+            in ascending price order.
+    """
+
+    num_stations: int
+    average: Optional[float]
+    lowest: Optional[float]
+    podium: List[Tuple[StationRecord, FuelPrice]]
+
+
+def rank_stations(stations: Sequence[StationRecord], fuel_id: int, top_k: int = 3) -> Ranking:
+    """Rank stations by the price of `fuel_id`.
+
+    The stations are converted once into columnar arrays holding, per station,
+    its cheapest entry for the fuel (ties prefer self-service). The service
+    type of the overall cheapest entry decides which stations are comparable;
+    the average is computed over those and the podium is a partial sort of
+    the below-average ones.
+
+    Args:
+        stations: Station records from a MISE zone search (or the local snapshot).
+        fuel_id: MISE fuel id to rank on.
+        top_k: Maximum podium size.
+
+    Returns:
+        Ranking: Analysed count, average, lowest price and podium.
+    """
+    refs: List[Tuple[StationRecord, FuelPrice]] = []
+    prices = array("d")
+    is_self = array("b")
+
+    for st in stations:
+        best = None
+        best_key = None
+        for f in st.fuels:
+            if f.fuel_id != fuel_id:
+                continue
+            key = (f.price, not f.is_self)
+            if best_key is None or key < best_key:
+                best, best_key = f, key
+        if best is not None:
+            refs.append((st, best))
+            prices.append(best_key[0])
+            is_self.append(0 if best_key[1] else 1)
+
+    if not refs:
+        return Ranking(len(stations), None, None, [])
+
+    cheapest = min(range(len(prices)), key=lambda i: (prices[i], not is_self[i]))
+    target = is_self[cheapest]
+    selected = [i for i in range(len(prices)) if is_self[i] == target]
+
+    average = sum(prices[i] for i in selected) / len(selected)
+    below = [i for i in selected if prices[i] <= average]
+    top = heapq.nsmallest(top_k, below, key=prices.__getitem__)
+
+    return Ranking(
+        num_stations=len(selected),
+        average=average,
+        lowest=prices[top[0]] if top else None,
+        podium=[refs[i] for i in top],
+    )
@@ -0,0 +1,100 @@
+"""Relationship loader policy: plain selects load only the rows they ask for.
+
+Runs against in-memory SQLite, counting the statements each query issues and
+the objects it leaves in the session's identity map.
+"""
+
+from decimal import Decimal
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from trovabenzina.db.models import Base, Fuel, Language, Search, User
+
+_FUELS = 4
+_USERS = 500
+_SEARCHES = 5000
+
+
+@pytest.fixture(scope="module")
+def engine():
+    eng = create_engine("sqlite://")
+    tables = [Base.metadata.tables[name] for name in ("dom_fuels", "dom_languages", "users", "searches")]
+    Base.metadata.create_all(eng, tables=tables)
+    with Session(eng) as s:
+        s.add_all([
+            Fuel(id=i, code=str(i), name=f"fuel {i}", uom="L", avg_consumption_per_100km=Decimal("6"))
+            for i in range(1, _FUELS + 1)
+        ])
+        s.add(Language(id=1, code="it", name="Italiano"))
+        s.flush()
+        s.add_all([User(id=u, tg_id=u, fuel_id=1 + u % _FUELS, language_id=1) for u in range(1, _USERS + 1)])
+        s.flush()
+        s.add_all([
+            Search(user_id=1 + i % _USERS, fuel_id=1 + i % _FUELS, radius=5, num_stations=10)
+            for i in range(_SEARCHES)
+        ])
+        s.commit()
+    yield eng
+    eng.dispose()
+
+
+def _measure(engine, stmt) -> Tuple[int, int, List[object]]:
+    """Run `stmt` in a fresh session; return (statements, objects in identity map, rows)."""
+    statements: List[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        with Session(engine) as s:
+            rows = s.execute(stmt).unique().scalars().all()
+            loaded = len(s.identity_map)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    return len(statements), loaded, rows
+
+
+@pytest.mark.parametrize(
+    "stmt, expected",
+    [
+        (select(Fuel).where(Fuel.del_ts.is_(None)), _FUELS),
+        (select(Fuel).where(Fuel.code == "1"), 1),
+        (select(Language), 1),
+        (select(User).where(User.tg_id == 7), 1),
+        (select(Search).limit(10), 10),
+    ],
+    ids=["fuels", "fuel_by_code", "languages", "user_by_tg_id", "searches"],
+)
+def test_plain_select_loads_only_its_rows(engine, stmt, expected):
+    statements, loaded, rows = _measure(engine, stmt)
+    assert statements == 1
+    assert loaded == len(rows) == expected
+
+
+def test_joinedload_opts_in_to_many_to_one(engine):
+    statements, loaded, rows = _measure(engine, select(User).options(joinedload(User.fuel)).where(User.tg_id == 7))
+    assert statements == 1
+    assert loaded == 2
+    assert rows[0].fuel.id == 1 + 7 % _FUELS
+
+
+def test_selectinload_opts_in_to_collection(engine):
+    statements, loaded, rows = _measure(engine, select(Fuel).options(selectinload(Fuel.users)).where(Fuel.code == "1"))
+    assert statements == 2
+    assert len(rows[0].users) == _USERS // _FUELS
+    assert loaded == 1 + _USERS // _FUELS
+
+
+def test_unloaded_relationships_raise(engine):
+    with Session(engine) as s:
+        fuel = s.execute(select(Fuel).where(Fuel.code == "1")).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            fuel.users
+        search = s.execute(select(Search).where(Search.user_id == 2).limit(1)).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            search.user